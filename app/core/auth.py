@@ -1,14 +1,28 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
 import threading
+import time
 from dataclasses import dataclass
+from typing import Any
 
 import jwt
 import requests
-from cachetools import TTLCache
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import PyJWK
 
 from app.core.config import settings
+from app.core.metrics import (
+    AUTH_TOKEN_CACHE,
+    JWKS_KEY_LOOKUPS,
+    JWKS_REFRESHES,
+    JWKS_STALE_SERVED,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -19,10 +33,38 @@ class AuthContext:
 
 BEARER = HTTPBearer(auto_error=False)
 
-_JWKS_CACHE = TTLCache(maxsize=1, ttl=600)
 _JWKS_LOCK = threading.Lock()
 
 
+@dataclass(frozen=True)
+class _KeySet:
+    """kid -> public key map parsed once per JWKS fetch."""
+
+    keys: dict[str, Any]
+    expires_at: float
+
+
+_KEYSET: _KeySet | None = None
+_LAST_FETCH_AT = float("-inf")
+
+
+def _token_expiry(_key: bytes, ctx: AuthContext, now: float) -> float:
+    # 検証済みトークンは TTL と exp の早い方まで再利用する
+    expires_at = now + settings.AUTH_TOKEN_CACHE_TTL_S
+    exp = ctx.claims.get("exp")
+    if isinstance(exp, int | float):
+        expires_at = min(expires_at, float(exp))
+    return expires_at
+
+
+_TOKEN_CACHE: TLRUCache | None = (
+    TLRUCache(maxsize=settings.AUTH_TOKEN_CACHE_MAXSIZE, ttu=_token_expiry, timer=time.time)
+    if settings.AUTH_TOKEN_CACHE_MAXSIZE > 0
+    else None
+)
+_TOKEN_LOCK = threading.Lock()
+
+
 def _http_401(detail: str) -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,29 +81,102 @@ def _http_503(detail: str) -> HTTPException:
 
 def _fetch_jwks() -> dict:
     try:
-        response = requests.get(settings.CLERK_JWKS_URL, timeout=5)
+        response = requests.get(settings.CLERK_JWKS_URL, timeout=settings.JWKS_FETCH_TIMEOUT_S)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         raise _http_503(f"Failed to fetch JWKS: {e}") from e
 
 
-def _get_jwks() -> dict:
-    """Get JWKS from TTL cache; fetch if missing/expired."""
+def _parse_jwks(jwks: Any) -> dict[str, Any]:
+    if not isinstance(jwks, dict) or not isinstance(jwks.get("keys", []), list):
+        raise _http_503("Malformed JWKS response")
+    keys: dict[str, Any] = {}
+    for jwk in jwks.get("keys", []):
+        kid = jwk.get("kid") if isinstance(jwk, dict) else None
+        if not kid:
+            continue
+        try:
+            keys[kid] = PyJWK.from_dict(jwk).key
+        except jwt.PyJWKError:
+            # 未対応の鍵タイプなどは無視して他の鍵で検証を続ける
+            continue
+    return keys
+
+
+def _load_keyset(trigger: str) -> _KeySet:
+    """Fetch and parse JWKS. Caller must hold _JWKS_LOCK."""
+    global _KEYSET, _LAST_FETCH_AT  # noqa: PLW0603
+    # 失敗した取得もレート制限の対象にする
+    _LAST_FETCH_AT = time.monotonic()
+    try:
+        keys = _parse_jwks(_fetch_jwks())
+    except HTTPException:
+        JWKS_REFRESHES.labels(trigger, "error").inc()
+        raise
+    JWKS_REFRESHES.labels(trigger, "ok").inc()
+    keyset = _KeySet(keys=keys, expires_at=time.monotonic() + settings.JWKS_TTL_S)
+    _KEYSET = keyset
+    return keyset
+
+
+def _fetch_rate_limited() -> bool:
+    return time.monotonic() - _LAST_FETCH_AT < settings.JWKS_MIN_REFETCH_INTERVAL_S
+
+
+def _get_keyset() -> _KeySet:
+    """
+    Return the parsed JWKS without blocking on Clerk whenever possible.
+
+    Expired keys keep being served (up to JWKS_MAX_STALE_S) while a refresh
+    is in progress, recently failed, or is left to the background refresher.
+    Only a missing or too-stale key set makes the request wait for a fetch.
+    """
+    keyset = _KEYSET
+    now = time.monotonic()
+    if keyset is not None and keyset.expires_at > now:
+        return keyset
+
+    if keyset is not None and now < keyset.expires_at + settings.JWKS_MAX_STALE_S:
+        if jwks_refresher.running or not _JWKS_LOCK.acquire(blocking=False):
+            JWKS_STALE_SERVED.inc()
+            return keyset
+        try:
+            if _KEYSET is keyset and not _fetch_rate_limited():
+                return _load_keyset("expired")
+        except HTTPException:
+            logger.warning("JWKS refresh failed; serving stale keys", exc_info=True)
+        finally:
+            _JWKS_LOCK.release()
+        current = _KEYSET
+        if current is None or current is keyset:
+            JWKS_STALE_SERVED.inc()
+            return keyset
+        return current
+
     with _JWKS_LOCK:
-        jwks = _JWKS_CACHE.get("jwks")
-        if jwks is None:
-            jwks = _fetch_jwks()
-            _JWKS_CACHE["jwks"] = jwks
-        return jwks
+        keyset = _KEYSET
+        if keyset is None:
+            keyset = _load_keyset("initial")
+        elif keyset.expires_at + settings.JWKS_MAX_STALE_S <= time.monotonic():
+            keyset = _load_keyset("too_stale")
+        return keyset
+
 
+def _refresh_keyset(stale: _KeySet) -> _KeySet:
+    """
+    Force refresh JWKS on kid miss.
 
-def _refresh_jwks() -> dict:
-    """Force refresh JWKS (used on kid miss)."""
+    Concurrent misses share one fetch, and at most one fetch happens per
+    JWKS_MIN_REFETCH_INTERVAL_S so a flood of tokens with unknown kids
+    cannot turn into a flood of requests to Clerk.
+    """
     with _JWKS_LOCK:
-        jwks = _fetch_jwks()
-        _JWKS_CACHE["jwks"] = jwks
-        return jwks
+        if _KEYSET is not None and _KEYSET is not stale:
+            return _KEYSET
+        if _fetch_rate_limited():
+            return stale
+        return _load_keyset("kid_miss")
 
 
 def _public_key_from_kid(kid: str):
@@ -69,26 +184,89 @@ def _public_key_from_kid(kid: str):
     Return RSA public key for the given kid.
     If not found, force-refresh JWKS once and retry.
     """
-
-    def _search(jwks: dict):
-        for k in jwks.get("keys", []):
-            if k.get("kid") == kid:
-                return PyJWK.from_dict(k).key
-        return None
-
-    jwks = _get_jwks()
-    public_key = _search(jwks)
+    keyset = _get_keyset()
+    public_key = keyset.keys.get(kid)
     if public_key is not None:
+        JWKS_KEY_LOOKUPS.labels("hit").inc()
         return public_key
 
-    jwks = _refresh_jwks()
-    public_key = _search(jwks)
+    JWKS_KEY_LOOKUPS.labels("miss").inc()
+    public_key = _refresh_keyset(keyset).keys.get(kid)
     if public_key is not None:
         return public_key
 
     raise _http_401(detail="Public key not found for the provided token")
 
 
+class JwksRefresher:
+    """Background task that refreshes JWKS ahead of expiry, off the request path."""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="jwks-refresher")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    @staticmethod
+    def _refresh() -> None:
+        with _JWKS_LOCK:
+            _load_keyset("background")
+
+    async def _run(self) -> None:
+        while True:
+            keyset = _KEYSET
+            if keyset is not None:
+                refresh_at = keyset.expires_at - settings.JWKS_REFRESH_AHEAD_S
+                await asyncio.sleep(max(0.0, refresh_at - time.monotonic()))
+            try:
+                await asyncio.to_thread(self._refresh)
+            except Exception:
+                # 想定外の例外でもタスクを終わらせず、既存の鍵を使いながら間隔を空けて再試行する
+                logger.warning("Background JWKS refresh failed", exc_info=True)
+                await asyncio.sleep(settings.JWKS_MIN_REFETCH_INTERVAL_S)
+
+
+jwks_refresher = JwksRefresher()
+
+
+def _cached_auth(cache_key: bytes) -> AuthContext | None:
+    if _TOKEN_CACHE is None:
+        return None
+    with _TOKEN_LOCK:
+        return _TOKEN_CACHE.get(cache_key)
+
+
+def _remember_auth(cache_key: bytes, ctx: AuthContext) -> None:
+    if _TOKEN_CACHE is None:
+        return
+    with _TOKEN_LOCK:
+        _TOKEN_CACHE[cache_key] = ctx
+
+
+def clear_auth_caches() -> None:
+    """Drop the parsed JWKS and every verified token (e.g. after key rotation)."""
+    global _KEYSET, _LAST_FETCH_AT  # noqa: PLW0603
+    with _JWKS_LOCK:
+        _KEYSET = None
+        _LAST_FETCH_AT = float("-inf")
+    if _TOKEN_CACHE is not None:
+        with _TOKEN_LOCK:
+            _TOKEN_CACHE.clear()
+
+
 def get_current_user(
     creds: HTTPAuthorizationCredentials | None = Depends(BEARER),
 ) -> AuthContext:
@@ -100,6 +278,14 @@ def get_current_user(
 
     token = creds.credentials
 
+    # 同じトークンの再送は RSA 検証を省略する
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _cached_auth(cache_key)
+    if cached is not None:
+        AUTH_TOKEN_CACHE.labels("hit").inc()
+        return cached
+    AUTH_TOKEN_CACHE.labels("miss").inc()
+
     try:
         header = jwt.get_unverified_header(token)
     except jwt.InvalidTokenError as e:
@@ -121,8 +307,6 @@ def get_current_user(
             audience=settings.CLERK_AUDIENCE,
             issuer=settings.CLERK_ISSUER,
         )
-        return AuthContext(sub=claims["sub"], claims=claims)
-
     except jwt.ExpiredSignatureError as e:
         raise _http_401("Token has expired") from e
     except jwt.ImmatureSignatureError as e:
@@ -133,3 +317,7 @@ def get_current_user(
         raise _http_401("Invalid issuer") from e
     except jwt.InvalidTokenError as e:
         raise _http_401(f"Invalid token: {e}") from e
+
+    ctx = AuthContext(sub=claims["sub"], claims=claims)
+    _remember_auth(cache_key, ctx)
+    return ctx
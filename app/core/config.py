@@ -1,5 +1,6 @@
 from typing import Literal
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -9,12 +10,89 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     ENV: Literal["dev", "prod"] = "dev"
 
+    # logging
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0  # 成功ログを出す割合 (エラー・遅延は常に出力)
+    LOG_ASYNC: bool = True  # True: QueueHandler 経由で別スレッドから出力
+    LOG_QUEUE_MAXSIZE: int = 10_000  # 溢れたレコードは破棄して件数を記録する
+    LOG_SAMPLE_RATES: dict[str, float] = {}  # 例: {"sqlalchemy.engine": 0.1} (INFO 以下が対象)
+
+    # metrics
+    METRICS_ENABLED: bool = True  # 複数ワーカーでは PROMETHEUS_MULTIPROC_DIR を設定する
+
+    # compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # これより小さい本文は圧縮しない (ストリーミングは常に圧縮)
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 10,000 件の一覧で約 40ms。11 は数秒かかる
+    COMPRESSION_CONTENT_TYPES: list[str] = [  # 前方一致
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+    ]
+
+    # database
+    DATABASE_REPLICA_URLS: list[str] = []  # 参照専用のユースケースを振り分ける (JSON の配列)
+    REPLICA_READ_YOUR_WRITES_S: float = 5.0  # 書き込み後この秒数はそのユーザーを主系で読む
+    REPLICA_UNHEALTHY_COOLDOWN_S: float = 30.0  # 接続に失敗したレプリカを外しておく秒数
+    REPLICA_LAST_WRITE_COOKIE: str = "last_write_at"  # 他のワーカーにも書き込み時刻を伝える Cookie
+    DB_ASYNC: bool = False  # True: SQLAlchemy asyncio + psycopg async でリクエストを処理
+    DB_READ_ONLY_TRANSACTIONS: bool = False  # 参照専用のセッションで SET TRANSACTION READ ONLY
+    DB_QUERY_STATS: bool = True  # SQL の件数と DB 時間を Server-Timing とアクセスログに出す
+    DB_N_PLUS_ONE_THRESHOLD: int = 0  # 同じ文がこの回数を超えて実行されたら警告 (0 で無効)
+    DB_POOL_SIZE: int = 5  # ワーカープロセスごとの値
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 30.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WAIT_WARN_RATIO: float = 0.5  # 待ち時間が pool_timeout のこの割合を超えたら警告
+    DB_NULL_POOL: bool = False  # True: PgBouncer などの外部プーラーを使い、アプリ側で保持しない
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # PostgreSQL の statement_timeout (0 で設定しない)
+
+    # transaction import
+    TRANSACTION_IMPORT_MAX_ROWS: int = 10_000
+
+    # transaction batch update / delete
+    TRANSACTION_BATCH_MAX_IDS: int = 1_000  # 1 リクエストで指定できる ID の上限
+
+    # idempotency
+    IDEMPOTENCY_BACKEND: Literal["memory", "database"] = "database"  # memory は単一ワーカー向け
+    IDEMPOTENCY_TTL_S: float = 86_400.0  # Idempotency-Key を覚えておく秒数
+    IDEMPOTENCY_MEMORY_MAXSIZE: int = 10_000
+
+    # category catalog
+    CATEGORY_CATALOG_TTL_S: float = 300.0  # デフォルトカテゴリの保持秒数 (変更の反映周期)
+
+    # dashboard cache
+    DASHBOARD_CACHE_ENABLED: bool = True
+    DASHBOARD_CACHE_MAXSIZE: int = 10_000
+    DASHBOARD_CACHE_TTL_S: float = 300.0
+
+    # dashboard timeseries
+    DASHBOARD_TIMESERIES_MAX_POINTS: int = 1_000  # 1 リクエストで返す期間 (バケット) 数の上限
+
+    # auth
+    AUTH_TOKEN_CACHE_MAXSIZE: int = 10_000  # 0 で検証済みトークンのキャッシュを無効化
+    AUTH_TOKEN_CACHE_TTL_S: float = 300.0  # exp より先には延ばさない
+    JWKS_TTL_S: float = 600.0
+    JWKS_REFRESH_AHEAD_S: float = 60.0  # 期限のこの秒数前にバックグラウンドで再取得
+    JWKS_MAX_STALE_S: float = 3600.0  # 再取得に失敗しても期限後この秒数は古い鍵で検証する
+    JWKS_MIN_REFETCH_INTERVAL_S: float = 30.0  # 未知の kid による再取得の最小間隔
+    JWKS_FETCH_TIMEOUT_S: float = 5.0
+
     # clerk
     CLERK_ISSUER: str
     CLERK_JWKS_URL: str
     CLERK_SECRET_KEY: str
     CLERK_AUDIENCE: str
 
+    @model_validator(mode="after")
+    def check_jwks_refresh_ahead(self) -> "Settings":
+        # 期限より前に再取得できないと、バックグラウンド更新が待たずに取得し続ける
+        if self.JWKS_REFRESH_AHEAD_S >= self.JWKS_TTL_S:
+            raise ValueError("JWKS_REFRESH_AHEAD_S must be less than JWKS_TTL_S")
+        return self
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
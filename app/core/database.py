@@ -1,13 +1,35 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
+import itertools
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager
+from typing import Any
 
-from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy import MetaData, create_engine, event, make_url, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+)
+from app.core.query_stats import instrument_engine
+
+logger = logging.getLogger(__name__)
 
 _NAMING = {
     "ix": "ix_%(table_name)s_%(column_0_name)s",
@@ -22,22 +44,100 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=_NAMING)
 
 
-class Database:
-    def __init__(self, url: str, **pool):
-        self.engine: Engine = create_engine(
-            url,
-            pool_pre_ping=True,
-            pool_recycle=pool.get("recycle", 1800),
-            pool_size=pool.get("size", 5),
-            max_overflow=pool.get("max_overflow", 10),
-            pool_timeout=pool.get("timeout", 30),
-            echo=getattr(settings, "DB_ECHO", False),
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that reports checkout wait time and pool occupancy to Prometheus.
+
+    Checkouts that wait longer than DB_POOL_WAIT_WARN_RATIO of pool_timeout
+    are logged (at most once per second per pool), and so is every timeout.
+    """
+
+    # recreate() は同じクラスを引数なしで作り直すため、ラベルはクラス属性で持つ
+    metrics_label = "sync"
+    _last_warned_at = float("-inf")
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_label).inc()
+            logger.error(
+                f"DB pool checkout timed out after {time.perf_counter() - start:.1f}s "
+                f"({self.status()})",
+                extra={"pool": self.metrics_label},
+            )
+            raise
+        waited = time.perf_counter() - start
+        DB_POOL_WAIT.labels(self.metrics_label).observe(waited)
+        if waited >= self._timeout * settings.DB_POOL_WAIT_WARN_RATIO:
+            self._warn_slow_checkout(waited)
+        self._report_usage()
+        return conn
+
+    def _warn_slow_checkout(self, waited: float) -> None:
+        now = time.monotonic()
+        if now - self._last_warned_at < 1.0:
+            return
+        self._last_warned_at = now
+        logger.warning(
+            f"DB pool checkout waited {waited:.2f}s of {self._timeout:.0f}s pool_timeout "
+            f"({self.status()})",
+            extra={"pool": self.metrics_label, "wait_s": round(waited, 3)},
         )
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._report_usage()
+
+    def _report_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.metrics_label).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.metrics_label).set(max(0, self.overflow()))
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+class ReplicaQueuePool(TimedQueuePool):
+    metrics_label = "replica"
+
+
+class ReplicaAsyncAdaptedQueuePool(TimedAsyncAdaptedQueuePool):
+    metrics_label = "async_replica"
+
+
+class ReadOnlySession(Session):
+    """
+    Session for query-only use cases.
+
+    It is never committed: AsyncUseCase closes it as soon as the use case
+    returns, which hands the connection back to the pool (the pool's reset
+    rolls the transaction back) before the response is serialized and sent.
+    """
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _set_transaction_read_only(session, transaction, connection) -> None:
+    if settings.DB_READ_ONLY_TRANSACTIONS and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+class Database:
+    def __init__(self, url: str, poolclass: type[QueuePool] = TimedQueuePool, **pool):
+        self.engine: Engine = create_engine(url, **_engine_options(url, pool, poolclass))
+        instrument_engine(self.engine)
         self.SessionLocal = sessionmaker(
             bind=self.engine,
             autoflush=False,
             expire_on_commit=False,
         )
+        self.ReadSessionLocal = sessionmaker(
+            bind=self.engine,
+            class_=ReadOnlySession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
 
     @contextmanager
     def session(self) -> Iterator[Session]:
@@ -49,6 +149,11 @@ class Database:
                 db.rollback()
                 raise
 
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        with self.ReadSessionLocal() as db:
+            yield db
+
     def ping(self) -> bool:
         try:
             with self.engine.connect() as conn:
@@ -60,9 +165,204 @@ class Database:
         self.engine.dispose()
 
 
-db = Database(settings.DATABASE_URL)
+class AsyncDatabase:
+    """asyncio counterpart of Database (SQLAlchemy asyncio extension + psycopg async)."""
+
+    def __init__(self, url: str, poolclass: type[QueuePool] = TimedAsyncAdaptedQueuePool, **pool):
+        self.engine: AsyncEngine = create_async_engine(
+            _async_url(url), **_engine_options(url, pool, poolclass)
+        )
+        instrument_engine(self.engine.sync_engine)
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self.ReadSessionLocal = async_sessionmaker(
+            bind=self.engine,
+            sync_session_class=ReadOnlySession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self.SessionLocal() as db:
+            try:
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        async with self.ReadSessionLocal() as db:
+            yield db
+
+    async def ping(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                return (await conn.execute(text("SELECT 1"))).scalar_one() == 1
+        except Exception:
+            return False
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+class ReplicaSet:
+    """
+    Round-robin choice of a read replica, falling back to the primary.
+
+    A user who wrote within REPLICA_READ_YOUR_WRITES_S reads from the primary
+    so they never see their own change missing, and a replica that fails to
+    connect is skipped for REPLICA_UNHEALTHY_COOLDOWN_S. Writes are recorded
+    per worker process; `pick` also takes the last-write time the client sent
+    back (see app.infrastructure.di.session), which covers reads that land on
+    another worker. Write times are wall-clock seconds so the two compare.
+    """
+
+    def __init__(self, size: int, *, read_your_writes_s: float, cooldown_s: float) -> None:
+        self.size = size
+        self.read_your_writes_s = read_your_writes_s
+        self.cooldown_s = cooldown_s
+        self._next = itertools.count()
+        self._unhealthy_until = [0.0] * size
+        self._last_write: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pick(self, user_id: str, last_write_at: float | None = None) -> int | None:
+        """
+        Index of the replica to read from, or None for the primary.
+
+        `last_write_at` is the user's last write as reported by the client.
+        """
+        if self.size == 0:
+            return None
+        if self._wrote_recently(user_id, last_write_at):
+            return None
+        now = time.monotonic()
+        start = next(self._next)
+        for offset in range(self.size):
+            index = (start + offset) % self.size
+            if self._unhealthy_until[index] <= now:
+                return index
+        return None
+
+    def _wrote_recently(self, user_id: str, last_write_at: float | None) -> bool:
+        now = time.time()
+        last = self._last_write.get(user_id, float("-inf"))
+        # 未来すぎる値 (改ざん・時計のずれ) は無視する
+        if last_write_at is not None and last_write_at <= now + self.read_your_writes_s:
+            last = max(last, last_write_at)
+        return now - last < self.read_your_writes_s
+
+    def note_write(self, user_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._last_write[user_id] = now
+            # 期限切れの記録は書き込みのついでに掃除する
+            if len(self._last_write) > 10_000:
+                horizon = now - self.read_your_writes_s
+                self._last_write = {u: t for u, t in self._last_write.items() if t > horizon}
+
+    def mark_unhealthy(self, index: int) -> None:
+        logger.warning(
+            f"Read replica #{index} is unavailable; using the primary for {self.cooldown_s:.0f}s",
+            exc_info=True,
+        )
+        self._unhealthy_until[index] = time.monotonic() + self.cooldown_s
+
+
+def _engine_options(url: str, pool: dict[str, Any], poolclass: type[QueuePool]) -> dict[str, Any]:
+    """Engine keyword arguments shared by Database and AsyncDatabase."""
+    options: dict[str, Any] = {"echo": getattr(settings, "DB_ECHO", False)}
+    statement_timeout_ms = pool.get("statement_timeout_ms", 0)
+    if statement_timeout_ms and make_url(url).get_backend_name() == "postgresql":
+        # PgBouncer の transaction モードでは効かないため、その場合はロール側で設定する
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout_ms)}"}
+    if pool.get("null_pool", False):
+        # 外部のプーラー (PgBouncer など) に任せ、チェックアウトごとに接続を開いて閉じる
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_pre_ping=pool.get("pre_ping", True),
+        pool_recycle=pool.get("recycle", 1800),
+        pool_size=pool.get("size", 5),
+        max_overflow=pool.get("max_overflow", 10),
+        pool_timeout=pool.get("timeout", 30),
+    )
+    return options
+
+
+def _pool_settings() -> dict[str, Any]:
+    return {
+        "size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "timeout": settings.DB_POOL_TIMEOUT_S,
+        "recycle": settings.DB_POOL_RECYCLE_S,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "null_pool": settings.DB_NULL_POOL,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+    }
+
+
+def _async_url(url: str) -> str:
+    """Point a postgresql URL at the psycopg (v3) driver, which also provides the async API."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed.render_as_string(hide_password=False)
+
+
+db = Database(settings.DATABASE_URL, **_pool_settings())
+async_db = AsyncDatabase(settings.DATABASE_URL, **_pool_settings()) if settings.DB_ASYNC else None
+
+replica_dbs = [
+    Database(url, ReplicaQueuePool, **_pool_settings()) for url in settings.DATABASE_REPLICA_URLS
+]
+async_replica_dbs = (
+    [
+        AsyncDatabase(url, ReplicaAsyncAdaptedQueuePool, **_pool_settings())
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+    if settings.DB_ASYNC
+    else []
+)
+replicas = ReplicaSet(
+    len(settings.DATABASE_REPLICA_URLS),
+    read_your_writes_s=settings.REPLICA_READ_YOUR_WRITES_S,
+    cooldown_s=settings.REPLICA_UNHEALTHY_COOLDOWN_S,
+)
 
 
 def get_db() -> Iterator[Session]:
     with db.session() as s:
         yield s
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_db.session() as s:
+        yield s
+
+
+def get_readonly_db() -> Iterator[Session]:
+    with db.read_session() as s:
+        yield s
+
+
+async def get_async_readonly_db() -> AsyncIterator[AsyncSession]:
+    async with async_db.read_session() as s:
+        yield s
+
+
+def get_db_session_factory() -> Callable[[], AbstractContextManager[Session]]:
+    """Session factory for work that outlives the request scope (e.g. streaming responses)."""
+    return db.session
+
+
+# リクエストで使うセッション: DB_ASYNC で同期／非同期を切り替える
+# (レプリカに振り分ける参照用のセッションはユーザーに依存するため app.infrastructure.di.session)
+get_session = get_async_db if settings.DB_ASYNC else get_db
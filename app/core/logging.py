@@ -1,10 +1,21 @@
+import atexit
 import json
 import logging
 import os
-from typing import Any
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
 
+import orjson
+
+from app.core.config import settings
 from app.middleware.logging import RequestIdLogFilter
 
+# LogRecord の標準属性 (これ以外が extra 相当)。レコードごとに作り直さないようキャッシュする
+_KNOWN_KEYS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
 
 class JsonFormatter(logging.Formatter):
     DEFAULT_KEYS = {
@@ -30,23 +41,122 @@ class JsonFormatter(logging.Formatter):
             "line": record.lineno,
         }
         # extra をすべてJSONに落とす
-        # record.__dict__ から「既知の属性」を除いたものが extra 相当
-        known = set(vars(logging.makeLogRecord({})).keys())
-        data: dict[str, Any] = {}
         for k, v in record.__dict__.items():
-            if k not in known and not k.startswith("_"):
-                # pydanticのValidationErrorなどでシリアライズ失敗を避ける
-                try:
-                    json.dumps(v)
-                    data[k] = v
-                except Exception:
-                    data[k] = str(v)
+            if k not in _KNOWN_KEYS and not k.startswith("_"):
+                base[k] = v
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            base["exc_info"] = record.exc_text
+        return _dumps(base)
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    # シリアライズできない値 (pydantic の ValidationError など) は str() で落とす
+    try:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO/DEBUG records per logger (matched by name prefix).
+
+    WARNING and above always pass, so sampling never hides errors.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        # 長いプレフィックスを優先する
+        self._rates = sorted(rates.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self._cache: dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = next(
+                (r for prefix, r in self._rates if name == prefix or name.startswith(prefix + ".")),
+                1.0,
+            )
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that drops records instead of blocking.
 
-        base.update(data)
-        return json.dumps(base, ensure_ascii=False)
+    Only the message and traceback are rendered on the calling thread; JSON
+    encoding and the write happen on the listener thread. Records arriving while
+    the queue is full are dropped before any rendering, counted, and reported
+    by a WARNING once the queue has room again.
 
+    The queue is a lock-free SimpleQueue; the bound is enforced with qsize(),
+    so it may be overshot by a few records under contention.
+    """
 
-def setup_logging() -> None:
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._unreported = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # 溢れている場合は整形 (prepare) の前に捨て、呼び出し側の負荷を増やさない
+        if self.queue.qsize() >= self.maxsize:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # args は呼び出し側で変更され得るので、メッセージだけはここで確定させる
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported:
+            with self._lock:
+                unreported, self._unreported = self._unreported, 0
+            self.queue.put_nowait(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": f"Dropped {unreported} log records (log queue full)",
+                        "dropped_total": self.dropped,
+                    }
+                )
+            )
+        self.queue.put_nowait(record)
+
+
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        # キューに残ったレコードを書き出してから止める
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(stream: TextIO | None = None) -> None:
     # ルートロガーをJSONに統一
     root = logging.getLogger()
     root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
@@ -54,13 +164,26 @@ def setup_logging() -> None:
     # 既存ハンドラをクリア（uvicorn等が先に設定している場合を上書き）
     for h in list(root.handlers):
         root.removeHandler(h)
+    _stop_listener()
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
-    root.addHandler(handler)
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+
+    if settings.LOG_ASYNC:
+        # 整形と書き込みは別スレッドで行い、イベントループのスレッドでは enqueue だけする
+        global _listener  # noqa: PLW0603
+        handler: logging.Handler = DroppingQueueHandler(settings.LOG_QUEUE_MAXSIZE)
+        _listener = QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+    else:
+        handler = stream_handler
 
-    # リクエストID／ユーザIDを全ログに付与
-    root.addFilter(RequestIdLogFilter())
+    # リクエストID／ユーザIDを全ログに付与 (子ロガーからのレコードにも効くようハンドラに付ける)
+    handler.addFilter(RequestIdLogFilter())
+    if settings.LOG_SAMPLE_RATES:
+        handler.addFilter(LogSamplingFilter(settings.LOG_SAMPLE_RATES))
+    root.addHandler(handler)
 
     # よく使うロガーのレベル
     logging.getLogger("uvicorn").setLevel(logging.INFO)
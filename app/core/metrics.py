@@ -0,0 +1,104 @@
+"""
+Prometheus metrics shared by the app.
+
+When PROMETHEUS_MULTIPROC_DIR is set before startup (uvicorn --workers N),
+prometheus_client keeps values in per-process mmap files and /metrics
+aggregates every worker; otherwise the in-process default registry is used.
+Recording is a per-metric uncontended lock plus an add, so it is cheap
+enough for every request.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# ===== HTTP =====
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# ===== DB pool =====
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond pool_size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout.",
+    ["pool"],
+)
+
+# ===== Auth =====
+AUTH_TOKEN_CACHE = Counter(
+    "auth_token_cache_total",
+    "Verified-token cache lookups.",
+    ["result"],
+)
+JWKS_KEY_LOOKUPS = Counter(
+    "jwks_key_lookups_total",
+    "kid lookups against the cached JWKS.",
+    ["result"],
+)
+JWKS_REFRESHES = Counter(
+    "jwks_refreshes_total",
+    "JWKS fetches by trigger and outcome.",
+    ["trigger", "outcome"],
+)
+JWKS_STALE_SERVED = Counter(
+    "jwks_stale_served_total",
+    "Requests verified against expired JWKS while a refresh was pending.",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a stopped worker's live gauges (multiprocess mode only)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
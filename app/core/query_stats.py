@@ -0,0 +1,92 @@
+"""
+Per-request SQL statement counts and database time.
+
+RequestLoggingMiddleware puts a QueryStats in `query_stats_ctx` for every
+request; the cursor-execute listeners installed on each engine add to it.
+Statements executed outside a request (startup pings, scripts) cost a single
+contextvar lookup and are not recorded.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_START_KEY = "query_stats_started_at"
+
+# IN (...) のプレースホルダ数や空白の違いは同じ文として数える
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:%\(\w+\)s|%s|\?|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+class QueryStats:
+    """Statement count, cumulative DB time and per-statement counts of one request."""
+
+    __slots__ = ("count", "elapsed", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.elapsed = 0.0
+        # 正規化はリクエスト終了時にまとめて行い、実行ごとには文字列をそのまま数える
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.elapsed += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Normalized statements executed more than `threshold` times, most frequent first."""
+        if threshold <= 0 or self.count <= threshold:
+            return []
+        grouped: dict[str, int] = {}
+        for statement, count in self.statements.items():
+            key = normalize_statement(statement)
+            grouped[key] = grouped.get(key, 0) + count
+        return sorted(
+            ((s, c) for s, c in grouped.items() if c > threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def server_timing(self) -> bytes:
+        """`Server-Timing` header value, e.g. `db;dur=12.3;desc="4 queries"`."""
+        return f'db;dur={self.elapsed * 1000:.1f};desc="{self.count} queries"'.encode()
+
+
+query_stats_ctx: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _NUMBER.sub("?", statement)
+
+
+def _before_cursor_execute(conn, **_kw) -> None:
+    if query_stats_ctx.get() is not None:
+        conn.info[_START_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, statement: str, **_kw) -> None:
+    stats = query_stats_ctx.get()
+    if stats is None:
+        return
+    started_at = conn.info.pop(_START_KEY, None)
+    if started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statements executed on `engine` (pass `AsyncEngine.sync_engine` for async)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute, named=True)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute, named=True)
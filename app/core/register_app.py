@@ -1,4 +1,5 @@
 import logging
+import os
 import re
 from contextlib import asynccontextmanager
 
@@ -7,14 +8,22 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.core.auth import jwks_refresher
 from app.core.config import settings
-from app.core.database import db
+from app.core.database import async_db, async_replica_dbs, db, replica_dbs
 from app.core.logging import setup_logging
-from app.middleware import RequestLoggingMiddleware
+from app.core.metrics import mark_process_dead
+from app.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    RequestLoggingMiddleware,
+)
 from app.presentation.routes import (
     category_router,
     dashboard_router,
     health_router,
+    metrics_router,
     transaction_router,
 )
 
@@ -36,9 +45,21 @@ def register_app() -> FastAPI:
         )
         logger.info(f"Starting application with DATABASE_URL: {masked_url}")
         logger.info(f"Database connection test: {'OK' if db.ping() else 'FAILED'}")
+        if async_db is not None:
+            ok = await async_db.ping()
+            logger.info(f"Async database connection test: {'OK' if ok else 'FAILED'}")
+        jwks_refresher.start()
 
         yield
+        await jwks_refresher.stop()
         db.dispose()
+        if async_db is not None:
+            await async_db.dispose()
+        for replica in replica_dbs:
+            replica.dispose()
+        for replica in async_replica_dbs:
+            await replica.dispose()
+        mark_process_dead(os.getpid())
 
     app = FastAPI(
         title="Budget App API",
@@ -64,8 +85,32 @@ def register_app() -> FastAPI:
         print(f"DEBUG: Request body: {await request.body()}")
         return JSONResponse(status_code=422, content={"detail": exc.errors(), "body": exc.body})
 
-    app.add_middleware(RequestLoggingMiddleware)
+    if settings.DATABASE_REPLICA_URLS:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            cookie_name=settings.REPLICA_LAST_WRITE_COOKIE,
+            max_age_s=settings.REPLICA_READ_YOUR_WRITES_S,
+        )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        success_sample_rate=settings.LOG_SUCCESS_SAMPLE_RATE,
+        query_stats=settings.DB_QUERY_STATS,
+        n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+    )
+    if settings.COMPRESSION_ENABLED:
+        # ログのプレビューとサイズは圧縮前の本文で取るため、ログより外側に置く
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            content_types=settings.COMPRESSION_CONTENT_TYPES,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
     app.include_router(health_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
     app.include_router(transaction_router)
     app.include_router(category_router)
     app.include_router(dashboard_router)  # Add dashboard router
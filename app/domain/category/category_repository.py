@@ -19,7 +19,8 @@ class CategoryRepository(ABC):
     def find_all_by_user_id(self, user_id: str) -> list[Category]: ...
 
     @abstractmethod
-    def find_all_accessible_by_user(self, user_id: str) -> list[Category]: ...
+    def find_all_accessible_by_user(self, user_id: str) -> list[Category]:
+        """Default and user-specific categories, newest (created_at) first."""
 
     @abstractmethod
     def remove(self, entity_id: str) -> None: ...
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+from app.domain.dashboard.dashboard_entity import DashboardSummary
+
+
+class DashboardSummaryCache(ABC):
+    """
+    Cache interface for DashboardSummary results keyed by (user_id, from, to).
+
+    Each entry also records the user's aggregate version it was computed at,
+    and `get` only returns it for that version: a summary read before a write
+    committed can never be served once the write's version bump is visible,
+    while writes that leave the rollup alone keep every entry valid.
+    """
+
+    @abstractmethod
+    def get(self, user_id: str, from_: date, to: date, version: int) -> DashboardSummary | None: ...
+
+    @abstractmethod
+    def set(
+        self, user_id: str, from_: date, to: date, version: int, summary: DashboardSummary
+    ) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, user_id: str, *days: date) -> None:
+        """Drop the user's cached summaries whose period contains any of the given days."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int]: ...
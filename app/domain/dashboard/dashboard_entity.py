@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from datetime import date
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from enum import StrEnum
 
 from app.domain.transaction.transaction_value_objects import CategorySummary
 
@@ -30,3 +32,83 @@ class DashboardSummary:
     period: DashboardPeriod
     total: DashboardTotal
     by_category: list[DashboardCategoryBreakdown]
+
+
+@dataclass(slots=True)
+class DashboardAggregate:
+    """Raw totals for a period, as returned by a single aggregation query."""
+
+    expense: int
+    income: int
+    by_category: list[DashboardCategoryBreakdown]
+
+
+class TimeseriesGranularity(StrEnum):
+    """Bucket size of a dashboard time series."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def bucket_start(self, day: date) -> date:
+        """First day of the bucket containing `day` (weeks start on Monday)."""
+        if self is TimeseriesGranularity.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self is TimeseriesGranularity.MONTH:
+            return day.replace(day=1)
+        return day
+
+    def count(self, from_: date, to: date) -> int:
+        """Number of buckets overlapping [from_, to], computed without enumerating them."""
+        if from_ > to:
+            return 0
+        if self is TimeseriesGranularity.MONTH:
+            return (to.year - from_.year) * 12 + to.month - from_.month + 1
+        if self is TimeseriesGranularity.WEEK:
+            return (self.bucket_start(to) - self.bucket_start(from_)).days // 7 + 1
+        return (to - from_).days + 1
+
+    def buckets(self, from_: date, to: date) -> Iterator[date]:
+        """Start dates of every bucket overlapping [from_, to], in order."""
+        if from_ > to:
+            return
+        start = self.bucket_start(from_)
+        while start <= to:
+            yield start
+            try:
+                if self is TimeseriesGranularity.MONTH:
+                    start = (start + timedelta(days=31)).replace(day=1)
+                else:
+                    start += timedelta(days=7 if self is TimeseriesGranularity.WEEK else 1)
+            except OverflowError:
+                # date.max を含む最後のバケットまで返した
+                return
+
+
+@dataclass(slots=True)
+class DashboardTimeseries:
+    """
+    Income, expense, net and running balance per bucket, stored column by column.
+
+    `balance[i]` is `opening_balance` plus the net of every bucket up to and
+    including `periods[i]`.
+    """
+
+    granularity: TimeseriesGranularity
+    period: DashboardPeriod
+    opening_balance: int
+    periods: list[date] = field(default_factory=list)
+    income: list[int] = field(default_factory=list)
+    expense: list[int] = field(default_factory=list)
+    net: list[int] = field(default_factory=list)
+    balance: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DashboardTimeseriesPoint:
+    """One non-empty bucket as returned by the time series query."""
+
+    start: date
+    income: int
+    expense: int
+    balance: int
@@ -1,20 +1,29 @@
 from abc import ABC, abstractmethod
 from datetime import date
 
-from app.domain.dashboard.dashboard_entity import DashboardCategoryBreakdown, DashboardSummary
+from app.domain.dashboard.dashboard_entity import (
+    DashboardAggregate,
+    DashboardSummary,
+    DashboardTimeseriesPoint,
+    TimeseriesGranularity,
+)
 
 
 class DashboardSuammaryRepository(ABC):
     @abstractmethod
-    def get_expense_total(self, user_id: str, from_: date, to: date) -> int: ...
+    def get_aggregate(self, user_id: str, from_: date, to: date) -> DashboardAggregate: ...
 
     @abstractmethod
-    def get_income_total(self, user_id: str, from_: date, to: date) -> int: ...
+    def get_opening_balance(self, user_id: str, before: date) -> int:
+        """Income minus expense of every day before `before`."""
 
     @abstractmethod
-    def get_category_breakdown(
-        self,
-        user_id: str,
-        from_: date,
-        to: date,
-    ) -> list[DashboardCategoryBreakdown]: ...
+    def get_timeseries(
+        self, user_id: str, from_: date, to: date, granularity: TimeseriesGranularity
+    ) -> list[DashboardTimeseriesPoint]:
+        """
+        Non-empty buckets in [from_, to], oldest first.
+
+        Each point's balance is the running net over the range (excluding the
+        opening balance).
+        """
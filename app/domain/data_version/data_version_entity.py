@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class DataVersion:
+    """
+    Counter bumped whenever any of a user's data changes.
+
+    A user who never wrote anything has version 0 and no `updated_at`.
+    `aggregate_version` is bumped only by writes that change the daily
+    rollup, so edits such as a new description leave it (and everything
+    derived from the aggregates) untouched.
+    """
+
+    user_id: str
+    version: int = 0
+    updated_at: datetime | None = None
+    aggregate_version: int = 0
+    aggregate_updated_at: datetime | None = None
+
+    @property
+    def aggregate(self) -> "DataVersion":
+        """The aggregate counter viewed as a version of its own, for dashboard validators."""
+        return DataVersion(
+            user_id=self.user_id,
+            version=self.aggregate_version,
+            updated_at=self.aggregate_updated_at,
+        )
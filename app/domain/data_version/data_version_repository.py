@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+from app.domain.data_version.data_version_entity import DataVersion
+
+
+class DataVersionRepository(ABC):
+    @abstractmethod
+    def find_by_user_id(self, user_id: str) -> DataVersion: ...
+
+    @abstractmethod
+    def bump(self, *user_ids: str, aggregate: bool = False) -> None: ...
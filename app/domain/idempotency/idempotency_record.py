@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyRecord:
+    """
+    Outcome of a request sent with an `Idempotency-Key`.
+
+    Keys are scoped per user. `request_hash` identifies the payload the key was
+    first used with, so a retry can be told apart from a reused key.
+    """
+
+    user_id: str
+    key: str
+    request_hash: str
+    resource_id: UUID
+    created_at: datetime
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """The key was already used for a request with a different payload."""
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from app.domain.idempotency.idempotency_record import IdempotencyRecord
+
+
+class IdempotencyStore(ABC):
+    @abstractmethod
+    def claim(self, record: IdempotencyRecord) -> IdempotencyRecord | None:
+        """
+        Store `record` unless its (user_id, key) is already taken.
+
+        Returns None when the key was claimed, otherwise the existing record.
+        """
+
+    @abstractmethod
+    def release(self, user_id: str, key: str) -> None:
+        """Forget a claim whose request failed, so the client can retry it."""
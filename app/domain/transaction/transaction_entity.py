@@ -8,6 +8,9 @@ from app.domain.transaction.transaction_value_objects import (
     TransactionType,
 )
 
+# (type, amount, occurred_at, category_id, description): 取り込み時の重複判定キー
+TransactionFingerprint = tuple[str, int, date, UUID | None, str]
+
 
 @dataclass(eq=False, slots=True)
 class Transaction:
@@ -69,6 +72,17 @@ class Transaction:
         base = self.amount.value
         return base if self.type.is_income else -base
 
+    @property
+    def fingerprint(self) -> TransactionFingerprint:
+        """Return the user-visible content used to detect duplicate imports."""
+        return (
+            self.type.value,
+            self.amount.value,
+            self.occurred_at,
+            self.category.id if self.category else None,
+            self.description,
+        )
+
     def change_category(self, category_id: UUID, name: str | None = None) -> None:
         self.category = CategorySummary(id=category_id, name=name)
         self.updated_at = datetime.now(UTC)
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from datetime import date
+from uuid import UUID
+
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_value_objects import TransactionType
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionCursor:
+    """Keyset position in the (occurred_at, id) ordering of a user's transactions."""
+
+    occurred_at: date
+    id: UUID
+
+    @classmethod
+    def of(cls, transaction: Transaction) -> "TransactionCursor":
+        return cls(occurred_at=transaction.occurred_at, id=transaction.id)
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionFilter:
+    """Server-side filters applied to a transaction listing."""
+
+    from_: date | None = None
+    to: date | None = None
+    type: TransactionType | None = None
+    category_id: UUID | None = None
+    min_amount: int | None = None
+    max_amount: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionQuery:
+    """
+    Page request over a user's transactions, newest first.
+
+    `before` returns the page of older rows following the cursor,
+    `after` returns the page of newer rows preceding it.
+    """
+
+    limit: int = 50
+    before: TransactionCursor | None = None
+    after: TransactionCursor | None = None
+    filter: TransactionFilter = field(default_factory=TransactionFilter)
+
+    def __post_init__(self) -> None:
+        if self.limit <= 0:
+            raise ValueError("limit must be a positive integer.")
+        if self.before is not None and self.after is not None:
+            raise ValueError("before and after cannot be used together.")
+
+
+@dataclass(slots=True)
+class TransactionPage:
+    """One page of transactions with cursors to the neighbouring pages."""
+
+    items: list[Transaction]
+    next_cursor: TransactionCursor | None = None
+    prev_cursor: TransactionCursor | None = None
@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
-from datetime import date
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime
+from typing import Any
 from uuid import UUID
 
-from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_entity import Transaction, TransactionFingerprint
+from app.domain.transaction.transaction_query import (
+    TransactionFilter,
+    TransactionPage,
+    TransactionQuery,
+)
 
 
 class TransactionRepository(ABC):
@@ -13,7 +19,38 @@ class TransactionRepository(ABC):
     def add(self, entity: Transaction) -> None: ...
 
     @abstractmethod
-    def update(self, entity: Transaction) -> None: ...
+    def add_many(self, entities: list[Transaction]) -> None:
+        """Insert new transactions in batches within the current transaction."""
+
+    @abstractmethod
+    def update(self, entity: Transaction) -> Transaction | None:
+        """
+        Overwrite a transaction owned by `entity.user_id`; returns its previous
+        state, or None when the user has no such transaction.
+        """
+
+    @abstractmethod
+    def patch(
+        self, entity_id: UUID, user_id: str, changes: Mapping[str, Any], updated_at: datetime
+    ) -> tuple[Transaction | None, Transaction] | None:
+        """
+        Change only the given fields of a transaction owned by `user_id`.
+
+        `changes` maps field names (type, amount, occurred_at, category_id,
+        description) to their new values. Returns (previous, updated), where
+        previous is None when no rollup-relevant field changed, or None when
+        the user has no such transaction.
+        """
+
+    @abstractmethod
+    def patch_many(
+        self,
+        entity_ids: Sequence[UUID],
+        user_id: str,
+        changes: Mapping[str, Any],
+        updated_at: datetime,
+    ) -> list[tuple[Transaction | None, Transaction]]:
+        """Apply the same `changes` to the listed transactions owned by `user_id`."""
 
     @abstractmethod
     def find_by_id(self, entity_id: UUID) -> Transaction | None: ...
@@ -22,7 +59,15 @@ class TransactionRepository(ABC):
     def find_all(self) -> list[Transaction]: ...
 
     @abstractmethod
-    def remove(self, entity_id: UUID) -> None: ...
+    def remove(self, entity_id: UUID, user_id: str) -> Transaction | None:
+        """
+        Remove a transaction owned by `user_id` and return it as it was before
+        deletion, or None when the user has no such transaction.
+        """
+
+    @abstractmethod
+    def remove_many(self, entity_ids: Sequence[UUID], user_id: str) -> list[Transaction]:
+        """Remove the listed transactions owned by `user_id` and return the removed ones."""
 
     @abstractmethod
     def find_by_account_and_period(
@@ -31,3 +76,17 @@ class TransactionRepository(ABC):
 
     @abstractmethod
     def find_by_user_id(self, user_id: str) -> list[Transaction]: ...
+
+    @abstractmethod
+    def iter_by_user_id(
+        self, user_id: str, filter: TransactionFilter | None = None
+    ) -> Iterator[Transaction]:
+        """Stream all of a user's transactions, oldest first, in constant memory."""
+
+    @abstractmethod
+    def find_page_by_user_id(self, user_id: str, query: TransactionQuery) -> TransactionPage: ...
+
+    @abstractmethod
+    def find_fingerprints(
+        self, user_id: str, start: date, end: date
+    ) -> set[TransactionFingerprint]: ...
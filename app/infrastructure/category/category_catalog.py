@@ -0,0 +1,85 @@
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.category.category_entity import Category
+from app.infrastructure.category.category_dto import CategoryDTO
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    expires_at: float
+    # created_at の新しい順
+    categories: tuple[Category, ...]
+    names: Mapping[UUID, str]
+
+
+class CategoryCatalog:
+    """
+    Process-local snapshot of the default categories (`user_id IS NULL`).
+
+    The defaults are seeded by migrations and almost never change, so they are
+    loaded once and served from memory. The catalog is TTL-only: the app has
+    no write path for categories and migrations run in another process, so a
+    change shows up in each worker once its snapshot is older than
+    CATEGORY_CATALOG_TTL_S.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._snapshot: _Snapshot | None = None
+
+    def defaults(self, session: Session) -> tuple[Category, ...]:
+        """Default categories, newest first."""
+        return self._current(session).categories
+
+    def names(self, session: Session, ids: Iterable[UUID | None]) -> Mapping[UUID, str]:
+        """
+        Resolve category names for `ids`: defaults from memory, the remaining
+        (user-specific) ids with one primary-key lookup.
+        """
+        known = self._current(session).names
+        missing = {i for i in ids if i is not None and i not in known}
+        if not missing:
+            return known
+        rows = session.execute(
+            select(CategoryDTO.id, CategoryDTO.name).where(CategoryDTO.id.in_(missing))
+        ).all()
+        return {**known, **dict(rows)}
+
+    def _current(self, session: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < snapshot.expires_at:
+            return snapshot
+
+        # AsyncSession の run_sync 内では I/O 中に他のリクエストへ切り替わるため、
+        # ロックは使わない (同時に読み込んでも結果は同じで、後から読んだ方が残るだけ)
+        rows = (
+            session.execute(
+                select(CategoryDTO)
+                .where(CategoryDTO.user_id.is_(None))
+                .order_by(CategoryDTO.created_at.desc(), CategoryDTO.id)
+            )
+            .scalars()
+            .all()
+        )
+        snapshot = _Snapshot(
+            expires_at=time.monotonic() + self._ttl,
+            categories=tuple(row.to_entity() for row in rows),
+            names={row.id: row.name for row in rows},
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+
+def new_category_catalog() -> CategoryCatalog:
+    """Build the process-wide catalog from settings."""
+    return CategoryCatalog(ttl=settings.CATEGORY_CATALOG_TTL_S)
+
+
+category_catalog = new_category_catalog()
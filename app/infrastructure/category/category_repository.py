@@ -1,32 +1,41 @@
-from sqlalchemy import or_, select
+import heapq
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.domain.category.category_repository import CategoryRepository
+from app.infrastructure.category.category_catalog import CategoryCatalog, category_catalog
 from app.infrastructure.category.category_dto import CategoryDTO
 
 
 class CategoryRepositoryImpl(CategoryRepository):
     """In-memory implementation of CategoryRepository."""
 
-    def __init__(self, session: Session) -> None:
-        """Initialize with a SQLAlchemy session."""
+    def __init__(self, session: Session, catalog: CategoryCatalog = category_catalog) -> None:
+        """Initialize with a SQLAlchemy session and the default-category catalog."""
         self.session = session
+        self.catalog = catalog
 
     def find_all_accessible_by_user(self, user_id: str) -> list:
         """Find all categories accessible by user (default categories + user-specific categories)."""
+        # デフォルトカテゴリはカタログ (メモリ) から、ユーザー固有のカテゴリだけを DB から取得する
         rows = (
             self.session.execute(
-                select(CategoryDTO).where(
-                    or_(
-                        CategoryDTO.user_id.is_(None),  # デフォルトカテゴリ
-                        CategoryDTO.user_id == user_id  # ユーザー固有のカテゴリ
-                    )
-                )
+                select(CategoryDTO)
+                .where(CategoryDTO.user_id == user_id)
+                .order_by(CategoryDTO.created_at.desc(), CategoryDTO.id)
             )
             .scalars()
             .all()
         )
-        return [row.to_entity() for row in rows]
+        return list(
+            heapq.merge(
+                self.catalog.defaults(self.session),
+                (row.to_entity() for row in rows),
+                key=lambda c: c.created_at,
+                reverse=True,
+            )
+        )
 
     def find_all_by_user_id(self, user_id: str) -> list:
         """Deprecated: Use find_all_accessible_by_user instead."""
@@ -49,6 +58,8 @@ class CategoryRepositoryImpl(CategoryRepository):
         pass
 
 
-def new_category_repository(session: Session) -> CategoryRepository:
+def new_category_repository(
+    session: Session, catalog: CategoryCatalog = category_catalog
+) -> CategoryRepository:
     """Factory function to create a new CategoryRepository instance."""
-    return CategoryRepositoryImpl(session)
+    return CategoryRepositoryImpl(session, catalog)
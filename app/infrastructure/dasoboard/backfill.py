@@ -0,0 +1,24 @@
+"""
+daily_user_category_totals をトランザクションから再構築する
+
+    uv run python -m app.infrastructure.dasoboard.backfill [--user-id USER_ID]
+"""
+
+import argparse
+
+from app.core.database import db
+from app.infrastructure.dasoboard.daily_total_rollup import backfill_daily_totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the daily dashboard rollup")
+    parser.add_argument("--user-id", default=None, help="Rebuild only this user's rows")
+    args = parser.parse_args()
+
+    with db.session() as session:
+        rows = backfill_daily_totals(session, args.user_id)
+    print(f"Backfilled {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
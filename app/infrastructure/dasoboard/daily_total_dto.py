@@ -0,0 +1,23 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# 主キーに NULL は使えないため、カテゴリなしの取引はこの ID に集計する
+UNCATEGORIZED_ID = UUID(int=0)
+
+
+class DailyUserCategoryTotalDTO(Base):
+    """Daily rollup of transaction amounts per user, type and category"""
+
+    __tablename__ = "daily_user_category_totals"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column(String(7), primary_key=True)
+    category_id: Mapped[UUID] = mapped_column(primary_key=True)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(nullable=False, default=0)
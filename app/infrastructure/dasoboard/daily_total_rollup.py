@@ -0,0 +1,145 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Uuid, delete, func, insert, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.domain.transaction.transaction_entity import Transaction
+from app.infrastructure.dasoboard.daily_total_dto import (
+    UNCATEGORIZED_ID,
+    DailyUserCategoryTotalDTO,
+)
+from app.infrastructure.transaction.transaction_dto import TransactionDTO
+
+RollupKey = tuple[str, date, str, UUID]
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def rollup_key(user_id: str, occurred_at: date, type_: str, category_id: UUID | None) -> RollupKey:
+    return (user_id, occurred_at, type_, category_id or UNCATEGORIZED_ID)
+
+
+def entity_rollup_key(entity: Transaction) -> RollupKey:
+    return rollup_key(
+        entity.user_id,
+        entity.occurred_at,
+        entity.type.value,
+        entity.category.id if entity.category else None,
+    )
+
+
+def dto_rollup_key(row: TransactionDTO) -> RollupKey:
+    return rollup_key(row.user_id, row.occurred_at, row.type, row.category_id)
+
+
+class DailyTotalDeltas:
+    """
+    Accumulates signed (amount, count) changes per rollup key.
+
+    Changes to the same key are merged before writing, so an update that moves
+    nothing between days/categories costs no statement at all.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[RollupKey, list[int]] = {}
+
+    def add(self, key: RollupKey, amount: int) -> None:
+        self._apply(key, amount, 1)
+
+    def subtract(self, key: RollupKey, amount: int) -> None:
+        self._apply(key, -amount, -1)
+
+    def _apply(self, key: RollupKey, amount: int, count: int) -> None:
+        delta = self._deltas.setdefault(key, [0, 0])
+        delta[0] += amount
+        delta[1] += count
+
+    def apply(self, session: Session) -> bool:
+        """
+        Upsert the accumulated deltas in one statement (within the caller's transaction).
+
+        Rows left with no transactions by a subtraction are deleted right
+        after, so the table only holds days/categories that still have data.
+        Returns whether any rollup row changed, i.e. whether the aggregate
+        version has to be bumped.
+        """
+        rows = [
+            {
+                "user_id": user_id,
+                "day": day,
+                "type": type_,
+                "category_id": category_id,
+                "amount": amount,
+                "tx_count": count,
+            }
+            for (user_id, day, type_, category_id), (amount, count) in self._deltas.items()
+            if amount != 0 or count != 0
+        ]
+        self._deltas.clear()
+        if not rows:
+            return False
+
+        upsert = _UPSERTS[session.get_bind().dialect.name]
+        stmt = upsert(DailyUserCategoryTotalDTO)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day", "type", "category_id"],
+            set_={
+                "amount": DailyUserCategoryTotalDTO.amount + stmt.excluded.amount,
+                "tx_count": DailyUserCategoryTotalDTO.tx_count + stmt.excluded.tx_count,
+            },
+        )
+        session.execute(stmt, rows)
+
+        # 件数が減ったキーだけを対象に、0 件になった行を消す
+        emptied = [
+            (row["user_id"], row["day"], row["type"], row["category_id"])
+            for row in rows
+            if row["tx_count"] < 0
+        ]
+        if emptied:
+            session.execute(
+                delete(DailyUserCategoryTotalDTO)
+                .where(
+                    tuple_(
+                        DailyUserCategoryTotalDTO.user_id,
+                        DailyUserCategoryTotalDTO.day,
+                        DailyUserCategoryTotalDTO.type,
+                        DailyUserCategoryTotalDTO.category_id,
+                    ).in_(emptied)
+                )
+                .where(DailyUserCategoryTotalDTO.tx_count == 0),
+                execution_options={"synchronize_session": False},
+            )
+        return True
+
+
+def backfill_daily_totals(session: Session, user_id: str | None = None) -> int:
+    """Rebuild the rollup from raw transactions, for one user or for everyone."""
+    clear = delete(DailyUserCategoryTotalDTO)
+    source = select(
+        TransactionDTO.user_id,
+        TransactionDTO.occurred_at,
+        TransactionDTO.type,
+        func.coalesce(TransactionDTO.category_id, literal(UNCATEGORIZED_ID, Uuid())),
+        func.sum(TransactionDTO.amount),
+        func.count(),
+    ).group_by(
+        TransactionDTO.user_id,
+        TransactionDTO.occurred_at,
+        TransactionDTO.type,
+        TransactionDTO.category_id,
+    )
+    if user_id is not None:
+        clear = clear.where(DailyUserCategoryTotalDTO.user_id == user_id)
+        source = source.where(TransactionDTO.user_id == user_id)
+
+    session.execute(clear)
+    result = session.execute(
+        insert(DailyUserCategoryTotalDTO).from_select(
+            ["user_id", "day", "type", "category_id", "amount", "tx_count"], source
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,183 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from datetime import date
+from uuid import UUID
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.dashboard.dashboard_entity import (
+    DashboardCategoryBreakdown,
+    DashboardPeriod,
+    DashboardSummary,
+    DashboardTotal,
+)
+from app.domain.transaction.transaction_value_objects import CategorySummary
+
+Period = tuple[date, date]
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def as_dict(self, size: int) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": size,
+        }
+
+
+def _overlaps(period: Period, days: tuple[date, ...]) -> bool:
+    from_, to = period
+    return any(from_ <= day <= to for day in days)
+
+
+class InMemoryDashboardSummaryCache(DashboardSummaryCache):
+    """Process-local cache bounded by entry count (LRU) and age (TTL)."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # user_id -> キャッシュ済み期間（無効化時に対象ユーザーの期間だけを走査する）
+        self._periods: dict[str, set[Period]] = {}
+        self._lock = threading.Lock()
+        self._counters = _Counters()
+
+    def get(self, user_id, from_, to, version):
+        with self._lock:
+            entry = self._entries.get((user_id, from_, to))
+            if entry is None or entry[0] != version:
+                self._counters.misses += 1
+                return None
+            self._counters.hits += 1
+            return entry[1]
+
+    def set(self, user_id, from_, to, version, summary):
+        with self._lock:
+            self._entries[(user_id, from_, to)] = (version, summary)
+            periods = self._periods.setdefault(user_id, set())
+            # LRU/TTL で追い出された期間を掃除してから登録する
+            periods -= {p for p in periods if (user_id, *p) not in self._entries}
+            periods.add((from_, to))
+
+    def invalidate(self, user_id, *days):
+        with self._lock:
+            periods = self._periods.get(user_id)
+            if not periods:
+                return
+            for period in [p for p in periods if _overlaps(p, days)]:
+                periods.discard(period)
+                if self._entries.pop((user_id, *period), None) is not None:
+                    self._counters.invalidations += 1
+            if not periods:
+                del self._periods[user_id]
+
+    def stats(self):
+        with self._lock:
+            return self._counters.as_dict(len(self._entries))
+
+
+class SharedCacheBackend(ABC):
+    """Minimal key/value contract for a cache shared between workers (e.g. Redis)."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None: ...
+
+
+class SharedDashboardSummaryCache(DashboardSummaryCache):
+    """
+    DashboardSummaryCache on top of a SharedCacheBackend.
+
+    Summaries are stored as JSON together with their aggregate version; each user
+    also has an index entry listing the cached periods so that invalidation
+    can find the affected keys.
+    """
+
+    def __init__(self, backend: SharedCacheBackend, ttl: float, prefix: str = "dashboard") -> None:
+        self._backend = backend
+        self._ttl = ttl
+        self._prefix = prefix
+        self._counters = _Counters()
+
+    def _key(self, user_id: str, from_: date, to: date) -> str:
+        return f"{self._prefix}:{user_id}:{from_.isoformat()}:{to.isoformat()}"
+
+    def _index_key(self, user_id: str) -> str:
+        return f"{self._prefix}:{user_id}:periods"
+
+    def _periods(self, user_id: str) -> set[Period]:
+        raw = self._backend.get(self._index_key(user_id))
+        if not raw:
+            return set()
+        return {(date.fromisoformat(f), date.fromisoformat(t)) for f, t in json.loads(raw)}
+
+    def get(self, user_id, from_, to, version):
+        raw = self._backend.get(self._key(user_id, from_, to))
+        data = json.loads(raw) if raw is not None else None
+        if data is None or data.get("version") != version:
+            self._counters.misses += 1
+            return None
+        self._counters.hits += 1
+        return _decode_summary(data["summary"])
+
+    def set(self, user_id, from_, to, version, summary):
+        entry = json.dumps({"version": version, "summary": asdict(summary)}, default=str)
+        self._backend.set(self._key(user_id, from_, to), entry.encode(), self._ttl)
+        periods = self._periods(user_id) | {(from_, to)}
+        index = json.dumps([[f.isoformat(), t.isoformat()] for f, t in sorted(periods)])
+        self._backend.set(self._index_key(user_id), index.encode(), self._ttl)
+
+    def invalidate(self, user_id, *days):
+        stale = [p for p in self._periods(user_id) if _overlaps(p, days)]
+        if stale:
+            self._backend.delete(*(self._key(user_id, *p) for p in stale))
+            self._counters.invalidations += len(stale)
+
+    def stats(self):
+        return self._counters.as_dict(-1)
+
+
+def _decode_summary(data: dict) -> DashboardSummary:
+    return DashboardSummary(
+        period=DashboardPeriod(
+            from_=date.fromisoformat(data["period"]["from_"]),
+            to=date.fromisoformat(data["period"]["to"]),
+        ),
+        total=DashboardTotal(**data["total"]),
+        by_category=[
+            DashboardCategoryBreakdown(
+                # JSON では文字列になるため、リポジトリと同じ UUID に戻す
+                category=CategorySummary(
+                    id=UUID(cb["category"]["id"]), name=cb["category"]["name"]
+                ),
+                amount=cb["amount"],
+                ratio=cb["ratio"],
+            )
+            for cb in data["by_category"]
+        ],
+    )
+
+
+def new_dashboard_summary_cache() -> DashboardSummaryCache | None:
+    """Build the process-wide cache from settings (None when disabled)."""
+    if not settings.DASHBOARD_CACHE_ENABLED:
+        return None
+    return InMemoryDashboardSummaryCache(
+        maxsize=settings.DASHBOARD_CACHE_MAXSIZE, ttl=settings.DASHBOARD_CACHE_TTL_S
+    )
+
+
+dashboard_summary_cache = new_dashboard_summary_cache()
@@ -1,62 +1,171 @@
-from requests import Session
-from sqlalchemy import func, select
+from datetime import date
 
-from app.domain.dashboard.dashboard_entity import DashboardCategoryBreakdown, DashboardSummary
+from sqlalchemy import Date, case, cast, func, literal, select, type_coerce
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from app.domain.dashboard.dashboard_entity import (
+    DashboardAggregate,
+    DashboardCategoryBreakdown,
+    DashboardSummary,
+    DashboardTimeseriesPoint,
+    TimeseriesGranularity,
+)
 from app.domain.dashboard.dashboard_repository import DashboardSuammaryRepository
 from app.domain.transaction.transaction_value_objects import CategorySummary, TransactionType
 from app.infrastructure.category.category_dto import CategoryDTO
-from app.infrastructure.transaction.transaction_dto import TransactionDTO
+from app.infrastructure.dasoboard.daily_total_dto import DailyUserCategoryTotalDTO as DailyTotal
 
 
 class DashboardSuammaryRepositoryImpl(DashboardSuammaryRepository):
+    """
+    Dashboard queries answered from the daily_user_category_totals rollup.
+
+    Reads cost O(days in range x categories) regardless of how many
+    transactions the user has written.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
-    def get_expense_total(self, user_id, from_, to) -> int:
+    def get_aggregate(self, user_id, from_, to) -> DashboardAggregate:
+        """
+        Income total, expense total and per-category expenses in one round trip.
+
+        Rows are grouped per category with conditional sums, so the
+        (user_id, day) range is scanned once instead of three times.
+        """
+        dialect = self.db.get_bind().dialect.name
         stmt = (
-            select(func.coalesce(func.sum(TransactionDTO.amount), 0))
-            .where(TransactionDTO.user_id == user_id)
-            .where(TransactionDTO.occurred_at.between(from_, to))
-            .where(TransactionDTO.type == TransactionType.EXPENSE.value)
+            select(
+                DailyTotal.category_id,
+                CategoryDTO.name,
+                _conditional_sum(TransactionType.INCOME, dialect).label("income"),
+                _conditional_sum(TransactionType.EXPENSE, dialect).label("expense"),
+            )
+            .join(CategoryDTO, CategoryDTO.id == DailyTotal.category_id, isouter=True)
+            .where(DailyTotal.user_id == user_id)
+            .where(DailyTotal.day.between(from_, to))
+            .group_by(DailyTotal.category_id, CategoryDTO.name)
         )
-        return self.db.execute(stmt).scalar_one()
+        rows = self.db.execute(stmt).all()
 
-    def get_income_total(self, user_id, from_, to) -> int:
-        stmt = (
-            select(func.coalesce(func.sum(TransactionDTO.amount), 0))
-            .where(TransactionDTO.user_id == user_id)
-            .where(TransactionDTO.occurred_at.between(from_, to))
-            .where(TransactionDTO.type == TransactionType.INCOME.value)
+        # 名前の引けるカテゴリのみ内訳に含める
+        # (カテゴリなしの集計行は UNCATEGORIZED_ID なので結合されない)
+        by_category = _breakdowns(
+            [
+                (row.category_id, row.name, row.expense)
+                for row in rows
+                if row.expense is not None and row.name is not None
+            ]
+        )
+        # PostgreSQL の SUM(bigint) は numeric (Decimal) を返すため int に揃える
+        return DashboardAggregate(
+            expense=int(sum(row.expense or 0 for row in rows)),
+            income=int(sum(row.income or 0 for row in rows)),
+            by_category=by_category,
         )
-        return self.db.execute(stmt).scalar_one()
 
-    def get_category_breakdown(self, user_id, from_, to) -> list[DashboardCategoryBreakdown]:
+    def get_opening_balance(self, user_id, before) -> int:
         stmt = (
+            select(func.coalesce(func.sum(_signed_amount()), 0))
+            .where(DailyTotal.user_id == user_id)
+            .where(DailyTotal.day < before)
+        )
+        return int(self.db.execute(stmt).scalar_one())
+
+    def get_timeseries(self, user_id, from_, to, granularity) -> list[DashboardTimeseriesPoint]:
+        """
+        Per-bucket totals from the rollup with the running net computed by the database.
+
+        The rows are grouped per bucket first, so the window function runs
+        over at most one row per bucket.
+        """
+        dialect = self.db.get_bind().dialect.name
+        bucket = _bucket_start(granularity, dialect).label("bucket")
+        totals = (
             select(
-                TransactionDTO.category_id,
-                CategoryDTO.name,
-                func.coalesce(func.sum(TransactionDTO.amount), 0).label("amount"),
+                bucket,
+                func.coalesce(_conditional_sum(TransactionType.INCOME, dialect), 0).label("income"),
+                func.coalesce(_conditional_sum(TransactionType.EXPENSE, dialect), 0).label(
+                    "expense"
+                ),
+                func.sum(_signed_amount()).label("net"),
             )
-            .join(CategoryDTO, CategoryDTO.id == TransactionDTO.category_id)
-            .where(TransactionDTO.user_id == user_id)
-            .where(TransactionDTO.occurred_at.between(from_, to))
-            .where(TransactionDTO.type == TransactionType.EXPENSE.value)
-            .group_by(TransactionDTO.category_id, CategoryDTO.name)
+            .where(DailyTotal.user_id == user_id)
+            .where(DailyTotal.day.between(from_, to))
+            .group_by(bucket)
+            .subquery("totals")
         )
-        rows = self.db.execute(stmt).all()
-
-        total_expense = sum(row.amount for row in rows) or 0
-        if total_expense == 0:
-            return []
+        stmt = select(
+            totals.c.bucket,
+            totals.c.income,
+            totals.c.expense,
+            func.sum(totals.c.net).over(order_by=totals.c.bucket).label("balance"),
+        ).order_by(totals.c.bucket)
 
-        breakdowns: list[DashboardCategoryBreakdown] = []
-        for row in rows:
-            category = CategorySummary(id=row.category_id, name=row.name)
-            ratio = float(row.amount) / float(total_expense)
-            breakdowns.append(
-                DashboardCategoryBreakdown(category=category, amount=row.amount, ratio=ratio)
+        # PostgreSQL の SUM(bigint) は numeric (Decimal) を返すため int に揃える
+        return [
+            DashboardTimeseriesPoint(
+                start=_as_date(row.bucket),
+                income=int(row.income),
+                expense=int(row.expense),
+                balance=int(row.balance),
             )
-        return breakdowns
+            for row in self.db.execute(stmt)
+        ]
+
+
+def _signed_amount() -> ColumnElement:
+    """Rollup amount signed like Transaction.signed_amount, counting only income and expense."""
+    return case(
+        (DailyTotal.type == TransactionType.INCOME.value, DailyTotal.amount),
+        (DailyTotal.type == TransactionType.EXPENSE.value, -DailyTotal.amount),
+        else_=0,
+    )
+
+
+def _bucket_start(granularity: TimeseriesGranularity, dialect: str) -> ColumnElement:
+    """First day of the bucket containing DailyTotal.day (weeks start on Monday)."""
+    if granularity is TimeseriesGranularity.DAY:
+        return DailyTotal.day
+    if dialect == "postgresql":
+        # 単位をバインド変数にすると SELECT と GROUP BY の式が別物とみなされるためリテラルで埋め込む
+        unit = literal(granularity.value, literal_execute=True)
+        return cast(func.date_trunc(unit, DailyTotal.day), Date)
+    # SQLite: 6 日戻ってから次の月曜日 (当日を含む) に進めると、その週の月曜日になる
+    if granularity is TimeseriesGranularity.WEEK:
+        return type_coerce(func.date(DailyTotal.day, "-6 days", "weekday 1"), Date)
+    return type_coerce(func.date(DailyTotal.day, "start of month"), Date)
+
+
+def _as_date(value: date | str) -> date:
+    # SQLite の集約結果は型情報を失い、文字列のまま返ることがある
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _conditional_sum(type_: TransactionType, dialect: str) -> ColumnElement:
+    """SUM(amount) FILTER (WHERE type = ...), or SUM(CASE ...) outside PostgreSQL."""
+    is_type = DailyTotal.type == type_.value
+    if dialect == "postgresql":
+        return func.sum(DailyTotal.amount).filter(is_type)
+    return func.sum(case((is_type, DailyTotal.amount)))
+
+
+def _breakdowns(rows: list[tuple]) -> list[DashboardCategoryBreakdown]:
+    """Build category breakdowns with each category's ratio of the listed expenses."""
+    total_expense = sum(amount for (_, _, amount) in rows) or 0
+    if total_expense == 0:
+        return []
+
+    breakdowns: list[DashboardCategoryBreakdown] = []
+    for category_id, name, amount in rows:
+        category = CategorySummary(id=category_id, name=name)
+        ratio = float(amount) / float(total_expense)
+        breakdowns.append(
+            DashboardCategoryBreakdown(category=category, amount=int(amount), ratio=ratio)
+        )
+    return breakdowns
 
 
 def new_dashboard_summary_repository(session: Session) -> DashboardSuammaryRepository:
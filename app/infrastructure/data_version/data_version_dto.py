@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.domain.data_version.data_version_entity import DataVersion
+
+
+class UserDataVersionDTO(Base):
+    """Per-user change counter used for conditional GETs"""
+
+    __tablename__ = "user_data_versions"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # 日次ロールアップを変えた書き込みだけで進める版 (ダッシュボード用)
+    aggregate_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    aggregate_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def to_entity(self) -> DataVersion:
+        return DataVersion(
+            user_id=self.user_id,
+            version=self.version,
+            updated_at=self.updated_at,
+            aggregate_version=self.aggregate_version,
+            aggregate_updated_at=self.aggregate_updated_at,
+        )
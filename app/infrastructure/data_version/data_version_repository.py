@@ -0,0 +1,71 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.domain.data_version.data_version_entity import DataVersion
+from app.domain.data_version.data_version_repository import DataVersionRepository
+from app.infrastructure.data_version.data_version_dto import UserDataVersionDTO
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+class DataVersionRepositoryImpl(DataVersionRepository):
+    """SQLAlchemy implementation of DataVersionRepository."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def find_by_user_id(self, user_id: str) -> DataVersion:
+        """Primary-key lookup; version 0 when the user has never written."""
+        row = self.session.execute(
+            select(
+                UserDataVersionDTO.version,
+                UserDataVersionDTO.updated_at,
+                UserDataVersionDTO.aggregate_version,
+                UserDataVersionDTO.aggregate_updated_at,
+            ).where(UserDataVersionDTO.user_id == user_id)
+        ).first()
+        if row is None:
+            return DataVersion(user_id=user_id)
+        return DataVersion(user_id=user_id, **row._mapping)
+
+    def bump(self, *user_ids: str, aggregate: bool = False) -> None:
+        bump_data_versions(self.session, *user_ids, aggregate=aggregate)
+
+
+def bump_data_versions(session: Session, *user_ids: str, aggregate: bool = False) -> None:
+    """
+    Increment the users' versions within the caller's transaction.
+
+    `aggregate` also increments the aggregate version; pass it only when the
+    write changed the daily rollup.
+    """
+    if not user_ids:
+        return
+    now = datetime.now(UTC)
+    upsert = _UPSERTS[session.get_bind().dialect.name]
+    stmt = upsert(UserDataVersionDTO)
+    set_ = {"version": UserDataVersionDTO.version + 1, "updated_at": stmt.excluded.updated_at}
+    if aggregate:
+        set_["aggregate_version"] = UserDataVersionDTO.aggregate_version + 1
+        set_["aggregate_updated_at"] = stmt.excluded.aggregate_updated_at
+    stmt = stmt.on_conflict_do_update(index_elements=["user_id"], set_=set_)
+    # 同時更新でのデッドロックを避けるため、常に同じ順序で行ロックを取る
+    rows = [
+        {
+            "user_id": u,
+            "version": 1,
+            "updated_at": now,
+            "aggregate_version": 1 if aggregate else 0,
+            "aggregate_updated_at": now if aggregate else None,
+        }
+        for u in sorted(set(user_ids))
+    ]
+    session.execute(stmt, rows)
+
+
+def new_data_version_repository(session: Session) -> DataVersionRepository:
+    return DataVersionRepositoryImpl(session)
@@ -0,0 +1,45 @@
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import ReadOnlySession
+
+U = TypeVar("U")
+
+
+class AsyncUseCase(Generic[U]):
+    """
+    Awaitable facade over a use case, so routes never block the event loop on the DB.
+
+    With an AsyncSession the use case runs through `run_sync`: repository code stays
+    unchanged while every round trip goes through the async driver. With a sync
+    Session (DB_ASYNC=false) the use case runs in the threadpool.
+
+    A ReadOnlySession is closed right after the use case returns, so its
+    connection goes back to the pool without waiting for the response.
+    """
+
+    def __init__(self, session: Session | AsyncSession, build: Callable[[Session], U]) -> None:
+        self._session = session
+        self._build = build
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(self._session, AsyncSession):
+            try:
+                return await self._session.run_sync(
+                    lambda session: self._build(session).execute(*args, **kwargs)
+                )
+            finally:
+                if isinstance(self._session.sync_session, ReadOnlySession):
+                    await self._session.close()
+        return await run_in_threadpool(self._run_sync, *args, **kwargs)
+
+    def _run_sync(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self._build(self._session).execute(*args, **kwargs)
+        finally:
+            if isinstance(self._session, ReadOnlySession):
+                self._session.close()
@@ -1,12 +1,17 @@
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.domain.category.category_repository import CategoryRepository
-from app.domain.dashboard.dashboard_repository import DashboardSuammaryRepository
-from app.domain.transaction.transaction_repository import TransactionRepository
+from app.core.config import settings
+from app.core.database import get_db_session_factory, get_session
 from app.infrastructure.category.category_repository import new_category_repository
+from app.infrastructure.dasoboard.dashboard_cache import dashboard_summary_cache
 from app.infrastructure.dasoboard.dashboard_repository import new_dashboard_summary_repository
+from app.infrastructure.data_version.data_version_repository import new_data_version_repository
+from app.infrastructure.di.async_usecase import AsyncUseCase
+from app.infrastructure.di.session import get_read_session, is_replica_session, note_write
+from app.infrastructure.di.streaming_usecase import StreamingUseCase
+from app.infrastructure.idempotency.idempotency_store import new_idempotency_store
 from app.infrastructure.transaction.transaction_repository import (
     new_transaction_repository,
 )
@@ -18,6 +23,22 @@ from app.usecase.dashboard.get_dashboard_summary_usecase import (
     GetDashboardSummaryUseCase,
     new_get_dashboard_summary_usecase,
 )
+from app.usecase.dashboard.get_dashboard_timeseries_usecase import (
+    GetDashboardTimeseriesUseCase,
+    new_get_dashboard_timeseries_usecase,
+)
+from app.usecase.data_version.get_data_version_usecase import (
+    GetDataVersionUseCase,
+    new_get_data_version_usecase,
+)
+from app.usecase.transaction.batch_delete_transactions_usecase import (
+    BatchDeleteTransactionsUseCase,
+    new_batch_delete_transactions_usecase,
+)
+from app.usecase.transaction.batch_update_transactions_usecase import (
+    BatchUpdateTransactionsUseCase,
+    new_batch_update_transactions_usecase,
+)
 from app.usecase.transaction.create_transaction_usecase import (
     CreateTransactionUseCase,
     new_create_transaction_usecase,
@@ -26,61 +47,170 @@ from app.usecase.transaction.delete_transaction_usecase import (
     DeleteTransactionUseCase,
     new_delete_transaction_usecase,
 )
+from app.usecase.transaction.export_transactions_usecase import (
+    ExportTransactionsUseCase,
+    new_export_transactions_usecase,
+)
 from app.usecase.transaction.get_transactions_usecase import (
     GetTransactionsUseCase,
     new_get_transactions_usecase,
 )
+from app.usecase.transaction.import_transactions_usecase import (
+    ImportTransactionsUseCase,
+    new_import_transactions_usecase,
+)
+from app.usecase.transaction.patch_transaction_usecase import (
+    PatchTransactionUseCase,
+    new_patch_transaction_usecase,
+)
 from app.usecase.transaction.put_transaction_usecase import (
     PutTransactionUseCase,
     new_put_transaction_usecase,
 )
 
-
-def get_dasyboard_summary_repository(
-    session: Session = Depends(get_db),
-) -> DashboardSuammaryRepository:
-    return new_dashboard_summary_repository(session)
+# 各 provider はセッションからユースケースを組み立てる関数を AsyncUseCase に渡す。
+# AsyncSession の場合は run_sync 内で、同期 Session の場合はスレッドプールで実行される。
+# 参照専用のユースケースは get_read_session (レプリカ) を使い、書き込むユースケースは
+# note_write でそのユーザーの直後の参照を主系に向ける。
 
 
 def get_dashboard_summary_usecase(
-    dashboard_repo: DashboardSuammaryRepository = Depends(get_dasyboard_summary_repository),
-) -> GetDashboardSummaryUseCase:
-    return new_get_dashboard_summary_usecase(dashboard_repo)
-
-
-def get_transaction_repository(session: Session = Depends(get_db)) -> TransactionRepository:
-    return new_transaction_repository(session)
+    session: Session | AsyncSession = Depends(get_read_session),
+) -> AsyncUseCase[GetDashboardSummaryUseCase]:
+    return AsyncUseCase(
+        session,
+        # レプリカの (遅れているかもしれない) 集計は共有キャッシュに入れない
+        lambda s: new_get_dashboard_summary_usecase(
+            new_dashboard_summary_repository(s),
+            dashboard_summary_cache,
+            fill_cache=not is_replica_session(s),
+        ),
+    )
+
+
+def get_dashboard_timeseries_usecase(
+    session: Session | AsyncSession = Depends(get_read_session),
+) -> AsyncUseCase[GetDashboardTimeseriesUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_get_dashboard_timeseries_usecase(
+            new_dashboard_summary_repository(s), settings.DASHBOARD_TIMESERIES_MAX_POINTS
+        ),
+    )
 
 
 def get_create_transaction_usecase(
-    transaction_repo: TransactionRepository = Depends(get_transaction_repository),
-) -> CreateTransactionUseCase:
-    return new_create_transaction_usecase(transaction_repo)
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[CreateTransactionUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_create_transaction_usecase(
+            new_transaction_repository(s), dashboard_summary_cache, new_idempotency_store(s)
+        ),
+    )
+
+
+def get_import_transactions_usecase(
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[ImportTransactionsUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_import_transactions_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
 
 
 def get_put_transaction_usecase(
-    transaction_repo: TransactionRepository = Depends(get_transaction_repository),
-) -> PutTransactionUseCase:
-    return new_put_transaction_usecase(transaction_repo)
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[PutTransactionUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_put_transaction_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
+
+
+def get_patch_transaction_usecase(
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[PatchTransactionUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_patch_transaction_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
 
 
 def get_get_transactions_usecase(
-    transaction_repo: TransactionRepository = Depends(get_transaction_repository),
-) -> GetTransactionsUseCase:
-    return new_get_transactions_usecase(transaction_repo)
+    session: Session | AsyncSession = Depends(get_read_session),
+) -> AsyncUseCase[GetTransactionsUseCase]:
+    return AsyncUseCase(
+        session, lambda s: new_get_transactions_usecase(new_transaction_repository(s))
+    )
 
 
-def get_delete_transaction_usecase(
-    transaction_repo: TransactionRepository = Depends(get_transaction_repository),
-) -> DeleteTransactionUseCase:
-    return new_delete_transaction_usecase(transaction_repo)
+def get_export_transactions_usecase(
+    session_factory=Depends(get_db_session_factory),
+) -> StreamingUseCase[ExportTransactionsUseCase]:
+    # レスポンス本文の送信中も使うため、リクエストのセッションではなく専用のセッションで実行する
+    return StreamingUseCase(
+        session_factory, lambda s: new_export_transactions_usecase(new_transaction_repository(s))
+    )
 
 
-def get_category_repository(session: Session = Depends(get_db)) -> CategoryRepository:
-    return new_category_repository(session)
+def get_delete_transaction_usecase(
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[DeleteTransactionUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_delete_transaction_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
+
+
+def get_batch_update_transactions_usecase(
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[BatchUpdateTransactionsUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_batch_update_transactions_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
+
+
+def get_batch_delete_transactions_usecase(
+    session: Session | AsyncSession = Depends(get_session),
+    _: None = Depends(note_write),
+) -> AsyncUseCase[BatchDeleteTransactionsUseCase]:
+    return AsyncUseCase(
+        session,
+        lambda s: new_batch_delete_transactions_usecase(
+            new_transaction_repository(s), dashboard_summary_cache
+        ),
+    )
 
 
 def get_get_category_list_usecase(
-    category_repo: CategoryRepository = Depends(get_category_repository),
-) -> GetCategoryListUseCase:
-    return new_get_category_list_usecase(category_repo)
+    session: Session | AsyncSession = Depends(get_read_session),
+) -> AsyncUseCase[GetCategoryListUseCase]:
+    return AsyncUseCase(
+        session, lambda s: new_get_category_list_usecase(new_category_repository(s))
+    )
+
+
+def get_data_version_usecase(
+    session: Session | AsyncSession = Depends(get_read_session),
+) -> AsyncUseCase[GetDataVersionUseCase]:
+    return AsyncUseCase(
+        session, lambda s: new_get_data_version_usecase(new_data_version_repository(s))
+    )
@@ -0,0 +1,92 @@
+"""
+Request sessions that depend on the current user.
+
+Reads go to a replica unless the user wrote within REPLICA_READ_YOUR_WRITES_S.
+Each worker remembers its own writes, and the write's response also carries the
+time in a cookie (set by ReadYourWritesMiddleware) so that a read served by
+another worker goes to the primary as well.
+"""
+
+import time
+from collections.abc import AsyncIterator, Iterator
+
+from fastapi import Depends, Request
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.auth import AuthContext, get_current_user
+from app.core.config import settings
+from app.core.database import get_async_readonly_db, get_readonly_db
+
+# note_write が書き込み時刻を置く request.state の属性名 (ReadYourWritesMiddleware が読む)
+LAST_WRITE_STATE = "last_write_at"
+
+
+def is_replica_session(session: Session | AsyncSession) -> bool:
+    """True for sessions opened on a read replica, whose data may lag the primary."""
+    return bool(session.info.get("replica"))
+
+
+def _client_last_write(request: Request) -> float | None:
+    raw = request.cookies.get(settings.REPLICA_LAST_WRITE_COOKIE)
+    try:
+        return float(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def get_read_db(
+    request: Request,
+    auth: AuthContext = Depends(get_current_user),
+    primary: Session = Depends(get_readonly_db),
+) -> Iterator[Session]:
+    """Session on a healthy replica, or the (lazily connected) primary session."""
+    index = database.replicas.pick(auth.sub, _client_last_write(request))
+    if index is not None:
+        with database.replica_dbs[index].read_session() as s:
+            # 接続できなければこのリクエストから主系に切り替える
+            try:
+                s.connection()
+            except OperationalError:
+                database.replicas.mark_unhealthy(index)
+            else:
+                s.info["replica"] = True
+                yield s
+                return
+    yield primary
+
+
+async def get_async_read_db(
+    request: Request,
+    auth: AuthContext = Depends(get_current_user),
+    primary: AsyncSession = Depends(get_async_readonly_db),
+) -> AsyncIterator[AsyncSession]:
+    index = database.replicas.pick(auth.sub, _client_last_write(request))
+    if index is not None:
+        async with database.async_replica_dbs[index].read_session() as s:
+            try:
+                await s.connection()
+            except OperationalError:
+                database.replicas.mark_unhealthy(index)
+            else:
+                s.info["replica"] = True
+                yield s
+                return
+    yield primary
+
+
+def note_write(request: Request, auth: AuthContext = Depends(get_current_user)) -> Iterator[None]:
+    """Keep the user's reads on the primary until shortly after this request."""
+    database.replicas.note_write(auth.sub)
+    setattr(request.state, LAST_WRITE_STATE, time.time())
+    yield
+    database.replicas.note_write(auth.sub)
+
+
+# 参照専用のユースケースのセッション: コミットせず、ユースケースが終わった時点で接続を返す
+if not database.replicas.size:
+    get_read_session = get_async_readonly_db if settings.DB_ASYNC else get_readonly_db
+else:
+    get_read_session = get_async_read_db if settings.DB_ASYNC else get_read_db
@@ -0,0 +1,30 @@
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.orm import Session
+
+U = TypeVar("U")
+
+
+class StreamingUseCase(Generic[U]):
+    """
+    Lazy facade over a use case whose execute() returns an iterator.
+
+    A StreamingResponse body is consumed after the request's dependencies have
+    been torn down, so the use case runs on its own session that lives exactly
+    as long as the iteration. Starlette drives sync iterators from the
+    threadpool, which keeps the event loop free.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractContextManager[Session]],
+        build: Callable[[Session], U],
+    ) -> None:
+        self._session_factory = session_factory
+        self._build = build
+
+    def iterate(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        with self._session_factory() as session:
+            yield from self._build(session).execute(*args, **kwargs)
@@ -0,0 +1,33 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.domain.idempotency.idempotency_record import IdempotencyRecord
+
+
+class IdempotencyKeyDTO(Base):
+    """Idempotency-Key claims of create requests, kept until `expires_at`"""
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    resource_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def to_entity(self) -> IdempotencyRecord:
+        return IdempotencyRecord(
+            user_id=self.user_id,
+            key=self.key,
+            request_hash=self.request_hash,
+            resource_id=self.resource_id,
+            created_at=self.created_at,
+        )
@@ -0,0 +1,133 @@
+import threading
+from datetime import UTC, datetime, timedelta
+
+from cachetools import TTLCache
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.idempotency.idempotency_record import IdempotencyRecord
+from app.domain.idempotency.idempotency_store import IdempotencyStore
+from app.infrastructure.idempotency.idempotency_dto import IdempotencyKeyDTO
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+_PURGE_BATCH_SIZE = 1000
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Process-local store bounded by entry count (LRU) and age (TTL).
+
+    Only suitable for a single worker: retries routed to another process are
+    not recognised, and claims are not rolled back with the database
+    transaction (the use case releases them when the insert fails).
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def claim(self, record):
+        with self._lock:
+            existing = self._entries.get((record.user_id, record.key))
+            if existing is not None:
+                return existing
+            self._entries[(record.user_id, record.key)] = record
+            return None
+
+    def release(self, user_id, key):
+        with self._lock:
+            self._entries.pop((user_id, key), None)
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """
+    Store backed by the `idempotency_keys` table.
+
+    The claim is written in the caller's transaction, so it commits or rolls
+    back together with the insert it protects. A concurrent request with the
+    same key waits on the primary key until the first one finishes and then
+    sees its record.
+    """
+
+    def __init__(self, session: Session, ttl: float) -> None:
+        self.session = session
+        self._ttl = timedelta(seconds=ttl)
+
+    def claim(self, record):
+        now = datetime.now(UTC)
+        upsert = _UPSERTS[self.session.get_bind().dialect.name]
+        stmt = upsert(IdempotencyKeyDTO).values(
+            user_id=record.user_id,
+            key=record.key,
+            request_hash=record.request_hash,
+            resource_id=record.resource_id,
+            created_at=record.created_at,
+            expires_at=now + self._ttl,
+        )
+        # 期限切れの行だけは上書きして再利用する (有効な行があれば何もしない)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "resource_id": stmt.excluded.resource_id,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=IdempotencyKeyDTO.expires_at <= now,
+        ).returning(IdempotencyKeyDTO.user_id)
+        if self.session.execute(stmt).first() is not None:
+            return None
+
+        existing = self.session.execute(
+            select(IdempotencyKeyDTO).where(
+                IdempotencyKeyDTO.user_id == record.user_id,
+                IdempotencyKeyDTO.key == record.key,
+            )
+        ).scalar_one()
+        return existing.to_entity()
+
+    def release(self, user_id, key):
+        # 行は呼び出し元のトランザクションと一緒にロールバックされる
+        return
+
+
+def purge_expired_idempotency_keys(session: Session, now: datetime | None = None) -> int:
+    """Delete expired claims in batches; returns the number of deleted rows."""
+    now = now or datetime.now(UTC)
+    deleted = 0
+    while True:
+        ids = select(IdempotencyKeyDTO.user_id, IdempotencyKeyDTO.key).where(
+            IdempotencyKeyDTO.expires_at <= now
+        )
+        batch = session.execute(ids.limit(_PURGE_BATCH_SIZE)).all()
+        if not batch:
+            return deleted
+        session.execute(
+            delete(IdempotencyKeyDTO).where(
+                tuple_(IdempotencyKeyDTO.user_id, IdempotencyKeyDTO.key).in_(batch)
+            )
+        )
+        # ロックを長く持たないようバッチごとにコミットする
+        session.commit()
+        deleted += len(batch)
+
+
+def new_shared_idempotency_store() -> IdempotencyStore | None:
+    """Build the process-wide store from settings (None when claims live in the database)."""
+    if settings.IDEMPOTENCY_BACKEND != "memory":
+        return None
+    return InMemoryIdempotencyStore(
+        maxsize=settings.IDEMPOTENCY_MEMORY_MAXSIZE, ttl=settings.IDEMPOTENCY_TTL_S
+    )
+
+
+shared_idempotency_store = new_shared_idempotency_store()
+
+
+def new_idempotency_store(session: Session) -> IdempotencyStore:
+    if shared_idempotency_store is not None:
+        return shared_idempotency_store
+    return DatabaseIdempotencyStore(session, ttl=settings.IDEMPOTENCY_TTL_S)
@@ -0,0 +1,18 @@
+"""
+期限切れの Idempotency-Key を削除する (cron などで定期的に実行する)
+
+    uv run python -m app.infrastructure.idempotency.purge
+"""
+
+from app.core.database import db
+from app.infrastructure.idempotency.idempotency_store import purge_expired_idempotency_keys
+
+
+def main() -> None:
+    with db.session() as session:
+        deleted = purge_expired_idempotency_keys(session)
+    print(f"Purged {deleted} expired idempotency keys")
+
+
+if __name__ == "__main__":
+    main()
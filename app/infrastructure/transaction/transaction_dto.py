@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, String
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -18,6 +18,10 @@ class TransactionDTO(Base):
     """Data Transfer Object for Transaction entity"""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # キーセットページネーション (user_id, occurred_at, id) 用
+        Index("ix_transactions_user_id_occurred_at_id", "user_id", "occurred_at", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
@@ -1,22 +1,51 @@
-from collections.abc import Iterable
-from datetime import date
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, delete, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_entity import Transaction, TransactionFingerprint
+from app.domain.transaction.transaction_query import (
+    TransactionCursor,
+    TransactionFilter,
+    TransactionPage,
+    TransactionQuery,
+)
 from app.domain.transaction.transaction_repository import TransactionRepository
-from app.infrastructure.category.category_dto import CategoryDTO
+from app.domain.transaction.transaction_value_objects import Amount, TransactionType
+from app.infrastructure.category.category_catalog import CategoryCatalog, category_catalog
+from app.infrastructure.dasoboard.daily_total_rollup import (
+    DailyTotalDeltas,
+    dto_rollup_key,
+    entity_rollup_key,
+)
+from app.infrastructure.data_version.data_version_repository import bump_data_versions
 from app.infrastructure.transaction.transaction_dto import TransactionDTO
 
+# 複数行 INSERT 1 文あたりの行数
+_INSERT_BATCH_SIZE = 1000
+# エクスポート時にサーバーサイドカーソルから一度に取り出す行数
+_STREAM_BATCH_SIZE = 1000
+# 部分更新できる項目と、そのうち日次ロールアップに影響する項目
+_PATCHABLE_FIELDS = frozenset({"type", "amount", "occurred_at", "category_id", "description"})
+_ROLLUP_FIELDS = frozenset({"type", "amount", "occurred_at", "category_id"})
+
 
 class TransactionRepositoryImpl(TransactionRepository):
     """SQLAlchemy implementation of TransactionRepository."""
 
-    def __init__(self, session: Session) -> None:
-        """Initialize with a SQLAlchemy session."""
+    def __init__(self, session: Session, catalog: CategoryCatalog = category_catalog) -> None:
+        """Initialize with a SQLAlchemy session and the category catalog used for names."""
         self.session = session
+        self.catalog = catalog
+
+    def _to_entities(self, dtos: Iterable[TransactionDTO]) -> list[Transaction]:
+        # categories と JOIN せず、カテゴリ名はカタログから解決する
+        dtos = list(dtos)
+        names = self.catalog.names(self.session, {dto.category_id for dto in dtos})
+        return [dto.to_entity(names.get(dto.category_id)) for dto in dtos]
 
     def find_all(self) -> list[Transaction]:
         """Retrieve all transactions."""
@@ -25,48 +54,243 @@ class TransactionRepositoryImpl(TransactionRepository):
 
     def find_by_user_id(self, user_id: str) -> list[Transaction]:
         """Retrieve transactions by user ID."""
-        stmt = (
-            select(TransactionDTO, CategoryDTO.name)
-            .join(CategoryDTO, TransactionDTO.category_id == CategoryDTO.id, isouter=True)
-            .where(TransactionDTO.user_id == user_id)
-        )
-        rows = self.session.execute(stmt).all()
-        return [dto.to_entity(category_name) for (dto, category_name) in rows]
+        stmt = select(TransactionDTO).where(TransactionDTO.user_id == user_id)
+        return self._to_entities(self.session.execute(stmt).scalars())
+
+    def iter_by_user_id(
+        self, user_id: str, filter: TransactionFilter | None = None
+    ) -> Iterator[Transaction]:
+        """Stream a user's transactions oldest first through a server-side cursor."""
+        stmt = select(TransactionDTO).where(TransactionDTO.user_id == user_id)
+        if filter is not None:
+            stmt = _apply_filter(stmt, filter)
+        stmt = stmt.order_by(TransactionDTO.occurred_at.asc(), TransactionDTO.id.asc())
+
+        # yield_per は stream_results を伴い、psycopg では名前付きカーソルで取得する
+        result = self.session.execute(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        # identity map は弱参照なので、変換済みの DTO はバッチごとに解放される
+        for batch in result.scalars().partitions():
+            yield from self._to_entities(batch)
+
+    def find_page_by_user_id(self, user_id: str, query: TransactionQuery) -> TransactionPage:
+        """Retrieve one keyset page of a user's transactions, newest first."""
+        stmt = select(TransactionDTO).where(TransactionDTO.user_id == user_id)
+        stmt = _apply_filter(stmt, query.filter)
+
+        key = tuple_(TransactionDTO.occurred_at, TransactionDTO.id)
+        if query.after is not None:
+            # 新しい側へ遡る: 昇順で取得して反転する
+            stmt = stmt.where(key > tuple_(query.after.occurred_at, query.after.id)).order_by(
+                TransactionDTO.occurred_at.asc(), TransactionDTO.id.asc()
+            )
+        else:
+            if query.before is not None:
+                stmt = stmt.where(key < tuple_(query.before.occurred_at, query.before.id))
+            stmt = stmt.order_by(TransactionDTO.occurred_at.desc(), TransactionDTO.id.desc())
+
+        # 1件多く取得して次ページの有無を判定する
+        rows = self.session.execute(stmt.limit(query.limit + 1)).scalars().all()
+        has_more = len(rows) > query.limit
+        items = self._to_entities(rows[: query.limit])
+
+        if query.after is not None:
+            items.reverse()
+            next_cursor = TransactionCursor.of(items[-1]) if items else None
+            prev_cursor = TransactionCursor.of(items[0]) if items and has_more else None
+        else:
+            next_cursor = TransactionCursor.of(items[-1]) if items and has_more else None
+            prev_cursor = (
+                TransactionCursor.of(items[0]) if items and query.before is not None else None
+            )
+
+        return TransactionPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
 
     def add(self, entity: Transaction) -> None:
-        """Add a new transaction."""
-        if self.session.get(TransactionDTO, entity.id) is not None:
-            raise KeyError(f"Transaction already exists: {entity.id}")
-
-        self.session.add(TransactionDTO.from_entity(entity))
-
-    def update(self, entity: Transaction) -> None:
-        """Update an existing transaction."""
-        row = self.session.get(TransactionDTO, entity.id)
-        if row is None:
-            raise KeyError(f"Transaction not found: {entity.id}")
-
-        row.user_id = entity.user_id
-        row.account_id = entity.account_id
-        row.type = entity.type.value
-        row.amount = entity.amount.value
-        row.occurred_at = entity.occurred_at
-        row.category_id = entity.category.id if entity.category else None
-        row.description = entity.description
-        row.created_at = entity.created_at
-        row.updated_at = entity.updated_at
+        """Add a new transaction; a duplicate id fails on the primary key constraint."""
+        self.session.execute(insert(TransactionDTO).values(**_insert_row(entity)))
+
+        deltas = DailyTotalDeltas()
+        deltas.add(entity_rollup_key(entity), entity.amount.value)
+        changed = deltas.apply(self.session)
+        bump_data_versions(self.session, entity.user_id, aggregate=changed)
+
+    def add_many(self, entities: list[Transaction]) -> None:
+        """Add new transactions with multi-row INSERTs and a single rollup upsert."""
+        deltas = DailyTotalDeltas()
+        rows = []
+        for entity in entities:
+            rows.append(_insert_row(entity))
+            deltas.add(entity_rollup_key(entity), entity.amount.value)
+
+        # ID は新規採番なので存在確認は主キー制約に任せる
+        for i in range(0, len(rows), _INSERT_BATCH_SIZE):
+            self.session.execute(insert(TransactionDTO), rows[i : i + _INSERT_BATCH_SIZE])
+        changed = deltas.apply(self.session)
+        bump_data_versions(
+            self.session, *{entity.user_id for entity in entities}, aggregate=changed
+        )
+
+    def update(self, entity: Transaction) -> Transaction | None:
+        """
+        Overwrite the editable columns of `entity` if it belongs to `entity.user_id`.
+
+        Returns the transaction as it was before the update, or None when the
+        user has no transaction with that id.
+        """
+        values = {
+            "type": entity.type.value,
+            "amount": entity.amount.value,
+            "occurred_at": entity.occurred_at,
+            "category_id": entity.category.id if entity.category else None,
+            "description": entity.description,
+            "updated_at": entity.updated_at,
+        }
+        previous = self._update_returning_previous([entity.id], entity.user_id, values)
+        if not previous:
+            return None
+
+        deltas = DailyTotalDeltas()
+        deltas.subtract(entity_rollup_key(previous[0]), previous[0].amount.value)
+        deltas.add(entity_rollup_key(entity), entity.amount.value)
+        changed = deltas.apply(self.session)
+        bump_data_versions(self.session, entity.user_id, aggregate=changed)
+        return previous[0]
+
+    def patch(
+        self, entity_id: UUID, user_id: str, changes: Mapping[str, Any], updated_at: datetime
+    ) -> tuple[Transaction | None, Transaction] | None:
+        """
+        Write only the changed columns (and `updated_at`) of the user's transaction.
+
+        The previous state is read only when a rollup-relevant field changes;
+        otherwise the first element is None.
+        """
+        results = self.patch_many([entity_id], user_id, changes, updated_at)
+        return results[0] if results else None
+
+    def patch_many(
+        self,
+        entity_ids: Sequence[UUID],
+        user_id: str,
+        changes: Mapping[str, Any],
+        updated_at: datetime,
+    ) -> list[tuple[Transaction | None, Transaction]]:
+        """
+        Apply the same `changes` to every listed transaction of the user in one UPDATE.
+
+        Ids the user does not own are skipped; the result has one
+        (previous, updated) pair per changed transaction.
+        """
+        if not entity_ids:
+            return []
+        values = {**_column_values(changes), "updated_at": updated_at}
+        if _ROLLUP_FIELDS.isdisjoint(changes):
+            # 説明だけの変更などは集計に影響しないため、更新前の値を読まずに 1 文で更新する
+            rows = self.session.scalars(
+                update(TransactionDTO)
+                .where(TransactionDTO.id.in_(entity_ids), TransactionDTO.user_id == user_id)
+                .values(**values)
+                .returning(TransactionDTO),
+                execution_options={"synchronize_session": False},
+            ).all()
+            if rows:
+                # 集計の版は進めないので、ダッシュボードのキャッシュと ETag はそのまま使われる
+                bump_data_versions(self.session, user_id)
+            return [(None, row.to_entity()) for row in rows]
+
+        results = []
+        deltas = DailyTotalDeltas()
+        for previous in self._update_returning_previous(entity_ids, user_id, values):
+            current = TransactionDTO(**{**_insert_row(previous), **values}).to_entity()
+            deltas.subtract(entity_rollup_key(previous), previous.amount.value)
+            deltas.add(entity_rollup_key(current), current.amount.value)
+            results.append((previous, current))
+        if results:
+            changed = deltas.apply(self.session)
+            bump_data_versions(self.session, user_id, aggregate=changed)
+        return results
+
+    def _update_returning_previous(
+        self, entity_ids: Sequence[UUID], user_id: str, values: dict[str, Any]
+    ) -> list[Transaction]:
+        """Apply `values` to the user's transactions and return their states before the update."""
+        owned = (TransactionDTO.id.in_(entity_ids), TransactionDTO.user_id == user_id)
+        if self.session.get_bind().dialect.name == "postgresql":
+            # 更新前の行を FOR UPDATE で読むサブクエリと結合し、1 文で更新前の値を返す
+            previous = (
+                select(TransactionDTO)
+                .where(*owned)
+                .order_by(TransactionDTO.id)
+                .with_for_update()
+                .subquery("previous")
+            )
+            rows = self.session.execute(
+                update(TransactionDTO)
+                .where(TransactionDTO.id == previous.c.id)
+                .values(**values)
+                .returning(*previous.c),
+                execution_options={"synchronize_session": False},
+            ).all()
+        else:
+            # SQLite の RETURNING は FROM 句のテーブルを参照できないため、読んでから更新する
+            rows = self.session.execute(select(*TransactionDTO.__table__.c).where(*owned)).all()
+            if rows:
+                self.session.execute(
+                    update(TransactionDTO).where(*owned).values(**values),
+                    execution_options={"synchronize_session": False},
+                )
+        return [TransactionDTO(**row._mapping).to_entity() for row in rows]
 
     def find_by_id(self, entity_id: UUID) -> Transaction | None:
         """Find transaction by ID."""
         row = self.session.get(TransactionDTO, entity_id)
         return row.to_entity() if row else None
 
-    def remove(self, entity_id: UUID) -> None:
-        """Remove transaction by ID."""
-        row = self.session.get(TransactionDTO, entity_id)
-        if row is None:
-            raise KeyError(f"Transaction not found: {entity_id}")
-        self.session.delete(row)
+    def remove(self, entity_id: UUID, user_id: str) -> Transaction | None:
+        """Delete the user's transaction in one statement; None when there is none."""
+        removed = self.remove_many([entity_id], user_id)
+        return removed[0] if removed else None
+
+    def remove_many(self, entity_ids: Sequence[UUID], user_id: str) -> list[Transaction]:
+        """Delete the listed transactions of the user in one statement and return them."""
+        if not entity_ids:
+            return []
+        rows = self.session.scalars(
+            delete(TransactionDTO)
+            .where(TransactionDTO.id.in_(entity_ids), TransactionDTO.user_id == user_id)
+            .returning(TransactionDTO),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if not rows:
+            return []
+
+        deltas = DailyTotalDeltas()
+        for row in rows:
+            deltas.subtract(dto_rollup_key(row), row.amount)
+        changed = deltas.apply(self.session)
+        bump_data_versions(self.session, user_id, aggregate=changed)
+        return [row.to_entity() for row in rows]
+
+    def find_fingerprints(
+        self, user_id: str, start: date, end: date
+    ) -> set[TransactionFingerprint]:
+        """Return the fingerprints of a user's transactions within [start, end]."""
+        rows = self.session.execute(
+            select(
+                TransactionDTO.type,
+                TransactionDTO.amount,
+                TransactionDTO.occurred_at,
+                TransactionDTO.category_id,
+                TransactionDTO.description,
+            )
+            .where(TransactionDTO.user_id == user_id)
+            .where(TransactionDTO.occurred_at >= start)
+            .where(TransactionDTO.occurred_at <= end)
+        )
+        return {
+            (type_, amount, occurred_at, category_id, description or "")
+            for (type_, amount, occurred_at, category_id, description) in rows
+        }
 
     def find_by_account_and_period(
         self, account_id: UUID, start: date, end: date
@@ -85,5 +309,50 @@ class TransactionRepositoryImpl(TransactionRepository):
         return [row.to_entity() for row in rows]
 
 
-def new_transaction_repository(session: Session) -> TransactionRepository:
-    return TransactionRepositoryImpl(session)
+def _insert_row(entity: Transaction) -> dict:
+    return {
+        "id": entity.id,
+        "user_id": entity.user_id,
+        "account_id": entity.account_id,
+        "type": entity.type.value,
+        "amount": entity.amount.value,
+        "occurred_at": entity.occurred_at,
+        "category_id": entity.category.id if entity.category else None,
+        "description": entity.description,
+        "created_at": entity.created_at,
+        "updated_at": entity.updated_at,
+    }
+
+
+def _column_values(changes: Mapping[str, Any]) -> dict[str, Any]:
+    """Translate TransactionRepository.patch changes into column values."""
+    unknown = set(changes) - _PATCHABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Fields cannot be patched: {', '.join(sorted(unknown))}")
+    return {
+        name: value.value if isinstance(value, (TransactionType, Amount)) else value
+        for name, value in changes.items()
+    }
+
+
+def _apply_filter(stmt: Select, f: TransactionFilter) -> Select:
+    """Translate a TransactionFilter into WHERE clauses."""
+    if f.from_ is not None:
+        stmt = stmt.where(TransactionDTO.occurred_at >= f.from_)
+    if f.to is not None:
+        stmt = stmt.where(TransactionDTO.occurred_at <= f.to)
+    if f.type is not None:
+        stmt = stmt.where(TransactionDTO.type == f.type.value)
+    if f.category_id is not None:
+        stmt = stmt.where(TransactionDTO.category_id == f.category_id)
+    if f.min_amount is not None:
+        stmt = stmt.where(TransactionDTO.amount >= f.min_amount)
+    if f.max_amount is not None:
+        stmt = stmt.where(TransactionDTO.amount <= f.max_amount)
+    return stmt
+
+
+def new_transaction_repository(
+    session: Session, catalog: CategoryCatalog = category_catalog
+) -> TransactionRepository:
+    return TransactionRepositoryImpl(session, catalog)
@@ -1,3 +1,11 @@
+from .compression import CompressionMiddleware
 from .logging import RequestLoggingMiddleware
+from .metrics import MetricsMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
 
-__all__ = ["RequestLoggingMiddleware"]
+__all__ = [
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ReadYourWritesMiddleware",
+    "RequestLoggingMiddleware",
+]
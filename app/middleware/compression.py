@@ -0,0 +1,199 @@
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+import brotli
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# これ以上の本文はイベントループを止めないようスレッドプールで圧縮する
+_THREADPOOL_MIN_SIZE = 256 * 1024
+_NO_BODY_STATUSES = frozenset({204, 304})
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def encode(self, data: bytes, *, final: bool) -> bytes:
+        # ストリーミング中はクライアントがそこまで展開できるよう同期フラッシュする
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def encode(self, data: bytes, *, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def _accepted_encodings(headers: Iterable[tuple[bytes, bytes]]) -> set[str]:
+    for name, value in headers:
+        if name == b"accept-encoding":
+            accepted = set()
+            for item in value.decode("latin-1").lower().split(","):
+                coding, _, params = item.partition(";")
+                coding, params = coding.strip(), params.strip()
+                if not coding:
+                    continue
+                if params.startswith("q="):
+                    try:
+                        if float(params[2:]) <= 0:
+                            continue
+                    except ValueError:
+                        continue
+                accepted.add(coding)
+            return accepted
+    return set()
+
+
+class CompressionMiddleware:
+    """
+    Compress text responses with Brotli (preferred) or gzip.
+
+    Only content types starting with one of `content_types` are compressed,
+    and a complete (single message) body shorter than `minimum_size` is sent
+    as is. Streaming bodies are compressed chunk by chunk and flushed after
+    each chunk so clients still receive rows as they are produced.
+
+    Add it after (outside) RequestLoggingMiddleware so body previews and
+    response sizes in the access log are taken from the uncompressed body.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        content_types: Iterable[str] = ("application/json",),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(ct.lower() for ct in content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        accepted = _accepted_encodings(scope.get("headers") or ())
+        if "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            return await self.app(scope, receive, send)
+
+        responder = _Responder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compressible(self, headers: list[tuple[bytes, bytes]]) -> bool:
+        content_type = ""
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == b"content-encoding":
+                return False
+            if lowered == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        return content_type.startswith(self.content_types)
+
+    def new_encoder(self, encoding: str) -> _GzipEncoder | _BrotliEncoder:
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _Responder:
+    """
+    Per-request send wrapper. The start message is held back until the first
+    body message shows whether the response is worth compressing.
+    """
+
+    __slots__ = ("_encoder", "_encoding", "_middleware", "_send", "_start")
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self._middleware = middleware
+        self._encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._encoder: _GzipEncoder | _BrotliEncoder | None = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = list(message.get("headers") or ())
+            if message["status"] in _NO_BODY_STATUSES or not self._middleware.compressible(headers):
+                await self._send(message)
+            else:
+                self._start = {**message, "headers": headers}
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        start = self._start
+        if start is not None:
+            self._start = None
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+            if not more_body and len(body) < self._middleware.minimum_size:
+                await self._send(_vary(start))
+                await self._send(message)
+                return
+            self._encoder = self._middleware.new_encoder(self._encoding)
+            encoded = await self._encode(body, final=not more_body)
+            await self._send(self._compressed_start(start, None if more_body else len(encoded)))
+            await self._send(
+                {"type": "http.response.body", "body": encoded, "more_body": more_body}
+            )
+            return
+
+        if self._encoder is None:
+            await self._send(message)
+            return
+        more_body = message.get("more_body", False)
+        encoded = await self._encode(message.get("body", b""), final=not more_body)
+        await self._send({"type": "http.response.body", "body": encoded, "more_body": more_body})
+
+    async def _encode(self, body: bytes, *, final: bool) -> bytes:
+        encoder = self._encoder
+        if len(body) >= _THREADPOOL_MIN_SIZE:
+            return await run_in_threadpool(encoder.encode, body, final=final)
+        return encoder.encode(body, final=final)
+
+    def _compressed_start(self, start: Message, length: int | None) -> Message:
+        headers = []
+        for name, value in _vary(start)["headers"]:
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # 圧縮後のバイト列は元の表現と一致しないため弱い ETag にする
+                headers.append((name, b"W/" + value))
+            else:
+                headers.append((name, value))
+        headers.append((b"content-encoding", self._encoding.encode()))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return {**start, "headers": headers}
+
+
+def _vary(start: Message) -> Message:
+    headers = []
+    vary = []
+    for name, value in start["headers"]:
+        if name.lower() == b"vary":
+            vary.append(value)
+        else:
+            headers.append((name, value))
+    if not any(b"accept-encoding" in v.lower() for v in vary):
+        vary.append(b"Accept-Encoding")
+    headers.append((b"vary", b", ".join(vary)))
+    return {**start, "headers": headers}
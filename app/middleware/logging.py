@@ -3,6 +3,7 @@ from __future__ import annotations
 import contextvars
 import json
 import logging
+import random
 import time
 import uuid
 from typing import Any
@@ -10,6 +11,8 @@ from urllib.parse import parse_qsl, urlencode
 
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.query_stats import QueryStats, query_stats_ctx
+
 logger = logging.getLogger("app.middleware")
 
 # ===== Context =====
@@ -56,13 +59,8 @@ def _redact_query(query: str) -> str:
     return urlencode(pairs)
 
 
-def _add_header(
-    headers: list[tuple[bytes, bytes]], key: bytes, value: bytes
-) -> list[tuple[bytes, bytes]]:
-    lowered = key.lower()
-    out = [(k, v) for (k, v) in headers if k.lower() != lowered]
-    out.append((key, value))
-    return out
+def _decode_headers(raw_headers) -> dict[str, str]:
+    return {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in raw_headers}
 
 
 def _safe_preview(b: bytes, limit: int, content_type: str | None) -> str:
@@ -101,201 +99,287 @@ class RequestIdLogFilter(logging.Filter):
 # logging.getLogger().addFilter(RequestIdLogFilter())
 
 
+class _Exchange:
+    """Mutable per-request state shared by the receive/send wrappers."""
+
+    __slots__ = (
+        "request_id",
+        "start",
+        "status_code",
+        "resp_ct",
+        "resp_headers",
+        "resp_len_hdr",
+        "req_len",
+        "req_chunks",
+        "req_captured",
+        "resp_len",
+        "resp_chunks",
+        "resp_captured",
+        "capture_resp",
+        "query_stats",
+    )
+
+    def __init__(self, request_id: str, start: float, query_stats: QueryStats | None) -> None:
+        self.request_id = request_id
+        self.start = start
+        self.query_stats = query_stats
+        self.status_code = 0
+        self.resp_ct: str | None = None
+        self.resp_headers: Any = ()
+        self.resp_len_hdr: int | None = None
+        self.req_len = 0
+        # 本文はコピーせずチャンクの参照だけを保持し、ログ出力時にのみ結合する
+        self.req_chunks: list[bytes] = []
+        self.req_captured = 0
+        self.resp_len = 0
+        self.resp_chunks: list[bytes] = []
+        self.resp_captured = 0
+        self.capture_resp = False
+
+
+def _preview_bytes(chunks: list[bytes], limit: int) -> bytes:
+    return b"".join(chunks)[:limit]
+
+
 class RequestLoggingMiddleware:
-    """ASGI middleware that logs request/response with context and captures exceptions."""
+    """
+    ASGI middleware that logs request/response with context and captures exceptions.
 
-    def __init__(self, app: ASGIApp, *, max_body_preview: int = 4096):
+    The hot path only scans the raw headers it needs and keeps references to
+    body chunks; header dicts, body previews and the log payload are built only
+    when a record is actually emitted (errors, 4xx/5xx, slow requests, or
+    sampled successes).
+
+    With `query_stats` enabled, SQL statements executed while serving the
+    request are counted; the totals go into the access log and a
+    `Server-Timing: db` response header, and statements repeated more than
+    `n_plus_one_threshold` times are reported as a possible N+1.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_body_preview: int = 4096,
+        success_sample_rate: float = 1.0,
+        query_stats: bool = True,
+        n_plus_one_threshold: int = 0,
+    ):
         self.app = app
         self.max_body_preview = max_body_preview
+        self.success_sample_rate = success_sample_rate
+        self.query_stats = query_stats
+        self.n_plus_one_threshold = n_plus_one_threshold
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
         if scope.get("type") != "http":
             return await self.app(scope, receive, send)
 
         start = time.perf_counter()
-        request_id, token = self._set_request_id(scope)
-        ctx = self._extract_request_context(scope, request_id)
-
-        req_preview, req_len, receive_wrapper = self._make_receive_wrapper(receive)
-        resp_state, send_wrapper = self._make_send_wrapper(send, request_id)
+        request_id, req_ct = _scan_request_headers(scope.get("headers") or ())
+        request_id = request_id or str(uuid.uuid4())
+        token = request_id_ctx.set(request_id)
+        stats = QueryStats() if self.query_stats else None
+        stats_token = query_stats_ctx.set(stats)
+        exchange = _Exchange(request_id, start, stats)
 
         try:
-            await self.app(scope, receive_wrapper, send_wrapper)
+            await self.app(
+                scope, self._wrap_receive(receive, exchange), self._wrap_send(send, exchange)
+            )
         except Exception:
-            self._log_error(ctx, req_preview, req_len, start)
+            self._log_error(scope, req_ct, exchange)
             raise
         else:
-            self._log_success(ctx, req_preview, req_len, resp_state, start)
+            self._log_success(scope, req_ct, exchange)
         finally:
+            if stats is not None and self.n_plus_one_threshold > 0:
+                self._check_n_plus_one(scope, stats)
+            query_stats_ctx.reset(stats_token)
             request_id_ctx.reset(token)
 
     # ----------------- helpers -----------------
 
-    def _set_request_id(self, scope: Scope) -> tuple[str, contextvars.Token]:
-        raw_headers = scope.get("headers", [])
-        headers = {k.decode().lower(): v.decode() for k, v in raw_headers}
-        request_id = headers.get("x-request-id") or str(uuid.uuid4())
-        token = request_id_ctx.set(request_id)
-        return request_id, token
-
-    def _extract_request_context(self, scope: Scope, request_id: str) -> dict[str, Any]:
-        raw_headers = scope.get("headers", [])
-        headers = {k.decode().lower(): v.decode() for k, v in raw_headers}
-        query_raw = (scope.get("query_string") or b"").decode()
-        return {
-            "request_id": request_id,
-            "method": scope.get("method", "-"),
-            "path": scope.get("path", "-"),
-            "query": _redact_query(query_raw),
-            "ip": (scope.get("client") or ("-",))[0],
-            "headers": _redact_headers(headers),
-            "req_ct": headers.get("content-type"),
-            "http_version": scope.get("http_version", ""),
-            "scheme": scope.get("scheme", ""),
-            "host": headers.get("host", ""),
-            "path_params": scope.get("path_params") or {},
-        }
-
-    def _make_receive_wrapper(self, receive: Receive):
-        req_preview = bytearray()
-        total_len = 0
+    def _wrap_receive(self, receive: Receive, exchange: _Exchange) -> Receive:
+        limit = self.max_body_preview
 
         async def wrapper() -> Message:
-            nonlocal total_len
             message = await receive()
             if message["type"] == "http.request":
-                body: bytes = message.get("body", b"") or b""
-                total_len += len(body)
-                if body and len(req_preview) < self.max_body_preview:
-                    remain = self.max_body_preview - len(req_preview)
-                    if remain > 0:
-                        req_preview.extend(body[:remain])
+                body: bytes = message.get("body") or b""
+                if body:
+                    exchange.req_len += len(body)
+                    if exchange.req_captured < limit:
+                        exchange.req_chunks.append(body)
+                        exchange.req_captured += len(body)
             return message
 
-        return req_preview, lambda: total_len, wrapper
+        return wrapper
 
-    def _make_send_wrapper(self, send: Send, request_id: str):
-        state: dict[str, Any] = {
-            "status_code": 0,
-            "resp_preview": bytearray(),
-            "resp_ct": None,
-            "headers": [],
-            "resp_len": 0,
-        }
+    def _wrap_send(self, send: Send, exchange: _Exchange) -> Send:
+        limit = self.max_body_preview
+        request_id = exchange.request_id.encode()
 
         async def wrapper(message: Message) -> None:
-            if message["type"] == "http.response.start":
-                state["status_code"] = message["status"]
-                state["headers"] = message.get("headers", [])
-                # Content-Type
-                for k, v in state["headers"]:
-                    if k.lower() == b"content-type":
-                        try:
-                            state["resp_ct"] = v.decode()
-                        except Exception:
-                            state["resp_ct"] = None
-                # X-Request-ID を必ず返す
-                message["headers"] = _add_header(
-                    state["headers"], b"x-request-id", request_id.encode()
-                )
-
-            elif message["type"] == "http.response.body":
-                body: bytes = message.get("body", b"") or b""
-                state["resp_len"] += len(body)
-                if body and len(state["resp_preview"]) < self.max_body_preview:
-                    remain = self.max_body_preview - len(state["resp_preview"])
-                    if remain > 0:
-                        state["resp_preview"].extend(body[:remain])
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                status = exchange.status_code = message["status"]
+                headers = message.get("headers") or []
+                exchange.resp_headers = headers
+                has_request_id = False
+                for k, v in headers:
+                    name = k.lower()
+                    if name == b"content-type":
+                        exchange.resp_ct = v.decode("latin-1")
+                    elif name == b"content-length" and v.isdigit():
+                        exchange.resp_len_hdr = int(v)
+                    elif name == b"x-request-id":
+                        has_request_id = True
+                # X-Request-ID を必ず返す (レスポンスが持つリスト自体は書き換えない)
+                if has_request_id:
+                    headers = [(k, v) for (k, v) in headers if k.lower() != b"x-request-id"]
+                extra_headers = [(b"x-request-id", request_id)]
+                # ヘッダー送信までに実行された SQL の件数と時間
+                if exchange.query_stats is not None:
+                    extra_headers.append((b"server-timing", exchange.query_stats.server_timing()))
+                message["headers"] = [*headers, *extra_headers]
+                # 本文を記録するのは詳細ログの対象になり得るレスポンスだけ
+                exchange.capture_resp = status >= 400
+
+            elif message_type == "http.response.body":
+                body: bytes = message.get("body") or b""
+                if body:
+                    exchange.resp_len += len(body)
+                    if exchange.resp_captured < limit and (
+                        exchange.capture_resp
+                        or time.perf_counter() - exchange.start >= SLOW_THRESHOLD_S
+                    ):
+                        exchange.resp_chunks.append(body)
+                        exchange.resp_captured += len(body)
 
             await send(message)
 
-        return state, wrapper
+        return wrapper
 
-    def _log_error(
-        self, ctx: dict[str, Any], req_preview: bytearray, req_len_fn, start: float
-    ) -> None:
-        elapsed = time.perf_counter() - start
-        logger.exception(
-            "REQUEST ERROR",
+    def _base_payload(self, scope: Scope, req_ct: str | None, exchange: _Exchange) -> dict:
+        payload = {
+            "request_id": exchange.request_id,
+            "method": scope.get("method", "-"),
+            "path": scope.get("path", "-"),
+            "query": _redact_query((scope.get("query_string") or b"").decode("latin-1")),
+            "ip": (scope.get("client") or ("-",))[0],
+            "http_version": scope.get("http_version", ""),
+            "scheme": scope.get("scheme", ""),
+            "host": _header(scope, b"host") or "",
+            "path_params": scope.get("path_params") or {},
+            "req_ct": req_ct,
+            "req_len": exchange.req_len,
+        }
+        if exchange.query_stats is not None:
+            payload["db_queries"] = exchange.query_stats.count
+            payload["db_time_ms"] = round(exchange.query_stats.elapsed * 1000, 1)
+        return payload
+
+    def _check_n_plus_one(self, scope: Scope, stats: QueryStats) -> None:
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if not repeated:
+            return
+        statement, count = repeated[0]
+        route = getattr(scope.get("route"), "path", None) or scope.get("path", "-")
+        logger.warning(
+            f"Possible N+1: {scope.get('method', '-')} {route} ran the same statement "
+            f"{count} times ({stats.count} queries total)",
             extra={
-                "request_id": ctx["request_id"],
-                "method": ctx["method"],
-                "path": ctx["path"],
-                "query": ctx["query"],
-                "ip": ctx["ip"],
-                "elapsed_s": round(elapsed, 3),
-                "http_version": ctx["http_version"],
-                "scheme": ctx["scheme"],
-                "host": ctx["host"],
-                "path_params": ctx["path_params"],
-                "headers": ctx["headers"],
-                "req_ct": ctx["req_ct"],
-                "req_len": req_len_fn(),
-                "req_body_preview": _safe_preview(
-                    bytes(req_preview), self.max_body_preview, ctx["req_ct"]
-                ),
+                "route": route,
+                "db_queries": stats.count,
+                "repeated_statements": [{"statement": s, "count": c} for s, c in repeated[:5]],
             },
         )
 
-    def _log_success(
-        self,
-        ctx: dict[str, Any],
-        req_preview: bytearray,
-        req_len_fn,
-        state: dict[str, Any],
-        start: float,
-    ) -> None:
-        elapsed = time.perf_counter() - start
-        status = int(state["status_code"])
-        emoji = "✅" if status < 300 else "🔄" if status < 400 else "⚠️" if status < 500 else "❌"
-        is_slow = elapsed >= SLOW_THRESHOLD_S
-        log_fn = (
-            logger.warning
-            if (status >= 400 or is_slow) and status < 500
-            else (logger.error if status >= 500 else logger.info)
+    def _log_error(self, scope: Scope, req_ct: str | None, exchange: _Exchange) -> None:
+        elapsed = time.perf_counter() - exchange.start
+        payload = self._base_payload(scope, req_ct, exchange)
+        payload["elapsed_s"] = round(elapsed, 3)
+        payload["headers"] = _redact_headers(_decode_headers(scope.get("headers") or ()))
+        payload["req_body_preview"] = _safe_preview(
+            _preview_bytes(exchange.req_chunks, self.max_body_preview),
+            self.max_body_preview,
+            req_ct,
         )
+        logger.exception("REQUEST ERROR", extra=payload)
+
+    def _log_success(self, scope: Scope, req_ct: str | None, exchange: _Exchange) -> None:
+        elapsed = time.perf_counter() - exchange.start
+        status = int(exchange.status_code)
+        is_slow = elapsed >= SLOW_THRESHOLD_S
+        detailed = status >= 400 or is_slow
+        if status >= 500:
+            level = logging.ERROR
+        elif detailed:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+            if self.success_sample_rate < 1.0 and random.random() >= self.success_sample_rate:
+                return
+        if not logger.isEnabledFor(level):
+            return
+
+        path = scope.get("path", "-")
+        is_health_ok = path in HEALTH_PATHS and status < 400
+        if is_health_ok:
+            extra: dict[str, Any] = {"status": status, "elapsed_s": round(elapsed, 3)}
+            query = _redact_query((scope.get("query_string") or b"").decode("latin-1"))
+        else:
+            extra = self._base_payload(scope, req_ct, exchange)
+            query = extra["query"]
+            extra.update(
+                status=status,
+                elapsed_s=round(elapsed, 3),
+                slow=is_slow,
+                resp_ct=exchange.resp_ct,
+                # Content-Length をヘッダから拾う（ない場合は蓄積値）
+                resp_len=exchange.resp_len_hdr
+                if exchange.resp_len_hdr is not None
+                else exchange.resp_len,
+            )
+            if self.success_sample_rate < 1.0 and not detailed:
+                extra["sample_rate"] = self.success_sample_rate
+            if detailed:
+                limit = self.max_body_preview
+                extra["headers"] = _redact_headers(_decode_headers(scope.get("headers") or ()))
+                extra["resp_headers"] = _redact_headers(_decode_headers(exchange.resp_headers))
+                extra["req_body_preview"] = _safe_preview(
+                    _preview_bytes(exchange.req_chunks, limit), limit, req_ct
+                )
+                extra["resp_body_preview"] = _safe_preview(
+                    _preview_bytes(exchange.resp_chunks, limit), limit, exchange.resp_ct
+                )
 
-        # Content-Length をヘッダから拾う（ない場合は蓄積値）
-        hdrs = {k.decode().lower(): v.decode() for k, v in state.get("headers", [])}
-        resp_len_hdr = hdrs.get("content-length")
-        resp_len = (
-            int(resp_len_hdr) if resp_len_hdr and resp_len_hdr.isdigit() else state["resp_len"]
+        emoji = "✅" if status < 300 else "🔄" if status < 400 else "⚠️" if status < 500 else "❌"
+        method = scope.get("method", "-")
+        ip = (scope.get("client") or ("-",))[0]
+        logger.log(
+            level,
+            f"{emoji} {method} {path}{('?' + query) if query else ''} "
+            f"→ {status} ({elapsed:.3f}s){' SLOW' if is_slow else ''} ip={ip}",
+            extra=extra,
         )
 
-        payload: dict[str, Any] = {
-            "request_id": ctx["request_id"],
-            "method": ctx["method"],
-            "path": ctx["path"],
-            "query": ctx["query"],
-            "ip": ctx["ip"],
-            "status": status,
-            "elapsed_s": round(elapsed, 3),
-            "slow": is_slow,
-            "http_version": ctx["http_version"],
-            "scheme": ctx["scheme"],
-            "host": ctx["host"],
-            "path_params": ctx["path_params"],
-            "req_ct": ctx["req_ct"],
-            "req_len": req_len_fn(),
-            "resp_ct": state["resp_ct"],
-            "resp_len": resp_len,
-        }
 
-        is_health_ok = ctx["path"] in HEALTH_PATHS and status < 400
-        if (status >= 400 or is_slow) and not is_health_ok:
-            payload["headers"] = ctx["headers"]
-            payload["resp_headers"] = _redact_headers(hdrs)
-            payload["req_body_preview"] = _safe_preview(
-                bytes(req_preview), self.max_body_preview, ctx["req_ct"]
-            )
-            payload["resp_body_preview"] = _safe_preview(
-                bytes(state["resp_preview"]), self.max_body_preview, state["resp_ct"]
-            )
+def _scan_request_headers(raw_headers) -> tuple[str | None, str | None]:
+    """Pick X-Request-ID and Content-Type out of the raw headers in a single pass."""
+    request_id = content_type = None
+    for k, v in raw_headers:
+        name = k.lower()
+        if name == b"x-request-id":
+            request_id = v.decode("latin-1")
+        elif name == b"content-type":
+            content_type = v.decode("latin-1")
+    return request_id, content_type
 
-        log_fn(
-            f"{emoji} {ctx['method']} {ctx['path']}{('?' + ctx['query']) if ctx['query'] else ''} "
-            f"→ {status} ({elapsed:.3f}s){' SLOW' if is_slow else ''} ip={ctx['ip']}",
-            extra=payload
-            if not is_health_ok
-            else {"status": status, "elapsed_s": payload["elapsed_s"]},
-        )
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for k, v in scope.get("headers") or ():
+        if k.lower() == name:
+            return v.decode("latin-1")
+    return None
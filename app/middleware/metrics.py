@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS
+
+UNMATCHED_ROUTE = "<unmatched>"
+# メソッド名はクライアントが任意に送れるため、既知のもの以外は OTHER にまとめる
+KNOWN_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+OTHER_METHOD = "OTHER"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight requests.
+
+    Requests are labelled with the matched route template (e.g.
+    `/transactions/{transaction_id}`), never the raw path, and with the method
+    mapped onto a fixed set, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # labels() はロックと検証を伴うため、ラベル付きの子メトリクスを使い回す
+        self._in_progress: dict[str, Any] = {}
+        self._latency: dict[tuple[str, str], Any] = {}
+        self._requests: dict[tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
+        if scope.get("type") != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope.get("method", "-")
+        if method not in KNOWN_METHODS:
+            method = OTHER_METHOD
+        status_code = 500
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            # ルーティング後の scope に FastAPI がマッチしたルートを入れている
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self._observe(method, template, status_code, elapsed)
+
+    def _observe(self, method: str, template: str, status_code: int, elapsed: float) -> None:
+        latency = self._latency.get((method, template))
+        if latency is None:
+            latency = self._latency[method, template] = HTTP_LATENCY.labels(method, template)
+        latency.observe(elapsed)
+
+        requests = self._requests.get((method, template, status_code))
+        if requests is None:
+            requests = self._requests[method, template, status_code] = HTTP_REQUESTS.labels(
+                method, template, str(status_code)
+            )
+        requests.inc()
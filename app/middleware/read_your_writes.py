@@ -0,0 +1,44 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.di.session import LAST_WRITE_STATE
+
+
+class ReadYourWritesMiddleware:
+    """
+    Send the time of the user's last write back to the client in a cookie.
+
+    `note_write` records the time in request.state; this adds the cookie to
+    the response start, which also covers routes that return a Response
+    object directly. On the next read `get_read_db` sends the user to the
+    primary while the cookie is younger than REPLICA_READ_YOUR_WRITES_S, on
+    whichever worker serves it.
+    """
+
+    def __init__(self, app: ASGIApp, *, cookie_name: str, max_age_s: float) -> None:
+        self.app = app
+        self.cookie_name = cookie_name
+        self.max_age = max(1, math.ceil(max_age_s))
+
+    def cookie(self, written_at: float) -> str:
+        # フロントエンドは別オリジンのため SameSite=None (Secure 必須) にする
+        return (
+            f"{self.cookie_name}={written_at:.3f}; Max-Age={self.max_age}; Path=/; "
+            "HttpOnly; Secure; SameSite=None"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                written_at = scope.get("state", {}).get(LAST_WRITE_STATE)
+                if written_at is not None:
+                    MutableHeaders(scope=message).append("set-cookie", self.cookie(written_at))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,63 @@
+"""
+Conditional GET support (ETag / Last-Modified) driven by the per-user data version.
+
+Checking the version is a single primary-key lookup, so a poll that finds
+nothing changed is answered with 304 before the list, category or dashboard
+query runs. Responses that also depend on data outside the version (the
+category list) add a digest of the rendered body with `body_digest`.
+Dashboard responses pass `DataVersion.aggregate`, so edits that leave the
+daily rollup alone do not change their validators.
+"""
+
+import hashlib
+from datetime import UTC
+from email.utils import format_datetime
+
+from fastapi import Request, Response, status
+
+from app.domain.data_version.data_version_entity import DataVersion
+
+# 保存はブラウザ内のみ、利用のたびに再検証させる
+_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(version: DataVersion, *parts: object) -> str:
+    """Weak ETag over the user, their data version and anything else the body depends on."""
+    raw = "|".join([version.user_id, str(version.version), *map(str, parts)])
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def body_digest(body: bytes) -> str:
+    """Digest of a rendered response body, for ETag parts the data version does not cover."""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True when If-None-Match lists `etag` (weak comparison) or is `*`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def validator_headers(version: DataVersion, etag: str) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if version.updated_at is not None:
+        # SQLite はタイムゾーンを保持しないため、naive な値は UTC として扱う
+        updated_at = version.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=UTC)
+        headers["Last-Modified"] = format_datetime(updated_at.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def not_modified(version: DataVersion, etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(version, etag)
+    )
+
+
+def with_validators(response: Response, version: DataVersion, etag: str) -> Response:
+    response.headers.update(validator_headers(version, etag))
+    return response
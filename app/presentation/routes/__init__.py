@@ -1,6 +1,13 @@
 from .category import router as category_router
 from .dashboard import router as dashboard_router
 from .health import router as health_router
+from .metrics import router as metrics_router
 from .transaction import router as transaction_router
 
-__all__ = ["health_router", "transaction_router", "category_router", "dashboard_router"]
+__all__ = [
+    "health_router",
+    "metrics_router",
+    "transaction_router",
+    "category_router",
+    "dashboard_router",
+]
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from app.core.auth import get_current_user
-from app.infrastructure.di.injection import get_get_category_list_usecase
+from app.infrastructure.di.async_usecase import AsyncUseCase
+from app.infrastructure.di.injection import (
+    get_data_version_usecase,
+    get_get_category_list_usecase,
+)
+from app.presentation.conditional import (
+    body_digest,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    with_validators,
+)
 from app.presentation.schemas.responses.category import GetCategoryListResponseSchema
+from app.presentation.schemas.responses.fast_json import FastJSONResponse
 from app.usecase.category.get_categories import (
     GetCategoryListUseCase,
 )
+from app.usecase.data_version.get_data_version_usecase import GetDataVersionUseCase
 
 router = APIRouter(tags=["category"])
 
@@ -14,13 +27,23 @@ router = APIRouter(tags=["category"])
     "/categories", response_model=GetCategoryListResponseSchema, status_code=status.HTTP_200_OK
 )
 async def get_categories(
+    request: Request,
     auth_context=Depends(get_current_user),
-    usecase: GetCategoryListUseCase = Depends(get_get_category_list_usecase),
+    usecase: AsyncUseCase[GetCategoryListUseCase] = Depends(get_get_category_list_usecase),
+    versions: AsyncUseCase[GetDataVersionUseCase] = Depends(get_data_version_usecase),
 ):
     """Retrieve categories for the current user"""
     try:
-        categories = usecase.execute(auth_context.sub)
-        return GetCategoryListResponseSchema.from_entities(categories)
+        version = await versions.execute(auth_context.sub)
+        categories = await usecase.execute(auth_context.sub)
+        response = FastJSONResponse(GetCategoryListResponseSchema.dump_entities(categories))
+
+        # カテゴリの変更 (マイグレーションやカタログの再読み込み) ではデータの版が変わらないため、
+        # 返す一覧そのもののダイジェストも ETag に含める
+        etag = make_etag(version, "categories", body_digest(response.body))
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+        return with_validators(response, version, etag)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
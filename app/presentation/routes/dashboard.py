@@ -1,11 +1,25 @@
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from app.core.auth import get_current_user
-from app.infrastructure.di.injection import get_dashboard_summary_usecase
-from app.presentation.schemas.responses.dasuboard import GetDashboardSummaryResponseSchema
+from app.domain.dashboard.dashboard_entity import TimeseriesGranularity
+from app.infrastructure.di.async_usecase import AsyncUseCase
+from app.infrastructure.di.injection import (
+    get_dashboard_summary_usecase,
+    get_dashboard_timeseries_usecase,
+    get_data_version_usecase,
+)
+from app.presentation.conditional import is_not_modified, make_etag, not_modified, with_validators
+from app.presentation.schemas.responses.dasuboard import (
+    GetDashboardSummaryResponseSchema,
+    GetDashboardTimeseriesResponseSchema,
+)
+from app.presentation.schemas.responses.fast_json import FastJSONResponse
 from app.usecase.dashboard.get_dashboard_summary_usecase import GetDashboardSummaryUseCase
+from app.usecase.dashboard.get_dashboard_timeseries_usecase import GetDashboardTimeseriesUseCase
+from app.usecase.data_version.get_data_version_usecase import GetDataVersionUseCase
 
 router = APIRouter(tags=["dashboard"])
 
@@ -15,9 +29,12 @@ router = APIRouter(tags=["dashboard"])
     response_model=GetDashboardSummaryResponseSchema,
     status_code=status.HTTP_200_OK,
 )
-def get_dashboard_summary(
+async def get_dashboard_summary(
+    request: Request,
     auth_context=Depends(get_current_user),
-    usecase: GetDashboardSummaryUseCase = Depends(get_dashboard_summary_usecase),
+    usecase: AsyncUseCase[GetDashboardSummaryUseCase] = Depends(get_dashboard_summary_usecase),
+    versions: AsyncUseCase[GetDataVersionUseCase] = Depends(get_data_version_usecase),
+    *,
     from_: date | None = Query(None, alias="from"),
     to: date | None = Query(None, alias="to"),
 ):
@@ -31,8 +48,73 @@ def get_dashboard_summary(
         if from_ is None:
             from_ = to.replace(day=1)
 
-        dashboard_summary = usecase.execute(auth_context.sub, from_, to)
-        return GetDashboardSummaryResponseSchema.from_entity(dashboard_summary)
+        # 期間の既定値は日付で変わるため、解決後の期間も ETag に含める
+        # 集計に影響しない書き込み (説明の変更など) では版が変わらない
+        version = (await versions.execute(auth_context.sub)).aggregate
+        etag = make_etag(version, "dashboard", from_, to)
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+
+        dashboard_summary = await usecase.execute(auth_context.sub, from_, to, version.version)
+        return with_validators(
+            FastJSONResponse(GetDashboardSummaryResponseSchema.dump_entity(dashboard_summary)),
+            version,
+            etag,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+
+
+@router.get(
+    "/dashboard/timeseries",
+    response_model=GetDashboardTimeseriesResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"}},
+)
+async def get_dashboard_timeseries(
+    request: Request,
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[GetDashboardTimeseriesUseCase] = Depends(
+        get_dashboard_timeseries_usecase
+    ),
+    versions: AsyncUseCase[GetDataVersionUseCase] = Depends(get_data_version_usecase),
+    *,
+    from_: date | None = Query(None, alias="from"),
+    to: date | None = Query(None, alias="to"),
+    granularity: Literal["day", "week", "month"] = Query("day", description="Bucket size"),
+):
+    """
+    Retrieve income, expense, net and cumulative balance per day, week or month.
+
+    The series is computed from the daily rollup and returned as parallel
+    arrays; empty buckets are filled with zeros. Defaults to the current
+    month, like the summary.
+    """
+    today = date.today()
+    if to is None:
+        to = today
+    if from_ is None:
+        from_ = to.replace(day=1)
+
+    try:
+        version = (await versions.execute(auth_context.sub)).aggregate
+        etag = make_etag(version, "timeseries", granularity, from_, to)
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+
+        series = await usecase.execute(
+            auth_context.sub, from_, to, TimeseriesGranularity(granularity)
+        )
+        return with_validators(
+            FastJSONResponse(GetDashboardTimeseriesResponseSchema.dump_entity(series)),
+            version,
+            etag,
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -6,6 +6,7 @@ from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from app.core.database import db
+from app.infrastructure.dasoboard.dashboard_cache import dashboard_summary_cache
 
 router = APIRouter(tags=["health"])
 
@@ -28,6 +29,14 @@ async def db_health_check():
         raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}") from e
 
 
+@router.get("/health/cache")
+async def cache_stats():
+    """ダッシュボード集計キャッシュのヒット／ミス数を返す"""
+    if dashboard_summary_cache is None:
+        return {"dashboard_summary": {"enabled": False}}
+    return {"dashboard_summary": {"enabled": True, **dashboard_summary_cache.stats()}}
+
+
 @router.get("/health/db/info")
 async def db_info():
     """データベース接続情報を返す（デバッグ用）"""
@@ -1,25 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
 from app.core.auth import get_current_user
+from app.core.config import settings
+from app.domain.idempotency.idempotency_record import IdempotencyKeyMismatchError
+from app.domain.transaction.transaction_query import TransactionFilter, TransactionQuery
+from app.domain.transaction.transaction_value_objects import TransactionType
+from app.infrastructure.di.async_usecase import AsyncUseCase
 from app.infrastructure.di.injection import (
+    get_batch_delete_transactions_usecase,
+    get_batch_update_transactions_usecase,
     get_create_transaction_usecase,
+    get_data_version_usecase,
     get_delete_transaction_usecase,
+    get_export_transactions_usecase,
     get_get_transactions_usecase,
+    get_import_transactions_usecase,
+    get_patch_transaction_usecase,
     get_put_transaction_usecase,
 )
+from app.infrastructure.di.streaming_usecase import StreamingUseCase
+from app.presentation.conditional import is_not_modified, make_etag, not_modified, with_validators
+from app.presentation.schemas.cursor import decode_cursor
 from app.presentation.schemas.requests.transaction import (
+    BatchDeleteTransactionsRequestSchema,
+    BatchUpdateTransactionsRequestSchema,
     CreateTransactionRequestSchema,
+    PatchTransactionRequestSchema,
     UpdateTransactionRequestSchema,
 )
+from app.presentation.schemas.requests.transaction_import import (
+    parse_import_payload,
+    validate_import_rows,
+)
+from app.presentation.schemas.responses.fast_json import FastJSONResponse
 from app.presentation.schemas.responses.transaction import (
+    BatchTransactionsResponseSchema,
     CreateTransactionResponseSchema,
     GetTransactionListResponseSchema,
+    ImportRowErrorSchema,
+    ImportTransactionsResponseSchema,
     UpdateTransactionResponseSchema,
 )
+from app.presentation.schemas.responses.transaction_export import iter_csv, iter_ndjson
+from app.usecase.data_version.get_data_version_usecase import GetDataVersionUseCase
+from app.usecase.transaction.batch_delete_transactions_usecase import (
+    BatchDeleteTransactionsUseCase,
+)
+from app.usecase.transaction.batch_update_transactions_usecase import (
+    BatchUpdateTransactionsUseCase,
+)
 from app.usecase.transaction.create_transaction_usecase import CreateTransactionUseCase
 from app.usecase.transaction.delete_transaction_usecase import DeleteTransactionUseCase
+from app.usecase.transaction.export_transactions_usecase import ExportTransactionsUseCase
 from app.usecase.transaction.get_transactions_usecase import GetTransactionsUseCase
+from app.usecase.transaction.import_transactions_usecase import ImportTransactionsUseCase
+from app.usecase.transaction.patch_transaction_usecase import PatchTransactionUseCase
 from app.usecase.transaction.put_transaction_usecase import PutTransactionUseCase
 
 router = APIRouter(tags=["transaction"])
@@ -29,13 +70,49 @@ router = APIRouter(tags=["transaction"])
     "/transactions", response_model=GetTransactionListResponseSchema, status_code=status.HTTP_200_OK
 )
 async def get_transactions(
+    request: Request,
     auth_context=Depends(get_current_user),
-    usecase: GetTransactionsUseCase = Depends(get_get_transactions_usecase),
+    usecase: AsyncUseCase[GetTransactionsUseCase] = Depends(get_get_transactions_usecase),
+    versions: AsyncUseCase[GetDataVersionUseCase] = Depends(get_data_version_usecase),
+    *,
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    before: str | None = Query(None, description="Return the page older than this cursor"),
+    after: str | None = Query(None, description="Return the page newer than this cursor"),
+    from_: date | None = Query(None, alias="from"),
+    to: date | None = Query(None, alias="to"),
+    type: Literal["income", "expense"] | None = Query(None),
+    category_id: UUID | None = Query(None),
+    min_amount: int | None = Query(None, ge=0),
+    max_amount: int | None = Query(None, ge=0),
 ):
-    """Retrieve transactions for the current user"""
+    """Retrieve one page of transactions for the current user, newest first"""
     try:
-        transactions = usecase.execute(auth_context.sub)
-        return GetTransactionListResponseSchema.from_entities(transactions)
+        query = TransactionQuery(
+            limit=limit,
+            before=decode_cursor(before),
+            after=decode_cursor(after),
+            filter=TransactionFilter(
+                from_=from_,
+                to=to,
+                type=TransactionType(type) if type else None,
+                category_id=category_id,
+                min_amount=min_amount,
+                max_amount=max_amount,
+            ),
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+
+    try:
+        version = await versions.execute(auth_context.sub)
+        etag = make_etag(version, "transactions", request.url.query)
+        if is_not_modified(request, etag):
+            return not_modified(version, etag)
+
+        page = await usecase.execute(auth_context.sub, query)
+        return with_validators(
+            FastJSONResponse(GetTransactionListResponseSchema.dump_page(page)), version, etag
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -43,27 +120,89 @@ async def get_transactions(
         ) from e
 
 
+_EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv; charset=utf-8"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
+
+
+@router.get(
+    "/transactions/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "All matching transactions, oldest first",
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+        }
+    },
+)
+async def export_transactions(
+    auth_context=Depends(get_current_user),
+    usecase: StreamingUseCase[ExportTransactionsUseCase] = Depends(get_export_transactions_usecase),
+    *,
+    format: Literal["csv", "ndjson"] = Query("csv", description="Export format"),
+    from_: date | None = Query(None, alias="from"),
+    to: date | None = Query(None, alias="to"),
+    type: Literal["income", "expense"] | None = Query(None),
+    category_id: UUID | None = Query(None),
+):
+    """Stream every transaction of the current user as CSV or NDJSON"""
+    transaction_filter = TransactionFilter(
+        from_=from_,
+        to=to,
+        type=TransactionType(type) if type else None,
+        category_id=category_id,
+    )
+    encode, media_type = _EXPORT_FORMATS[format]
+    return StreamingResponse(
+        encode(usecase.iterate(auth_context.sub, transaction_filter)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
+
+
 @router.post(
     "/transactions",
     response_model=CreateTransactionResponseSchema,
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Idempotency-Key reused with a different request body"
+        },
     },
 )
 async def create_transaction(
     data: CreateTransactionRequestSchema,
+    response: Response,
     auth_context=Depends(get_current_user),
-    usecase: CreateTransactionUseCase = Depends(get_create_transaction_usecase),
+    usecase: AsyncUseCase[CreateTransactionUseCase] = Depends(get_create_transaction_usecase),
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Retries with the same key return the original response",
+    ),
 ):
-    """Create a new transaction for the current user"""
+    """
+    Create a new transaction for the current user.
+
+    With an `Idempotency-Key`, a retry of an earlier request returns the
+    original 201 response (marked with `Idempotent-Replayed: true`) instead of
+    creating a duplicate.
+    """
     try:
         transaction_data = data.model_dump()
-        result = usecase.execute(auth_context.sub, transaction_data)
+        result = await usecase.execute(auth_context.sub, transaction_data, idempotency_key)
+        if result.replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         return CreateTransactionResponseSchema(
             id=str(result.id),
             message="Transaction created successfully",
         )
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)) from e
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve)) from ve
     except ValidationError as ve:
@@ -77,6 +216,149 @@ async def create_transaction(
         ) from e
 
 
+@router.post(
+    "/transactions/import",
+    response_model=ImportTransactionsResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Unreadable import document"},
+        413: {"description": "Too many rows"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/CreateTransactionRequestSchema"},
+                    }
+                },
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_transactions(
+    request: Request,
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[ImportTransactionsUseCase] = Depends(get_import_transactions_usecase),
+    skip_duplicates: bool = Query(
+        False,
+        description=(
+            "Opt in to skipping rows identical to an existing transaction or an earlier row; "
+            "legitimate repeats (e.g. two identical purchases on one day) are dropped too"
+        ),
+    ),
+):
+    """
+    Import many transactions for the current user from a JSON array or CSV.
+
+    Valid rows are inserted in one database transaction; invalid rows are
+    reported per row and do not block the rest of the import.
+    """
+    try:
+        raw_rows = parse_import_payload(await request.body(), request.headers.get("content-type"))
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    if len(raw_rows) > settings.TRANSACTION_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Import is limited to {settings.TRANSACTION_IMPORT_MAX_ROWS} rows",
+        )
+
+    rows, row_errors = validate_import_rows(raw_rows)
+    try:
+        result = await usecase.execute(auth_context.sub, rows, skip_duplicates)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+
+    return ImportTransactionsResponseSchema(
+        imported=len(result.imported_ids),
+        duplicates=len(result.duplicate_rows),
+        failed=len(row_errors),
+        duplicate_rows=result.duplicate_rows,
+        errors=[ImportRowErrorSchema(row=row, errors=errors) for row, errors in row_errors],
+    )
+
+
+def _check_batch_size(ids: list[UUID]) -> None:
+    if len(ids) > settings.TRANSACTION_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch is limited to {settings.TRANSACTION_BATCH_MAX_IDS} ids",
+        )
+
+
+@router.post(
+    "/transactions:batchUpdate",
+    response_model=BatchTransactionsResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"},
+        413: {"description": "Too many ids"},
+    },
+)
+async def batch_update_transactions(
+    data: BatchUpdateTransactionsRequestSchema,
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[BatchUpdateTransactionsUseCase] = Depends(
+        get_batch_update_transactions_usecase
+    ),
+):
+    """
+    Apply the same partial update to many transactions of the current user.
+
+    All listed transactions are changed with one UPDATE in a single database
+    transaction; IDs the user has no transaction for are reported as not_found.
+    """
+    _check_batch_size(data.ids)
+    try:
+        result = await usecase.execute(
+            auth_context.sub, data.ids, data.changes.model_dump(exclude_unset=True)
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+    return BatchTransactionsResponseSchema.from_outcomes(data.ids, result.succeeded, "updated")
+
+
+@router.post(
+    "/transactions:batchDelete",
+    response_model=BatchTransactionsResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={413: {"description": "Too many ids"}},
+)
+async def batch_delete_transactions(
+    data: BatchDeleteTransactionsRequestSchema,
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[BatchDeleteTransactionsUseCase] = Depends(
+        get_batch_delete_transactions_usecase
+    ),
+):
+    """
+    Delete many transactions of the current user with one DELETE.
+
+    IDs the user has no transaction for are reported as not_found.
+    """
+    _check_batch_size(data.ids)
+    try:
+        result = await usecase.execute(auth_context.sub, data.ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+    return BatchTransactionsResponseSchema.from_outcomes(data.ids, result.succeeded, "deleted")
+
+
 @router.put(
     "/transactions/{transaction_id}",
     response_model=UpdateTransactionResponseSchema,
@@ -87,12 +369,12 @@ async def update_transaction(
     transaction_id: str,
     data: UpdateTransactionRequestSchema,
     auth_context=Depends(get_current_user),
-    usecase: PutTransactionUseCase = Depends(get_put_transaction_usecase),
+    usecase: AsyncUseCase[PutTransactionUseCase] = Depends(get_put_transaction_usecase),
 ):
     """Update a transaction by ID for the current user"""
     try:
         update_data = data.model_dump()
-        result = usecase.execute(auth_context.sub, transaction_id, update_data)
+        result = await usecase.execute(auth_context.sub, transaction_id, update_data)
         return UpdateTransactionResponseSchema(
             id=str(result.id),
             message="Transaction updated successfully",
@@ -110,12 +392,60 @@ async def update_transaction(
         ) from e
 
 
-@router.delete("/transactions/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.patch(
+    "/transactions/{transaction_id}",
+    response_model=UpdateTransactionResponseSchema,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"}},
+)
+async def patch_transaction(
+    transaction_id: str,
+    data: PatchTransactionRequestSchema,
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[PatchTransactionUseCase] = Depends(get_patch_transaction_usecase),
+):
+    """
+    Update only the supplied fields of a transaction for the current user.
+
+    Edits that leave type, amount, date and category untouched (e.g. the
+    description) do not touch the dashboard rollup, and leave cached
+    summaries and dashboard ETags valid.
+    """
+    try:
+        result = await usecase.execute(
+            auth_context.sub, transaction_id, data.model_dump(exclude_unset=True)
+        )
+        return UpdateTransactionResponseSchema(
+            id=str(result.id),
+            message="Transaction updated successfully",
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+
+
+@router.delete(
+    "/transactions/{transaction_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"},
+        status.HTTP_404_NOT_FOUND: {"description": "Transaction not found"},
+    },
+)
 async def delete_transaction(
     transaction_id: str,
-    _auth_context=Depends(get_current_user),
-    usecase: DeleteTransactionUseCase = Depends(get_delete_transaction_usecase),
+    auth_context=Depends(get_current_user),
+    usecase: AsyncUseCase[DeleteTransactionUseCase] = Depends(get_delete_transaction_usecase),
 ):
     """Delete a transaction by ID for the current user"""
-    usecase.execute(transaction_id)
-    return {"message": "Transaction deleted successfully"}
+    try:
+        removed = await usecase.execute(auth_context.sub, transaction_id)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    if removed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,26 @@
+import base64
+import binascii
+from datetime import date
+from uuid import UUID
+
+from app.domain.transaction.transaction_query import TransactionCursor
+
+
+def encode_cursor(cursor: TransactionCursor | None) -> str | None:
+    """Encode a keyset cursor into an opaque URL-safe token."""
+    if cursor is None:
+        return None
+    raw = f"{cursor.occurred_at.isoformat()}|{cursor.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> TransactionCursor | None:
+    """Decode a token produced by encode_cursor. Raises ValueError if malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        occurred_at, _, id_ = base64.urlsafe_b64decode(padded).decode().partition("|")
+        return TransactionCursor(occurred_at=date.fromisoformat(occurred_at), id=UUID(id_))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
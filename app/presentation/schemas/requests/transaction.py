@@ -4,6 +4,7 @@ from uuid import UUID
 from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic_core import PydanticCustomError
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -84,3 +85,48 @@ class CreateTransactionRequestSchema(BaseModel):
 
 class UpdateTransactionRequestSchema(CreateTransactionRequestSchema):
     """Schema for updating an existing transaction."""
+
+
+class PatchTransactionRequestSchema(CreateTransactionRequestSchema):
+    """Schema for partially updating a transaction; omitted fields are left unchanged."""
+
+    type: Literal["income", "expense"] | None = Field(
+        None, description="Transaction type: income or expense"
+    )
+
+    amount: int | None = Field(
+        None, gt=0, description="Transaction amount in cents, must be positive"
+    )
+
+    occurred_at: datetime | None = Field(None, description="Date when the transaction occurred")
+
+    description: str | None = Field(
+        None, max_length=255, description="Transaction description (null clears it)"
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def reject_required_nulls(cls, data):
+        if isinstance(data, dict):
+            nulls = [k for k in ("type", "amount", "occurred_at") if k in data and data[k] is None]
+            if nulls:
+                raise PydanticCustomError(
+                    "null_not_allowed", "{fields} cannot be null", {"fields": ", ".join(nulls)}
+                )
+        return data
+
+
+class BatchDeleteTransactionsRequestSchema(BaseModel):
+    """Schema for deleting many transactions at once."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    ids: list[UUID] = Field(..., min_length=1, description="IDs of the transactions")
+
+
+class BatchUpdateTransactionsRequestSchema(BatchDeleteTransactionsRequestSchema):
+    """Schema for applying the same partial update to many transactions."""
+
+    changes: PatchTransactionRequestSchema = Field(
+        ..., description="Fields to set on every listed transaction"
+    )
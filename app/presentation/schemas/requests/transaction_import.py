@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.presentation.schemas.requests.transaction import CreateTransactionRequestSchema
+
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+
+
+def parse_import_payload(body: bytes, content_type: str | None) -> list[Any]:
+    """
+    Decode a bulk import body into raw rows.
+
+    `text/csv` bodies need a header row naming CreateTransactionRequestSchema
+    fields; anything else is read as a JSON array of objects.
+    Raises ValueError when the document itself cannot be read.
+    """
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")  # Excel が付ける BOM を許容する
+    except UnicodeDecodeError as e:
+        raise ValueError("Import body must be UTF-8 encoded") from e
+
+    if media_type in CSV_MEDIA_TYPES:
+        reader = csv.DictReader(io.StringIO(text, newline=""))
+        if not reader.fieldnames:
+            raise ValueError("CSV import requires a header row")
+        return list(reader)
+
+    try:
+        rows = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(rows, list):
+        raise ValueError("JSON import body must be an array of transactions")
+    return rows
+
+
+def validate_import_rows(
+    raw_rows: list[Any],
+) -> tuple[list[tuple[int, dict[str, Any]]], list[tuple[int, list[dict[str, Any]]]]]:
+    """
+    Validate each row with CreateTransactionRequestSchema.
+
+    Returns (valid rows, row errors), both keyed by 1-based row number
+    (the CSV header line is not counted).
+    """
+    valid: list[tuple[int, dict[str, Any]]] = []
+    errors: list[tuple[int, list[dict[str, Any]]]] = []
+    for row_number, raw in enumerate(raw_rows, start=1):
+        if not isinstance(raw, dict):
+            errors.append((row_number, [{"type": "dict_type", "msg": "Row must be an object"}]))
+            continue
+        if None in raw:
+            # ヘッダーより列数が多い CSV 行
+            errors.append((row_number, [{"type": "extra_forbidden", "msg": "Too many columns"}]))
+            continue
+        # 列数が足りない CSV 行は未指定として扱い、必須項目のエラーにする
+        data = {k: v for k, v in raw.items() if v is not None}
+        try:
+            schema = CreateTransactionRequestSchema.model_validate(data)
+        except ValidationError as ve:
+            errors.append(
+                (
+                    row_number,
+                    ve.errors(include_url=False, include_context=False, include_input=False),
+                )
+            )
+            continue
+        valid.append((row_number, schema.model_dump()))
+    return valid, errors
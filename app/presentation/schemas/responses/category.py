@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -51,3 +52,18 @@ class GetCategoryListResponseSchema(BaseModel):
         return GetCategoryListResponseSchema(
             categories=[GetCategoryResponseSchema.from_entity(entity) for entity in entities]
         )
+
+    @staticmethod
+    def dump_entities(entities: list[Category]) -> dict[str, Any]:
+        """Encode categories as JSON content without building pydantic models."""
+        return {
+            "categories": [
+                {
+                    "id": entity.id,
+                    "name": entity.name.value,
+                    "description": entity.description,
+                    "type": entity.type.value,
+                }
+                for entity in entities
+            ]
+        }
@@ -1,8 +1,9 @@
 from datetime import date
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
-from app.domain.dashboard.dashboard_entity import DashboardSummary
+from app.domain.dashboard.dashboard_entity import DashboardSummary, DashboardTimeseries
 
 
 class DashboardPeriodSchema(BaseModel):
@@ -54,3 +55,59 @@ class GetDashboardSummaryResponseSchema(BaseModel):
                 for cb in entity.by_category
             ],
         )
+
+    @staticmethod
+    def dump_entity(entity: "DashboardSummary") -> dict[str, Any]:
+        """Encode a DashboardSummary as JSON content without building pydantic models."""
+        return {
+            "period": {"from": entity.period.from_, "to": entity.period.to},
+            "total": {
+                "expense": entity.total.expense,
+                "income": entity.total.income,
+                "net": entity.total.net,
+                "average_daily_expense": float(entity.total.averate_daily_expense),
+            },
+            "by_category": [
+                {
+                    "category_id": str(cb.category.id),
+                    "category_name": cb.category.name,
+                    "total_amount": cb.amount,
+                    "ratio": float(cb.ratio),
+                }
+                for cb in entity.by_category
+            ],
+        }
+
+
+class GetDashboardTimeseriesResponseSchema(BaseModel):
+    """
+    Schema for dashboard time series response.
+
+    Values are columnar: element i of every list belongs to the bucket
+    starting on periods[i].
+    """
+
+    granularity: Literal["day", "week", "month"] = Field(..., description="Bucket size")
+    period: DashboardPeriodSchema = Field(..., description="Requested period")
+    opening_balance: int = Field(..., description="Net of all days before the period")
+    periods: list[date] = Field(..., description="First day of each bucket")
+    income: list[int] = Field(..., description="Income per bucket")
+    expense: list[int] = Field(..., description="Expenses per bucket")
+    net: list[int] = Field(..., description="Income minus expenses per bucket")
+    balance: list[int] = Field(
+        ..., description="Cumulative balance at the end of each bucket, from opening_balance"
+    )
+
+    @staticmethod
+    def dump_entity(entity: "DashboardTimeseries") -> dict[str, Any]:
+        """Encode a DashboardTimeseries as JSON content without building pydantic models."""
+        return {
+            "granularity": entity.granularity.value,
+            "period": {"from": entity.period.from_, "to": entity.period.to},
+            "opening_balance": entity.opening_balance,
+            "periods": entity.periods,
+            "income": entity.income,
+            "expense": entity.expense,
+            "net": entity.net,
+            "balance": entity.balance,
+        }
@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded with orjson.
+
+    Routes return it with content built straight from domain objects, so FastAPI
+    skips re-validating against `response_model` (which still documents the
+    shape in OpenAPI). UUID/date/datetime values are encoded natively, with UTC
+    datetimes rendered as `Z` like pydantic does.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
@@ -1,10 +1,12 @@
 from datetime import date, datetime, timezone
-from typing import Literal
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field, conint, field_validator
 
 from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_query import TransactionPage
+from app.presentation.schemas.cursor import encode_cursor
 
 
 class CategorySummary(BaseModel):
@@ -55,11 +57,35 @@ class TransactionSchema(BaseModel):
         )
 
 
+def dump_transaction(entity: Transaction) -> dict[str, Any]:
+    """Encode a Transaction as TransactionSchema-shaped JSON content (see FastJSONResponse)."""
+    category = entity.category
+    return {
+        "id": entity.id,
+        "account_id": entity.account_id,
+        "type": entity.type.value,
+        "amount": entity.amount.value,
+        "occurred_at": entity.occurred_at,
+        "category": {"id": category.id, "name": category.name} if category else None,
+        "description": entity.description,
+        "created_at": entity.created_at,
+        "updated_at": entity.updated_at,
+    }
+
+
 class GetTransactionListResponseSchema(BaseModel):
     """Schema for list of transactions in response."""
 
     transactions: list[TransactionSchema] = Field(..., description="List of transactions")
 
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next (older) page; pass as `before`"
+    )
+
+    prev_cursor: str | None = Field(
+        None, description="Cursor for the previous (newer) page; pass as `after`"
+    )
+
     @staticmethod
     def from_entities(entities: list[Transaction]) -> "GetTransactionListResponseSchema":
         """Convert a list of Transaction entities to response schema."""
@@ -67,6 +93,24 @@ class GetTransactionListResponseSchema(BaseModel):
             transactions=[TransactionSchema.from_entity(e) for e in entities]
         )
 
+    @staticmethod
+    def from_page(page: TransactionPage) -> "GetTransactionListResponseSchema":
+        """Convert a TransactionPage to response schema."""
+        return GetTransactionListResponseSchema(
+            transactions=[TransactionSchema.from_entity(e) for e in page.items],
+            next_cursor=encode_cursor(page.next_cursor),
+            prev_cursor=encode_cursor(page.prev_cursor),
+        )
+
+    @staticmethod
+    def dump_page(page: TransactionPage) -> dict[str, Any]:
+        """Encode a TransactionPage as JSON content without building pydantic models."""
+        return {
+            "transactions": [dump_transaction(e) for e in page.items],
+            "next_cursor": encode_cursor(page.next_cursor),
+            "prev_cursor": encode_cursor(page.prev_cursor),
+        }
+
 
 class CreateTransactionResponseSchema(BaseModel):
     """Schema for transaction creation response."""
@@ -80,3 +124,55 @@ class UpdateTransactionResponseSchema(BaseModel):
 
     id: UUID = Field(..., description="Unique identifier of the updated transaction")
     message: str = Field(..., description="Response message")
+
+
+class ImportRowErrorSchema(BaseModel):
+    """Validation errors for one submitted row."""
+
+    row: int = Field(..., description="1-based row number (CSV header not counted)")
+    errors: list[dict[str, Any]] = Field(..., description="Validation errors for the row")
+
+
+class ImportTransactionsResponseSchema(BaseModel):
+    """Schema for bulk transaction import response."""
+
+    imported: int = Field(..., description="Number of transactions created")
+    duplicates: int = Field(..., description="Number of rows skipped as duplicates")
+    failed: int = Field(..., description="Number of rows rejected by validation")
+    duplicate_rows: list[int] = Field(
+        default_factory=list, description="Row numbers skipped as duplicates"
+    )
+    errors: list[ImportRowErrorSchema] = Field(
+        default_factory=list, description="Per-row validation errors"
+    )
+
+
+class BatchItemResultSchema(BaseModel):
+    """Outcome for one transaction of a batch request."""
+
+    id: UUID = Field(..., description="Transaction ID as given in the request")
+    status: Literal["updated", "deleted", "not_found"] = Field(..., description="Outcome")
+
+
+class BatchTransactionsResponseSchema(BaseModel):
+    """Schema for batch update / delete response."""
+
+    succeeded: int = Field(..., description="Number of transactions updated or deleted")
+    not_found: int = Field(..., description="Number of IDs the user has no transaction for")
+    results: list[BatchItemResultSchema] = Field(..., description="Per-ID outcomes")
+
+    @staticmethod
+    def from_outcomes(
+        ids: list[UUID], succeeded: list[UUID], status: Literal["updated", "deleted"]
+    ) -> "BatchTransactionsResponseSchema":
+        """Build the response from the requested IDs (in request order) and the changed ones."""
+        done = set(succeeded)
+        results = [
+            BatchItemResultSchema(id=i, status=status if i in done else "not_found")
+            for i in dict.fromkeys(ids)
+        ]
+        return BatchTransactionsResponseSchema(
+            succeeded=len(done),
+            not_found=len(results) - len(done),
+            results=results,
+        )
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from app.domain.transaction.transaction_entity import Transaction
+
+EXPORT_COLUMNS = (
+    "id",
+    "occurred_at",
+    "type",
+    "amount",
+    "category_id",
+    "category_name",
+    "description",
+    "created_at",
+    "updated_at",
+)
+
+# この行数ごとに 1 チャンクとして送り出す
+_CHUNK_ROWS = 500
+
+
+def _export_row(tx: Transaction) -> dict[str, Any]:
+    return {
+        "id": str(tx.id),
+        "occurred_at": tx.occurred_at.isoformat(),
+        "type": tx.type.value,
+        "amount": tx.amount.value,
+        "category_id": str(tx.category.id) if tx.category else None,
+        "category_name": tx.category.name if tx.category else None,
+        "description": tx.description,
+        "created_at": tx.created_at.isoformat(),
+        "updated_at": tx.updated_at.isoformat(),
+    }
+
+
+def iter_csv(transactions: Iterable[Transaction]) -> Iterator[str]:
+    """Encode transactions as CSV with a header row, yielding a chunk every few hundred rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for i, tx in enumerate(transactions, start=1):
+        writer.writerow(_export_row(tx))
+        if i % _CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(transactions: Iterable[Transaction]) -> Iterator[str]:
+    """Encode transactions as newline-delimited JSON, one object per line."""
+    lines: list[str] = []
+    for tx in transactions:
+        lines.append(json.dumps(_export_row(tx), ensure_ascii=False))
+        if len(lines) == _CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
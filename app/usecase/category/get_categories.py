@@ -15,8 +15,8 @@ class GetCategoryListUseCaseImpl(GetCategoryListUseCase):
         self.category_repo = category_repo
 
     def execute(self, user_id: str) -> list[Category]:
-        categories = self.category_repo.find_all_accessible_by_user(user_id)
-        return sorted(categories, key=lambda c: c.created_at, reverse=True)
+        # リポジトリが作成日時の新しい順で返す
+        return self.category_repo.find_all_accessible_by_user(user_id)
 
 
 def new_get_category_list_usecase(
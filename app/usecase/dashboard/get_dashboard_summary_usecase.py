@@ -1,23 +1,45 @@
 from abc import abstractmethod
 from datetime import date
 
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
 from app.domain.dashboard.dashboard_entity import DashboardPeriod, DashboardSummary, DashboardTotal
 from app.domain.dashboard.dashboard_repository import DashboardSuammaryRepository
 
 
 class GetDashboardSummaryUseCase:
     @abstractmethod
-    def execute(self, user_id) -> DashboardSummary:
-        pass
+    def execute(self, user_id: str, from_: date, to: date, version: int) -> DashboardSummary:
+        """Summary for the period; `version` is the user's current aggregate version."""
 
 
 class GetDashboardSummaryUseCaseImpl(GetDashboardSummaryUseCase):
-    def __init__(self, dashboard_repo: DashboardSuammaryRepository):
+    def __init__(
+        self,
+        dashboard_repo: DashboardSuammaryRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+        fill_cache: bool = True,
+    ):
         self.dashboard_repo = dashboard_repo
-
-    def execute(self, user_id: str, from_: date, to: date) -> DashboardSummary:
-        expense = self.dashboard_repo.get_expense_total(user_id, from_, to)
-        income = self.dashboard_repo.get_income_total(user_id, from_, to)
+        self.dashboard_cache = dashboard_cache
+        # False: キャッシュは読むだけで、計算した集計を保存しない
+        self.fill_cache = fill_cache
+
+    def execute(self, user_id: str, from_: date, to: date, version: int) -> DashboardSummary:
+        # 書き込みのコミット前に読んだ集計は古い版で保存されるため、コミット後の版では使われない
+        if self.dashboard_cache is not None:
+            cached = self.dashboard_cache.get(user_id, from_, to, version)
+            if cached is not None:
+                return cached
+
+        summary = self._summarize(user_id, from_, to)
+        if self.dashboard_cache is not None and self.fill_cache:
+            self.dashboard_cache.set(user_id, from_, to, version, summary)
+        return summary
+
+    def _summarize(self, user_id: str, from_: date, to: date) -> DashboardSummary:
+        aggregate = self.dashboard_repo.get_aggregate(user_id, from_, to)
+        expense = aggregate.expense
+        income = aggregate.income
         net = income - expense
 
         days = (to - from_).days + 1
@@ -27,12 +49,13 @@ class GetDashboardSummaryUseCaseImpl(GetDashboardSummaryUseCase):
         total = DashboardTotal(
             expense=expense, income=income, net=net, averate_daily_expense=avg_daily
         )
-        by_category = self.dashboard_repo.get_category_breakdown(user_id, from_, to)
 
-        return DashboardSummary(period=period, total=total, by_category=by_category)
+        return DashboardSummary(period=period, total=total, by_category=aggregate.by_category)
 
 
 def new_get_dashboard_summary_usecase(
     dashboard_repo: DashboardSuammaryRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+    fill_cache: bool = True,
 ) -> GetDashboardSummaryUseCase:
-    return GetDashboardSummaryUseCaseImpl(dashboard_repo)
+    return GetDashboardSummaryUseCaseImpl(dashboard_repo, dashboard_cache, fill_cache)
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+from app.domain.dashboard.dashboard_entity import (
+    DashboardPeriod,
+    DashboardTimeseries,
+    TimeseriesGranularity,
+)
+from app.domain.dashboard.dashboard_repository import DashboardSuammaryRepository
+
+
+class GetDashboardTimeseriesUseCase(ABC):
+    @abstractmethod
+    def execute(
+        self, user_id: str, from_: date, to: date, granularity: TimeseriesGranularity
+    ) -> DashboardTimeseries: ...
+
+
+class GetDashboardTimeseriesUseCaseImpl(GetDashboardTimeseriesUseCase):
+    def __init__(self, dashboard_repo: DashboardSuammaryRepository, max_points: int):
+        self.dashboard_repo = dashboard_repo
+        self.max_points = max_points
+
+    def execute(
+        self, user_id: str, from_: date, to: date, granularity: TimeseriesGranularity
+    ) -> DashboardTimeseries:
+        if from_ > to:
+            raise ValueError("from must not be after to")
+        # 上限の判定は件数の計算だけで行い、巨大な期間でもバケットを列挙しない
+        points_count = granularity.count(from_, to)
+        if points_count > self.max_points:
+            raise ValueError(
+                f"Range has {points_count} {granularity.value} buckets; "
+                f"the limit is {self.max_points}"
+            )
+        periods = list(granularity.buckets(from_, to))
+
+        opening = self.dashboard_repo.get_opening_balance(user_id, from_)
+        points = {
+            p.start: p for p in self.dashboard_repo.get_timeseries(user_id, from_, to, granularity)
+        }
+
+        # 取引のない期間も 0 で埋め、全列を periods と同じ長さにそろえる
+        series = DashboardTimeseries(
+            granularity=granularity,
+            period=DashboardPeriod(from_=from_, to=to),
+            opening_balance=opening,
+            periods=periods,
+        )
+        balance = opening
+        for start in periods:
+            point = points.get(start)
+            if point is not None:
+                balance = opening + point.balance
+            income = point.income if point else 0
+            expense = point.expense if point else 0
+            series.income.append(income)
+            series.expense.append(expense)
+            series.net.append(income - expense)
+            series.balance.append(balance)
+        return series
+
+
+def new_get_dashboard_timeseries_usecase(
+    dashboard_repo: DashboardSuammaryRepository, max_points: int
+) -> GetDashboardTimeseriesUseCase:
+    return GetDashboardTimeseriesUseCaseImpl(dashboard_repo, max_points)
@@ -0,0 +1,22 @@
+from abc import abstractmethod
+
+from app.domain.data_version.data_version_entity import DataVersion
+from app.domain.data_version.data_version_repository import DataVersionRepository
+
+
+class GetDataVersionUseCase:
+    @abstractmethod
+    def execute(self, user_id: str) -> DataVersion:
+        pass
+
+
+class GetDataVersionUseCaseImpl(GetDataVersionUseCase):
+    def __init__(self, data_version_repo: DataVersionRepository):
+        self.data_version_repo = data_version_repo
+
+    def execute(self, user_id: str) -> DataVersion:
+        return self.data_version_repo.find_by_user_id(user_id)
+
+
+def new_get_data_version_usecase(data_version_repo: DataVersionRepository) -> GetDataVersionUseCase:
+    return GetDataVersionUseCaseImpl(data_version_repo)
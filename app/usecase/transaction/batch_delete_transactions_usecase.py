@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.transaction.transaction_repository import TransactionRepository
+from app.usecase.transaction.batch_update_transactions_usecase import (
+    TransactionBatchResult,
+    split_outcomes,
+)
+
+
+class BatchDeleteTransactionsUseCase(ABC):
+    @abstractmethod
+    def execute(self, user_id: str, transaction_ids: list[UUID]) -> TransactionBatchResult: ...
+
+
+class BatchDeleteTransactionsUseCaseImpl(BatchDeleteTransactionsUseCase):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+    ):
+        self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+
+    def execute(self, user_id: str, transaction_ids: list[UUID]) -> TransactionBatchResult:
+        ids = list(dict.fromkeys(transaction_ids))
+        removed = self.transaction_repo.remove_many(ids, user_id)
+
+        if removed and self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, *{tx.occurred_at for tx in removed})
+        return split_outcomes(ids, {tx.id for tx in removed})
+
+
+def new_batch_delete_transactions_usecase(
+    transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+) -> BatchDeleteTransactionsUseCase:
+    return BatchDeleteTransactionsUseCaseImpl(transaction_repo, dashboard_cache)
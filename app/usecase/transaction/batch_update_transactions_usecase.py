@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.transaction.transaction_repository import TransactionRepository
+from app.usecase.transaction.patch_transaction_usecase import build_changes
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionBatchResult:
+    # 変更 (削除) できた ID と、ユーザーの取引として存在しなかった ID (リクエスト順)
+    succeeded: list[UUID] = field(default_factory=list)
+    not_found: list[UUID] = field(default_factory=list)
+
+
+def split_outcomes(ids: list[UUID], done: set[UUID]) -> TransactionBatchResult:
+    """Partition the requested ids (in request order) into succeeded and not found."""
+    return TransactionBatchResult(
+        succeeded=[i for i in ids if i in done],
+        not_found=[i for i in ids if i not in done],
+    )
+
+
+class BatchUpdateTransactionsUseCase(ABC):
+    @abstractmethod
+    def execute(
+        self, user_id: str, transaction_ids: list[UUID], data: dict[str, Any]
+    ) -> TransactionBatchResult: ...
+
+
+class BatchUpdateTransactionsUseCaseImpl(BatchUpdateTransactionsUseCase):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+    ):
+        self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+
+    def execute(
+        self, user_id: str, transaction_ids: list[UUID], data: dict[str, Any]
+    ) -> TransactionBatchResult:
+        changes = build_changes(data)
+        if not changes:
+            raise ValueError("No fields to update")
+
+        ids = list(dict.fromkeys(transaction_ids))
+        results = self.transaction_repo.patch_many(ids, user_id, changes, datetime.now(UTC))
+
+        days = {
+            day
+            for previous, current in results
+            if previous is not None
+            for day in (previous.occurred_at, current.occurred_at)
+        }
+        if days and self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, *days)
+        return split_outcomes(ids, {current.id for _, current in results})
+
+
+def new_batch_update_transactions_usecase(
+    transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+) -> BatchUpdateTransactionsUseCase:
+    return BatchUpdateTransactionsUseCaseImpl(transaction_repo, dashboard_cache)
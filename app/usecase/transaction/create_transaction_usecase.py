@@ -1,48 +1,113 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.idempotency.idempotency_record import (
+    IdempotencyKeyMismatchError,
+    IdempotencyRecord,
+)
+from app.domain.idempotency.idempotency_store import IdempotencyStore
 from app.domain.transaction.transaction_entity import Transaction
 from app.domain.transaction.transaction_repository import TransactionRepository
 from app.domain.transaction.transaction_value_objects import TransactionType
 
 
+def build_transaction(user_id: str, data: dict[str, Any]) -> Transaction:
+    """Build a new Transaction from validated create-request data."""
+    occurred_at = data["occurred_at"]
+    if isinstance(occurred_at, datetime):
+        occurred_at = occurred_at.date()
+
+    category_id = data.get("category_id")
+    if category_id is not None and category_id not in ("", "null"):
+        category_id = category_id if isinstance(category_id, UUID) else UUID(str(category_id))
+    else:
+        category_id = None
+
+    return Transaction.create(
+        user_id=user_id,
+        account_id=None,
+        type=TransactionType(data["type"]),
+        amount=data["amount"],
+        occurred_at=occurred_at,
+        category_id=category_id,
+        description=data.get("description", ""),
+    )
+
+
+def request_hash(data: dict[str, Any]) -> str:
+    """Stable digest of create-request data, used to detect a reused Idempotency-Key."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CreateTransactionResult:
+    id: UUID
+    # True: Idempotency-Key の再送で、作成済みの取引を返した
+    replayed: bool = False
+
+
 class CreateTransactionUseCase(ABC):
     @abstractmethod
-    def execute(self, user_id: str, data: dict[str, Any]) -> Transaction: ...
+    def execute(
+        self, user_id: str, data: dict[str, Any], idempotency_key: str | None = None
+    ) -> CreateTransactionResult: ...
 
 
 class CreateTransactionUseCaseImpl(CreateTransactionUseCase):
-    def __init__(self, transaction_repo: TransactionRepository):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+        idempotency_store: IdempotencyStore | None = None,
+    ):
         self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+        self.idempotency_store = idempotency_store
 
-    def execute(self, user_id: str, data: dict[str, Any]) -> Transaction:
-        occurred_at = data["occurred_at"]
-        if isinstance(occurred_at, datetime):
-            occurred_at = occurred_at.date()
-
-        category_id = data.get("category_id")
-        if category_id is not None and category_id not in ("", "null"):
-            category_id = category_id if isinstance(category_id, UUID) else UUID(str(category_id))
-        else:
-            category_id = None
+    def execute(
+        self, user_id: str, data: dict[str, Any], idempotency_key: str | None = None
+    ) -> CreateTransactionResult:
+        transaction = build_transaction(user_id, data)
 
-        transaction = Transaction.create(
-            user_id=user_id,
-            account_id=None,
-            type=TransactionType(data["type"]),
-            amount=data["amount"],
-            occurred_at=occurred_at,
-            category_id=category_id,
-            description=data.get("description", ""),
-        )
+        store = self.idempotency_store if idempotency_key is not None else None
+        if store is not None:
+            record = IdempotencyRecord(
+                user_id=user_id,
+                key=idempotency_key,
+                request_hash=request_hash(data),
+                resource_id=transaction.id,
+                created_at=datetime.now(UTC),
+            )
+            existing = store.claim(record)
+            if existing is not None:
+                if existing.request_hash != record.request_hash:
+                    raise IdempotencyKeyMismatchError(
+                        "Idempotency-Key was already used with a different request"
+                    )
+                # 再送は作成済みの ID を返すだけで、INSERT も存在確認も行わない
+                return CreateTransactionResult(id=existing.resource_id, replayed=True)
 
-        self.transaction_repo.add(transaction)
-        return transaction
+        try:
+            self.transaction_repo.add(transaction)
+        except Exception:
+            if store is not None:
+                store.release(user_id, idempotency_key)
+            raise
+        if self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, transaction.occurred_at)
+        return CreateTransactionResult(id=transaction.id)
 
 
 def new_create_transaction_usecase(
     transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+    idempotency_store: IdempotencyStore | None = None,
 ) -> CreateTransactionUseCase:
-    return CreateTransactionUseCaseImpl(transaction_repo)
+    return CreateTransactionUseCaseImpl(transaction_repo, dashboard_cache, idempotency_store)
@@ -1,20 +1,34 @@
 from abc import abstractmethod
 from uuid import UUID
 
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.transaction.transaction_entity import Transaction
+
 
 class DeleteTransactionUseCase:
     @abstractmethod
-    def execute(self, user_id: str, transaction_id: str) -> None:
-        pass
+    def execute(self, user_id: str, transaction_id: str) -> Transaction | None:
+        """Delete the user's transaction; None when the user has no such transaction."""
 
 
 class DeleteTransactionUseCaseImpl(DeleteTransactionUseCase):
-    def __init__(self, transaction_repo):
+    def __init__(self, transaction_repo, dashboard_cache: DashboardSummaryCache | None = None):
         self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+
+    def execute(self, user_id: str, transaction_id: str) -> Transaction | None:
+        try:
+            tx_id = UUID(transaction_id)
+        except ValueError as e:
+            raise ValueError("Invalid transaction_id") from e
 
-    def execute(self, transaction_id: str) -> None:
-        self.transaction_repo.remove(UUID(transaction_id))
+        removed = self.transaction_repo.remove(tx_id, user_id)
+        if removed is not None and self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, removed.occurred_at)
+        return removed
 
 
-def new_delete_transaction_usecase(transaction_repo) -> DeleteTransactionUseCase:
-    return DeleteTransactionUseCaseImpl(transaction_repo)
+def new_delete_transaction_usecase(
+    transaction_repo, dashboard_cache: DashboardSummaryCache | None = None
+) -> DeleteTransactionUseCase:
+    return DeleteTransactionUseCaseImpl(transaction_repo, dashboard_cache)
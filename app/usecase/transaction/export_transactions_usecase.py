@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_query import TransactionFilter
+from app.domain.transaction.transaction_repository import TransactionRepository
+
+
+class ExportTransactionsUseCase(ABC):
+    @abstractmethod
+    def execute(self, user_id: str, filter: TransactionFilter) -> Iterator[Transaction]: ...
+
+
+class ExportTransactionsUseCaseImpl(ExportTransactionsUseCase):
+    def __init__(self, transaction_repo: TransactionRepository):
+        self.transaction_repo = transaction_repo
+
+    def execute(self, user_id: str, filter: TransactionFilter) -> Iterator[Transaction]:
+        return self.transaction_repo.iter_by_user_id(user_id, filter)
+
+
+def new_export_transactions_usecase(
+    transaction_repo: TransactionRepository,
+) -> ExportTransactionsUseCase:
+    return ExportTransactionsUseCaseImpl(transaction_repo)
@@ -1,12 +1,12 @@
 from abc import abstractmethod
 
-from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_query import TransactionPage, TransactionQuery
 from app.domain.transaction.transaction_repository import TransactionRepository
 
 
 class GetTransactionsUseCase:
     @abstractmethod
-    def execute(self, user_id: str) -> list[Transaction]:
+    def execute(self, user_id: str, query: TransactionQuery) -> TransactionPage:
         pass
 
 
@@ -14,9 +14,8 @@ class GetTransactionsUseCaseImpl(GetTransactionsUseCase):
     def __init__(self, transaction_repo: TransactionRepository):
         self.transaction_repo = transaction_repo
 
-    def execute(self, user_id: str) -> list[Transaction]:
-        transactions = self.transaction_repo.find_by_user_id(user_id)
-        return sorted(transactions, key=lambda t: t.created_at, reverse=True)
+    def execute(self, user_id: str, query: TransactionQuery) -> TransactionPage:
+        return self.transaction_repo.find_page_by_user_id(user_id, query)
 
 
 def new_get_transactions_usecase(
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_repository import TransactionRepository
+from app.usecase.transaction.create_transaction_usecase import build_transaction
+
+
+@dataclass(slots=True)
+class TransactionImportResult:
+    """Outcome of a bulk import; row numbers refer to the submitted rows."""
+
+    imported_ids: list[UUID] = field(default_factory=list)
+    duplicate_rows: list[int] = field(default_factory=list)
+
+
+class ImportTransactionsUseCase(ABC):
+    @abstractmethod
+    def execute(
+        self, user_id: str, rows: list[tuple[int, dict[str, Any]]], skip_duplicates: bool = False
+    ) -> TransactionImportResult: ...
+
+
+class ImportTransactionsUseCaseImpl(ImportTransactionsUseCase):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+    ):
+        self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+
+    def execute(
+        self, user_id: str, rows: list[tuple[int, dict[str, Any]]], skip_duplicates: bool = False
+    ) -> TransactionImportResult:
+        result = TransactionImportResult()
+        candidates = [(row, build_transaction(user_id, data)) for row, data in rows]
+        if not candidates:
+            return result
+
+        transactions: list[Transaction] = []
+        if skip_duplicates:
+            # 既存の取引、または同じ取り込み内の先行行と内容が同一の行は取り込まない
+            days = [tx.occurred_at for _, tx in candidates]
+            seen = self.transaction_repo.find_fingerprints(user_id, min(days), max(days))
+            for row, tx in candidates:
+                if tx.fingerprint in seen:
+                    result.duplicate_rows.append(row)
+                    continue
+                seen.add(tx.fingerprint)
+                transactions.append(tx)
+        else:
+            transactions = [tx for _, tx in candidates]
+
+        if not transactions:
+            return result
+
+        self.transaction_repo.add_many(transactions)
+        result.imported_ids = [tx.id for tx in transactions]
+        if self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, *{tx.occurred_at for tx in transactions})
+        return result
+
+
+def new_import_transactions_usecase(
+    transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+) -> ImportTransactionsUseCase:
+    return ImportTransactionsUseCaseImpl(transaction_repo, dashboard_cache)
@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_repository import TransactionRepository
+from app.domain.transaction.transaction_value_objects import Amount, TransactionType
+
+
+def build_changes(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert the supplied fields of a patch request into domain values."""
+    changes: dict[str, Any] = {}
+    if "type" in data:
+        changes["type"] = TransactionType(data["type"])
+    if "amount" in data:
+        changes["amount"] = Amount(int(data["amount"]))
+    if "occurred_at" in data:
+        occurred_at = data["occurred_at"]
+        changes["occurred_at"] = (
+            occurred_at.date() if isinstance(occurred_at, datetime) else occurred_at
+        )
+    if "category_id" in data:
+        category_id = data["category_id"]
+        if category_id is None or category_id in ("", "null"):
+            changes["category_id"] = None
+        else:
+            changes["category_id"] = (
+                category_id if isinstance(category_id, UUID) else UUID(str(category_id))
+            )
+    if "description" in data:
+        changes["description"] = data["description"] or ""
+    return changes
+
+
+class PatchTransactionUseCase(ABC):
+    @abstractmethod
+    def execute(self, user_id: str, transaction_id: str, data: dict[str, Any]) -> Transaction: ...
+
+
+class PatchTransactionUseCaseImpl(PatchTransactionUseCase):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+    ):
+        self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
+
+    def execute(self, user_id: str, transaction_id: str, data: dict[str, Any]) -> Transaction:
+        try:
+            tx_id = UUID(transaction_id)
+        except ValueError as e:
+            raise ValueError("Invalid transaction_id") from e
+
+        changes = build_changes(data)
+        if not changes:
+            raise ValueError("No fields to update")
+
+        result = self.transaction_repo.patch(tx_id, user_id, changes, datetime.now(UTC))
+        if result is None:
+            raise ValueError("Transaction not found")
+        previous, transaction = result
+
+        # 集計に影響する項目が変わったときだけ (更新前の行を読んだときだけ) 無効化する
+        if previous is not None and self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, previous.occurred_at, transaction.occurred_at)
+        return transaction
+
+
+def new_patch_transaction_usecase(
+    transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+) -> PatchTransactionUseCase:
+    return PatchTransactionUseCaseImpl(transaction_repo, dashboard_cache)
@@ -1,11 +1,11 @@
 from abc import ABC, abstractmethod
-from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
+from app.domain.dashboard.dashboard_cache import DashboardSummaryCache
 from app.domain.transaction.transaction_entity import Transaction
 from app.domain.transaction.transaction_repository import TransactionRepository
-from app.domain.transaction.transaction_value_objects import Amount, TransactionType
+from app.usecase.transaction.create_transaction_usecase import build_transaction
 
 
 class PutTransactionUseCase(ABC):
@@ -14,8 +14,13 @@ class PutTransactionUseCase(ABC):
 
 
 class PutTransactionUseCaseImpl(PutTransactionUseCase):
-    def __init__(self, transaction_repo: TransactionRepository):
+    def __init__(
+        self,
+        transaction_repo: TransactionRepository,
+        dashboard_cache: DashboardSummaryCache | None = None,
+    ):
         self.transaction_repo = transaction_repo
+        self.dashboard_cache = dashboard_cache
 
     def execute(self, user_id: str, transaction_id: str, data: dict[str, Any]) -> Transaction:
         try:
@@ -23,40 +28,22 @@ class PutTransactionUseCaseImpl(PutTransactionUseCase):
         except ValueError as e:
             raise ValueError("Invalid transaction_id") from e
 
-        transaction = self.transaction_repo.find_by_id(tx_id)
-        if not transaction:
+        # PUT は全項目の置き換えなので、既存の行を読まずに 1 文で更新する
+        transaction = build_transaction(user_id, data)
+        transaction.id = tx_id
+        previous = self.transaction_repo.update(transaction)
+        if previous is None:
             raise ValueError("Transaction not found")
+        transaction.account_id = previous.account_id
+        transaction.created_at = previous.created_at
 
-        if transaction.user_id != user_id:
-            raise ValueError("Access denied: Transaction does not belong to current user")
-
-        if "type" in data:
-            transaction.type = TransactionType(data["type"])
-
-        if "amount" in data:
-            transaction.amount = Amount(int(data["amount"]))
-
-        if "occurred_at" in data:
-            occurred_at = data["occurred_at"]
-            transaction.occurred_at = (
-                occurred_at.date() if isinstance(occurred_at, datetime) else occurred_at
-            )
-
-        if "description" in data:
-            transaction.description = data["description"] or ""
-
-        if "category_id" in data:
-            category_id = data["category_id"]
-            if category_id is None or category_id in ("", "null"):
-                transaction.category = None
-            else:
-                uuid_id = category_id if isinstance(category_id, UUID) else UUID(str(category_id))
-                transaction.change_category(uuid_id)
-
-        transaction.updated_at = datetime.now(UTC)
-        self.transaction_repo.update(transaction)
+        if self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate(user_id, previous.occurred_at, transaction.occurred_at)
         return transaction
 
 
-def new_put_transaction_usecase(transaction_repo: TransactionRepository) -> PutTransactionUseCase:
-    return PutTransactionUseCaseImpl(transaction_repo)
+def new_put_transaction_usecase(
+    transaction_repo: TransactionRepository,
+    dashboard_cache: DashboardSummaryCache | None = None,
+) -> PutTransactionUseCase:
+    return PutTransactionUseCaseImpl(transaction_repo, dashboard_cache)
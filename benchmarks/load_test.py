@@ -0,0 +1,68 @@
+"""
+同時接続クライアントによる負荷試験 (requests/sec の比較用)
+
+同期／非同期 DB パスを比較するには、サーバーをそれぞれの設定で起動して同じ条件で計測する:
+
+    DB_ASYNC=false uv run uvicorn app.main:app --port 8000
+    uv run python -m benchmarks.load_test --url http://localhost:8000/transactions --token $TOKEN
+
+    DB_ASYNC=true uv run uvicorn app.main:app --port 8000
+    uv run python -m benchmarks.load_test --url http://localhost:8000/transactions --token $TOKEN
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _client(
+    client: httpx.AsyncClient, url: str, deadline: float, latencies: list[float], errors: list[int]
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url: str, token: str | None, concurrency: int, duration: float) -> None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: list[float] = []
+    errors: list[int] = []
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_client(client, url, deadline, latencies, errors) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(f"clients={concurrency} duration={elapsed:.1f}s requests={len(latencies)}")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s  errors={len(errors)}")
+    if latencies:
+        print(f"latency: p50={statistics.median(latencies) * 1000:.1f}ms p95={p95 * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000/transactions")
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated routes")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.token, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,9 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 from app.core.database import Base
 from app.infrastructure.category.category_dto import CategoryDTO
+from app.infrastructure.dasoboard.daily_total_dto import DailyUserCategoryTotalDTO
+from app.infrastructure.data_version.data_version_dto import UserDataVersionDTO
+from app.infrastructure.idempotency.idempotency_dto import IdempotencyKeyDTO
 from app.infrastructure.transaction.transaction_dto import TransactionDTO
 
 target_metadata = Base.metadata
@@ -0,0 +1,33 @@
+"""add transactions keyset index
+
+Revision ID: 3b7e91c2d4a8
+Revises: d9736421a334
+Create Date: 2025-10-04 10:12:45.118302
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e91c2d4a8"
+down_revision: str | Sequence[str] | None = "d9736421a334"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /transactions のキーセットページネーション (user_id, occurred_at, id) 用
+    op.create_index(
+        "ix_transactions_user_id_occurred_at_id",
+        "transactions",
+        ["user_id", "occurred_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_user_id_occurred_at_id", table_name="transactions")
@@ -0,0 +1,36 @@
+"""create user_data_versions
+
+Revision ID: 5e0a7c3b9f12
+Revises: 8c2f4d61e9b3
+Create Date: 2025-10-12 10:05:41.218344
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0a7c3b9f12"
+down_revision: str | Sequence[str] | None = "8c2f4d61e9b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_data_versions",
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("aggregate_version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("aggregate_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("user_id", name=op.f("pk_user_data_versions")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_data_versions")
@@ -0,0 +1,54 @@
+"""create daily_user_category_totals
+
+Revision ID: 8c2f4d61e9b3
+Revises: 3b7e91c2d4a8
+Create Date: 2025-10-06 21:40:03.551927
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2f4d61e9b3"
+down_revision: str | Sequence[str] | None = "3b7e91c2d4a8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_user_category_totals",
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("type", sa.String(length=7), nullable=False),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("tx_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "user_id", "day", "type", "category_id", name=op.f("pk_daily_user_category_totals")
+        ),
+    )
+
+    # 既存の取引から集計値を作成（カテゴリなしは nil UUID に集計）
+    op.execute("""
+        INSERT INTO daily_user_category_totals (user_id, day, type, category_id, amount, tx_count)
+        SELECT
+            user_id,
+            occurred_at,
+            type,
+            COALESCE(category_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            SUM(amount),
+            COUNT(*)
+        FROM transactions
+        GROUP BY user_id, occurred_at, type, category_id;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_user_category_totals")
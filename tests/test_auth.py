@@ -0,0 +1,226 @@
+"""JWT 検証の高速パス (JWKS 鍵マップ・検証済みトークンキャッシュ・バックグラウンド更新) のテスト"""
+
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jwt.algorithms import RSAAlgorithm
+
+from app.core import auth
+from app.core.config import settings
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwks(kid: str) -> dict:
+    jwk = RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key(), as_dict=True)
+    return {"keys": [{**jwk, "kid": kid, "alg": "RS256", "use": "sig"}]}
+
+
+def _token(kid: str = "k1", exp_in: int = 600, sub: str = "user_1") -> str:
+    now = int(time.time())
+    claims = {
+        "sub": sub,
+        "iss": settings.CLERK_ISSUER,
+        "aud": settings.CLERK_AUDIENCE,
+        "iat": now,
+        "exp": now + exp_in,
+    }
+    return jwt.encode(claims, PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+def _creds(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def jwks_server(monkeypatch):
+    """_fetch_jwks を差し替え、取得回数を記録する"""
+    state = {"kid": "k1", "fetches": 0}
+
+    def fake_fetch():
+        state["fetches"] += 1
+        return _jwks(state["kid"])
+
+    monkeypatch.setattr(auth, "_fetch_jwks", fake_fetch)
+    auth.clear_auth_caches()
+    yield state
+    auth.clear_auth_caches()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """jwt.decode (RSA 検証) の呼び出し回数を数える"""
+    calls = []
+    original = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_repeated_token_skips_rsa_verification(jwks_server, decode_calls):
+    """同一トークンの再送では検証済みクレームを返す"""
+    token = _token()
+
+    first = auth.get_current_user(_creds(token))
+    second = auth.get_current_user(_creds(token))
+
+    assert first.sub == second.sub == "user_1"
+    assert len(decode_calls) == 1
+    assert jwks_server["fetches"] == 1
+
+
+def test_jwks_is_parsed_once_per_fetch(jwks_server, decode_calls):
+    """別トークンでも JWKS を再取得しない"""
+    auth.get_current_user(_creds(_token(sub="a")))
+    auth.get_current_user(_creds(_token(sub="b")))
+
+    assert len(decode_calls) == 2
+    assert jwks_server["fetches"] == 1
+
+
+def test_expired_token_is_rejected(jwks_server):
+    """exp を過ぎたトークンは拒否される"""
+    token = _token(exp_in=-10)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            auth.get_current_user(_creds(token))
+        assert exc.value.status_code == 401
+
+
+def test_cache_entry_never_outlives_exp(jwks_server):
+    """exp が TTL より早ければ exp で失効する"""
+    token = _token(exp_in=1)
+    ctx = auth.get_current_user(_creds(token))
+
+    assert auth._token_expiry(b"", ctx, time.time()) <= ctx.claims["exp"]
+
+
+def test_unknown_kid_refetches_jwks_once(jwks_server, monkeypatch):
+    """鍵ローテーション時は強制再取得で新しい kid を解決する"""
+    monkeypatch.setattr(settings, "JWKS_MIN_REFETCH_INTERVAL_S", 0.0)
+    auth.get_current_user(_creds(_token(kid="k1")))
+    jwks_server["kid"] = "k2"
+
+    ctx = auth.get_current_user(_creds(_token(kid="k2")))
+
+    assert ctx.sub == "user_1"
+    assert jwks_server["fetches"] == 2
+
+
+@pytest.fixture
+def stub_jwks_server(monkeypatch):
+    """ローカルのスタブ JWKS サーバーを立て、CLERK_JWKS_URL を向ける"""
+    state = {"kid": "k1", "hits": 0, "status": 200, "body": None}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            state["hits"] += 1
+            body = state["body"] or json.dumps(_jwks(state["kid"])).encode()
+            self.send_response(state["status"])
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        settings, "CLERK_JWKS_URL", f"http://127.0.0.1:{server.server_port}/jwks.json"
+    )
+    auth.clear_auth_caches()
+    yield state
+    auth.clear_auth_caches()
+    server.shutdown()
+    server.server_close()
+
+
+def _expire_keyset() -> None:
+    auth._KEYSET = dataclasses.replace(auth._KEYSET, expires_at=time.monotonic() - 1)
+
+
+async def test_background_refresher_refreshes_before_expiry(stub_jwks_server, monkeypatch):
+    """期限前にバックグラウンドで再取得し、リクエスト経路では取得しない"""
+    monkeypatch.setattr(settings, "JWKS_TTL_S", 0.3)
+    monkeypatch.setattr(settings, "JWKS_REFRESH_AHEAD_S", 0.2)
+
+    auth.jwks_refresher.start()
+    try:
+        await asyncio.sleep(0.5)
+        assert auth.jwks_refresher.running
+        assert stub_jwks_server["hits"] >= 2
+        ctx = await asyncio.to_thread(auth.get_current_user, _creds(_token()))
+        assert ctx.sub == "user_1"
+    finally:
+        await auth.jwks_refresher.stop()
+    assert not auth.jwks_refresher.running
+
+
+async def test_background_refresher_survives_malformed_jwks(stub_jwks_server, monkeypatch):
+    """JSON オブジェクトでない応答でもバックグラウンド更新は止まらず、間隔を空けて再試行する"""
+    monkeypatch.setattr(settings, "JWKS_MIN_REFETCH_INTERVAL_S", 0.05)
+    stub_jwks_server["body"] = b"[]"
+
+    auth.jwks_refresher.start()
+    try:
+        await asyncio.sleep(0.3)
+        assert auth.jwks_refresher.running
+        assert 2 <= stub_jwks_server["hits"] <= 10
+        assert auth._KEYSET is None
+    finally:
+        await auth.jwks_refresher.stop()
+
+
+def test_stale_keys_are_served_when_refresh_fails(stub_jwks_server):
+    """再取得に失敗しても期限切れの鍵で検証を続ける"""
+    auth.get_current_user(_creds(_token(sub="a")))
+    _expire_keyset()
+    auth._LAST_FETCH_AT = float("-inf")
+    stub_jwks_server["status"] = 500
+
+    ctx = auth.get_current_user(_creds(_token(sub="b")))
+
+    assert ctx.sub == "b"
+    assert stub_jwks_server["hits"] == 2
+
+
+def test_stale_keys_are_served_while_refresher_runs(stub_jwks_server, monkeypatch):
+    """バックグラウンド更新が動いている間はリクエストから取得しない"""
+    auth.get_current_user(_creds(_token(sub="a")))
+    _expire_keyset()
+    monkeypatch.setattr(auth.JwksRefresher, "running", property(lambda self: True))
+
+    ctx = auth.get_current_user(_creds(_token(sub="b")))
+
+    assert ctx.sub == "b"
+    assert stub_jwks_server["hits"] == 1
+
+
+def test_unknown_kid_flood_is_rate_limited(stub_jwks_server):
+    """未知の kid が大量に来ても Clerk への再取得は間隔内で 1 回まで"""
+    auth.get_current_user(_creds(_token()))
+    auth._LAST_FETCH_AT = float("-inf")
+
+    for i in range(20):
+        with pytest.raises(HTTPException) as exc:
+            auth.get_current_user(_creds(_token(kid=f"bogus-{i}")))
+        assert exc.value.status_code == 401
+
+    assert stub_jwks_server["hits"] == 2
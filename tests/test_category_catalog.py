@@ -0,0 +1,85 @@
+"""デフォルトカテゴリのカタログのテスト"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.domain.category.category_entity import Category
+from app.domain.category.category_value_objects import CategoryName
+from app.domain.transaction.transaction_value_objects import TransactionType
+from app.infrastructure.category.category_catalog import CategoryCatalog
+from app.infrastructure.category.category_dto import CategoryDTO
+from app.infrastructure.category.category_repository import CategoryRepositoryImpl
+
+
+def _category(name: str, day: int, user_id: str | None = None) -> Category:
+    created_at = datetime(2030, 1, day)
+    return Category(
+        name=CategoryName(name),
+        type=TransactionType.EXPENSE,
+        user_id=user_id,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+@pytest.fixture
+def categories(db_session):
+    user_id = f"user_{uuid4().hex}"
+    rows = [
+        _category("Default old", 1),
+        _category("Default new", 3),
+        _category("Mine", 2, user_id),
+        _category("Someone else's", 4, f"user_{uuid4().hex}"),
+    ]
+    db_session.add_all([CategoryDTO.from_entity(c) for c in rows])
+    db_session.commit()
+    db_session.expire_all()
+    return user_id, rows
+
+
+@pytest.fixture
+def statements(db_session):
+    """実行された SQL を記録する"""
+    executed: list[str] = []
+
+    def record(*args):
+        executed.append(args[2])
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_defaults_are_served_from_memory_and_merged_in_order(db_session, categories, statements):
+    """デフォルトは一度だけ読み込み、ユーザー固有のカテゴリと作成日時の新しい順に並べる"""
+    user_id, (old, new, mine, _) = categories
+    repo = CategoryRepositoryImpl(db_session, CategoryCatalog(ttl=60))
+
+    first = repo.find_all_accessible_by_user(user_id)
+    second = repo.find_all_accessible_by_user(user_id)
+
+    ids = [c.id for c in first]
+    assert ids.index(new.id) < ids.index(mine.id) < ids.index(old.id)
+    assert [c.created_at for c in first] == sorted((c.created_at for c in first), reverse=True)
+    assert [c.id for c in second] == ids
+    # 1 回目: デフォルト + ユーザー固有、2 回目: ユーザー固有のみ
+    assert len(statements) == 3
+
+
+def test_names_and_ttl_reload(db_session, categories):
+    """カテゴリ名は既知のものをメモリから、それ以外は ID で引き、TTL が切れたら再読み込みする"""
+    _, (old, _, mine, _) = categories
+    catalog = CategoryCatalog(ttl=60)
+
+    names = catalog.names(db_session, {old.id, mine.id, None})
+    assert names[old.id] == "Default old"
+    assert names[mine.id] == "Mine"
+
+    snapshot = catalog.defaults(db_session)
+    assert catalog.defaults(db_session) is snapshot
+    expired = CategoryCatalog(ttl=0)
+    assert expired.defaults(db_session) is not expired.defaults(db_session)
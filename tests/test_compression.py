@@ -0,0 +1,97 @@
+"""CompressionMiddleware のテスト"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.logging import RequestLoggingMiddleware
+
+_ITEMS = [{"id": i, "description": f"明細 {i}", "amount": 1000 + i} for i in range(200)]
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"transactions": _ITEMS}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    async def image():
+        return PlainTextResponse("x" * 4096, media_type="image/svg+xml")
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(3):
+                yield f'{{"row": {i}}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/missing")
+    async def missing():
+        return PlainTextResponse("x" * 4096, status_code=404, media_type="application/json")
+
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=512,
+        content_types=["application/json", "application/x-ndjson"],
+    )
+    return TestClient(app)
+
+
+def test_prefers_brotli_and_falls_back_to_gzip():
+    """br を優先し、gzip のみ受け付けるクライアントには gzip で返す"""
+    client = _client()
+
+    br = client.get("/items", headers={"Accept-Encoding": "gzip, br"})
+    gz = client.get("/items", headers={"Accept-Encoding": "gzip, br;q=0"})
+    identity = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert br.headers["content-encoding"] == "br"
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert br.json() == gz.json() == identity.json()
+    assert br.headers["vary"] == "Accept-Encoding"
+    assert int(br.headers["content-length"]) < len(identity.content)
+
+
+def test_small_and_unlisted_responses_are_not_compressed():
+    """閾値未満の本文と対象外の Content-Type はそのまま返す"""
+    client = _client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in image.headers
+
+
+def test_streaming_response_is_compressed_per_chunk():
+    """ストリーミングは Content-Length なしで圧縮し、行はすべて届く"""
+    res = _client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert res.headers["content-encoding"] == "gzip"
+    assert "content-length" not in res.headers
+    assert res.text.splitlines() == ['{"row": 0}', '{"row": 1}', '{"row": 2}']
+
+
+def test_access_log_sees_uncompressed_body(caplog):
+    """ログのプレビューとサイズは圧縮前の本文から取る"""
+    caplog.set_level(logging.INFO, logger="app.middleware")
+
+    res = _client().get("/missing", headers={"Accept-Encoding": "gzip"})
+
+    assert res.headers["content-encoding"] == "gzip"
+    (record,) = [r for r in caplog.records if r.name == "app.middleware"]
+    assert record.resp_len == 4096
+    assert record.resp_body_preview.startswith("xxxx")
@@ -0,0 +1,89 @@
+"""ETag による条件付き GET のテスト"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.auth import AuthContext, get_current_user
+from app.domain.category.category_entity import Category
+from app.domain.category.category_value_objects import CategoryName
+from app.domain.transaction.transaction_value_objects import TransactionType
+from app.infrastructure.category.category_dto import CategoryDTO
+from app.main import app
+
+
+@pytest.fixture
+def user_id(client):
+    user_id = f"user_{uuid4().hex}"
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+    return user_id
+
+
+def _create(client, amount: int) -> None:
+    res = client.post(
+        "/transactions",
+        json={"type": "expense", "amount": amount, "occurred_at": "2025-01-05T00:00:00"},
+    )
+    assert res.status_code == 201
+
+
+@pytest.mark.parametrize("path", ["/transactions", "/categories", "/dashboard/summary"])
+def test_unchanged_data_is_answered_with_304(client, user_id, path):
+    """データが変わっていなければ 304 を返し、書き込み後は新しい ETag で 200 を返す"""
+    _create(client, 100)
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert first.headers["last-modified"].endswith("GMT")
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    _create(client, 200)
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etag_differs_between_users_and_queries(client, user_id):
+    """ユーザーやクエリが違えば同じ版でも ETag は一致しない"""
+    etag = client.get("/transactions").headers["etag"]
+
+    assert client.get("/transactions?limit=10").headers["etag"] != etag
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub="someone", claims={})
+    assert client.get("/transactions", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_category_etag_follows_category_changes(client, user_id, db_session):
+    """取引の書き込みがなくても、カテゴリが変われば /categories の ETag は変わる"""
+    etag = client.get("/categories").headers["etag"]
+    db_session.add(
+        CategoryDTO.from_entity(
+            Category(name=CategoryName("Pets"), type=TransactionType.EXPENSE, user_id=user_id)
+        )
+    )
+    db_session.flush()
+
+    res = client.get("/categories", headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+    assert "Pets" in [c["name"] for c in res.json()["categories"]]
+
+
+def test_dashboard_etag_ignores_writes_outside_the_aggregate(client, user_id):
+    """集計に影響しない更新では /transactions だけが変わり、ダッシュボードは 304 のまま"""
+    body = {"type": "expense", "amount": 100, "occurred_at": "2025-01-05", "description": "a"}
+    tx_id = client.post("/transactions", json=body).json()["id"]
+    summary = "/dashboard/summary?from=2025-01-01&to=2025-01-31"
+    dashboard_etag = client.get(summary).headers["etag"]
+    list_etag = client.get("/transactions").headers["etag"]
+
+    assert client.put(f"/transactions/{tx_id}", json={**body, "description": "b"}).is_success
+
+    assert client.get(summary, headers={"If-None-Match": dashboard_etag}).status_code == 304
+    assert client.get("/transactions", headers={"If-None-Match": list_etag}).status_code == 200
+    assert client.put(f"/transactions/{tx_id}", json={**body, "amount": 200}).is_success
+    assert client.get(summary, headers={"If-None-Match": dashboard_etag}).status_code == 200
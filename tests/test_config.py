@@ -135,3 +135,17 @@ def test_non_production_env_reads_env_file():
         # 開発環境では.envファイルが読み込まれるため、
         # model_configのenv_fileが".env"であることを確認
         assert config.Settings.model_config.get("env_file") == ".env"
+
+
+def test_jwks_refresh_ahead_must_be_shorter_than_ttl():
+    """JWKS_REFRESH_AHEAD_S が JWKS_TTL_S 以上の設定は起動時に拒否する"""
+    from pydantic import ValidationError
+
+    from app.core.config import Settings, settings
+
+    with pytest.raises(ValidationError, match="JWKS_REFRESH_AHEAD_S"):
+        Settings(
+            **settings.model_dump(exclude={"JWKS_TTL_S", "JWKS_REFRESH_AHEAD_S"}),
+            JWKS_TTL_S=60,
+            JWKS_REFRESH_AHEAD_S=60,
+        )
@@ -0,0 +1,112 @@
+"""ダッシュボード集計キャッシュのテスト"""
+
+from datetime import date
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.domain.dashboard.dashboard_entity import (
+    DashboardCategoryBreakdown,
+    DashboardPeriod,
+    DashboardSummary,
+    DashboardTotal,
+)
+from app.domain.transaction.transaction_value_objects import CategorySummary
+from app.infrastructure.dasoboard.dashboard_cache import (
+    InMemoryDashboardSummaryCache,
+    SharedCacheBackend,
+    SharedDashboardSummaryCache,
+)
+
+JAN = (date(2025, 1, 1), date(2025, 1, 31))
+FEB = (date(2025, 2, 1), date(2025, 2, 28))
+FOOD_ID = uuid4()
+
+
+def _summary(from_: date, to: date) -> DashboardSummary:
+    return DashboardSummary(
+        period=DashboardPeriod(from_=from_, to=to),
+        total=DashboardTotal(expense=300, income=1000, net=700, averate_daily_expense=10.0),
+        by_category=[
+            DashboardCategoryBreakdown(
+                category=CategorySummary(id=FOOD_ID, name="Food"), amount=300, ratio=1.0
+            )
+        ],
+    )
+
+
+class _DictBackend(SharedCacheBackend):
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def cache(request):
+    if request.param == "memory":
+        return InMemoryDashboardSummaryCache(maxsize=16, ttl=60)
+    return SharedDashboardSummaryCache(_DictBackend(), ttl=60)
+
+
+def test_hit_and_miss_are_counted(cache):
+    """ヒット／ミスがカウントされ、保存した集計がそのまま返ることを確認"""
+    assert cache.get("u1", *JAN, 1) is None
+    cache.set("u1", *JAN, 1, _summary(*JAN))
+
+    cached = cache.get("u1", *JAN, 1)
+
+    assert cached.total == _summary(*JAN).total
+    assert cached.by_category[0].category.name == "Food"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_invalidate_only_overlapping_periods(cache):
+    """変更日を含む期間のキャッシュだけが無効化されることを確認"""
+    cache.set("u1", *JAN, 1, _summary(*JAN))
+    cache.set("u1", *FEB, 1, _summary(*FEB))
+    cache.set("u2", *JAN, 1, _summary(*JAN))
+
+    cache.invalidate("u1", date(2025, 1, 15))
+
+    assert cache.get("u1", *JAN, 1) is None
+    assert cache.get("u1", *FEB, 1) is not None
+    assert cache.get("u2", *JAN, 1) is not None
+
+
+def test_in_memory_cache_is_bounded():
+    """LRU の上限を超えると古いエントリから追い出されることを確認"""
+    cache = InMemoryDashboardSummaryCache(maxsize=2, ttl=60)
+    for month in (1, 2, 3):
+        period = (date(2025, month, 1), date(2025, month, 28))
+        cache.set("u1", *period, 1, _summary(*period))
+
+    assert cache.stats()["size"] == 2
+    assert cache.get("u1", date(2025, 1, 1), date(2025, 1, 28), 1) is None
+
+
+def test_cached_summary_equals_the_stored_one(cache):
+    """どのバックエンドでも、保存した集計と同じ値 (カテゴリ ID は UUID) が返る"""
+    cache.set("u1", *JAN, 1, _summary(*JAN))
+
+    cached = cache.get("u1", *JAN, 1)
+
+    assert cached == _summary(*JAN)
+    assert isinstance(cached.by_category[0].category.id, UUID)
+
+
+def test_entry_is_only_served_for_its_data_version(cache):
+    """コミット前 (古い版) に保存された集計は、新しい版では返さない"""
+    cache.set("u1", *JAN, 1, _summary(*JAN))
+
+    assert cache.get("u1", *JAN, 2) is None
+    assert cache.get("u1", *JAN, 1) is not None
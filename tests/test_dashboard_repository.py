@@ -0,0 +1,123 @@
+"""ダッシュボード集計リポジトリのテスト"""
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.domain.category.category_entity import Category
+from app.domain.category.category_value_objects import CategoryName
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_value_objects import Amount, TransactionType
+from app.infrastructure.category.category_dto import CategoryDTO
+from app.infrastructure.dasoboard.daily_total_dto import (
+    UNCATEGORIZED_ID,
+    DailyUserCategoryTotalDTO,
+)
+from app.infrastructure.dasoboard.daily_total_rollup import backfill_daily_totals
+from app.infrastructure.dasoboard.dashboard_repository import (
+    DashboardSuammaryRepositoryImpl,
+    _conditional_sum,
+)
+from app.infrastructure.transaction.transaction_repository import TransactionRepositoryImpl
+
+
+@pytest.fixture
+def seeded(db_session, sample_user_id):
+    """カテゴリ付き・なしの収支を登録する"""
+    user_id = str(sample_user_id)
+    food = Category(name=CategoryName("Food"), type=TransactionType.EXPENSE)
+    rent = Category(name=CategoryName("Rent"), type=TransactionType.EXPENSE)
+    db_session.add_all([CategoryDTO.from_entity(food), CategoryDTO.from_entity(rent)])
+
+    repo = TransactionRepositoryImpl(db_session)
+    for type_, amount, day, category in [
+        (TransactionType.EXPENSE, 300, 1, food),
+        (TransactionType.EXPENSE, 200, 2, food),
+        (TransactionType.EXPENSE, 500, 3, rent),
+        (TransactionType.EXPENSE, 700, 4, None),
+        (TransactionType.INCOME, 5000, 5, None),
+        (TransactionType.EXPENSE, 999, 28, food),  # 集計期間外
+    ]:
+        repo.add(
+            Transaction.create(
+                user_id=user_id,
+                account_id=None,
+                type=type_,
+                amount=amount,
+                occurred_at=date(2025, 2, day),
+                category_id=category.id if category else None,
+            )
+        )
+    db_session.flush()
+    return user_id
+
+
+def test_aggregate_totals_and_breakdown(db_session, seeded):
+    """1クエリで期間内の収支合計と、名前のあるカテゴリごとの支出内訳を返す"""
+    repo = DashboardSuammaryRepositoryImpl(db_session)
+
+    aggregate = repo.get_aggregate(seeded, date(2025, 2, 1), date(2025, 2, 10))
+
+    assert (aggregate.expense, aggregate.income) == (1700, 5000)
+    # カテゴリなしの 700 は合計には含むが内訳には出さない
+    assert {(b.category.name, b.amount, b.ratio) for b in aggregate.by_category} == {
+        ("Food", 500, 0.5),
+        ("Rent", 500, 0.5),
+    }
+
+
+def test_conditional_sum_per_dialect():
+    """PostgreSQL では FILTER 句、それ以外では CASE 式で条件付き合計を組み立てる"""
+    pg = _conditional_sum(TransactionType.EXPENSE, "postgresql")
+    fallback = _conditional_sum(TransactionType.EXPENSE, "sqlite")
+
+    assert "FILTER (WHERE" in str(pg.compile(dialect=postgresql.dialect()))
+    assert "CASE WHEN" in str(fallback.compile(dialect=sqlite.dialect()))
+
+
+def test_aggregate_for_unknown_user_is_empty(db_session):
+    repo = DashboardSuammaryRepositoryImpl(db_session)
+
+    aggregate = repo.get_aggregate(str(uuid4()), date(2025, 1, 1), date(2025, 12, 31))
+
+    assert (aggregate.expense, aggregate.income, aggregate.by_category) == (0, 0, [])
+
+
+def _rollup(db_session, user_id):
+    rows = db_session.execute(
+        select(DailyUserCategoryTotalDTO).where(DailyUserCategoryTotalDTO.user_id == user_id)
+    ).scalars()
+    return {(r.day, r.type, r.category_id): (r.amount, r.tx_count) for r in rows}
+
+
+def test_rollup_follows_writes_and_matches_backfill(db_session, seeded):
+    """追加・更新・削除で集計テーブルが更新され、再構築結果と一致することを確認"""
+    repo = TransactionRepositoryImpl(db_session)
+    tx = Transaction.create(
+        user_id=seeded,
+        account_id=None,
+        type=TransactionType.EXPENSE,
+        amount=40,
+        occurred_at=date(2025, 2, 1),
+    )
+    repo.add(tx)
+    db_session.flush()
+
+    tx.amount = Amount(60)
+    tx.occurred_at = date(2025, 2, 3)
+    repo.update(tx)
+    db_session.flush()
+    assert _rollup(db_session, seeded)[(date(2025, 2, 3), "expense", UNCATEGORIZED_ID)] == (60, 1)
+
+    repo.remove(tx.id, seeded)
+    db_session.flush()
+
+    # 0 件になった行は残さない
+    incremental = _rollup(db_session, seeded)
+    assert (date(2025, 2, 1), "expense", UNCATEGORIZED_ID) not in incremental
+    assert (date(2025, 2, 3), "expense", UNCATEGORIZED_ID) not in incremental
+    backfill_daily_totals(db_session, seeded)
+    assert _rollup(db_session, seeded) == incremental
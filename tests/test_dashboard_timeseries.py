@@ -0,0 +1,71 @@
+"""ダッシュボード時系列 (GET /dashboard/timeseries) のテスト"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.auth import AuthContext, get_current_user
+from app.main import app
+
+
+@pytest.fixture
+def history(client):
+    """期間前の収入と、期間内の週・月をまたぐ収支を登録する"""
+    user_id = f"user_{uuid4().hex}"
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+    for type_, amount, occurred_at in [
+        ("income", 10000, "2024-12-25"),  # 期間前 (開始残高に含める)
+        ("expense", 300, "2025-01-06"),  # 月曜日
+        ("expense", 200, "2025-01-12"),  # 同じ週の日曜日
+        ("income", 5000, "2025-01-31"),
+        ("expense", 700, "2025-02-03"),
+        ("expense", 999, "2025-03-01"),  # 期間後
+    ]:
+        body = {"type": type_, "amount": amount, "occurred_at": occurred_at}
+        assert client.post("/transactions", json=body).status_code == 201
+    return user_id
+
+
+def test_monthly_series_is_columnar_with_running_balance(client, history):
+    """月次の収支と累積残高を列ごとの配列で返し、開始残高から積み上げる"""
+    res = client.get("/dashboard/timeseries?from=2025-01-01&to=2025-02-28&granularity=month")
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["opening_balance"] == 10000
+    assert body["periods"] == ["2025-01-01", "2025-02-01"]
+    assert body["income"] == [5000, 0]
+    assert body["expense"] == [500, 700]
+    assert body["net"] == [4500, -700]
+    assert body["balance"] == [14500, 13800]
+
+
+def test_weekly_series_fills_empty_weeks(client, history):
+    """週は月曜日始まりで集計し、取引のない週も 0 で埋めて残高を引き継ぐ"""
+    body = client.get("/dashboard/timeseries?from=2025-01-08&to=2025-02-03&granularity=week").json()
+
+    assert body["periods"] == [
+        "2025-01-06",
+        "2025-01-13",
+        "2025-01-20",
+        "2025-01-27",
+        "2025-02-03",
+    ]
+    # 1/6 の支出は開始日 (1/8) より前なので開始残高に含まれる
+    assert body["opening_balance"] == 9700
+    assert body["expense"] == [200, 0, 0, 0, 700]
+    assert body["balance"] == [9500, 9500, 9500, 14500, 13800]
+
+    assert client.get("/dashboard/timeseries?from=2025-02-01&to=2025-01-01").status_code == 400
+
+
+def test_huge_ranges_are_rejected_without_enumerating(client, history):
+    """上限を超える期間はバケットを作らずに 400 を返し、date.max 付近でも 500 にならない"""
+    res = client.get("/dashboard/timeseries?from=0001-01-01&to=9999-12-01&granularity=day")
+    assert res.status_code == 400
+
+    res = client.get("/dashboard/timeseries?from=9999-12-01&to=9999-12-31&granularity=week")
+    assert res.status_code == 200
+    assert res.json()["periods"][-1] == "9999-12-27"
+    res = client.get("/dashboard/timeseries?from=9999-11-15&to=9999-12-31&granularity=month")
+    assert res.json()["periods"] == ["9999-11-01", "9999-12-01"]
@@ -0,0 +1,63 @@
+"""接続プールの設定とチェックアウト待ちの計測のテスト"""
+
+import logging
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import Database, TimedQueuePool, _engine_options
+
+
+def _timeouts() -> float:
+    return REGISTRY.get_sample_value("db_pool_checkout_timeouts_total", {"pool": "sync"}) or 0.0
+
+
+def test_checkout_timeout_is_counted_and_logged(caplog, tmp_path):
+    """pool_timeout を超えたチェックアウトは件数を数え、プールの状態を記録する"""
+    database = Database(f"sqlite:///{tmp_path / 'pool.db'}", size=1, max_overflow=0, timeout=0.1)
+    before = _timeouts()
+
+    with database.engine.connect(), pytest.raises(PoolTimeoutError):
+        database.engine.connect()
+
+    assert _timeouts() == before + 1
+    (record,) = [r for r in caplog.records if r.name == "app.core.database"]
+    assert record.levelno == logging.ERROR
+    assert "Pool size: 1" in record.getMessage()
+    database.dispose()
+
+
+def test_slow_checkout_warns(caplog, tmp_path, monkeypatch):
+    """待ち時間が pool_timeout の一定割合を超えたら警告する"""
+    monkeypatch.setattr(settings, "DB_POOL_WAIT_WARN_RATIO", 0.05)
+    database = Database(f"sqlite:///{tmp_path / 'pool.db'}", size=1, max_overflow=0, timeout=5)
+    held = database.engine.connect()
+    threading.Timer(0.5, held.close).start()
+
+    with database.engine.connect():
+        pass
+
+    (record,) = [r for r in caplog.records if r.name == "app.core.database"]
+    assert record.levelno == logging.WARNING
+    assert record.wait_s >= 0.25
+    database.dispose()
+
+
+def test_engine_options_from_settings():
+    """NullPool 指定時はプール設定を渡さず、statement_timeout は PostgreSQL のみに付ける"""
+    url = "postgresql+psycopg://u:p@localhost/db"
+
+    pooled = _engine_options(url, {"size": 20, "statement_timeout_ms": 5000}, TimedQueuePool)
+    null = _engine_options(url, {"null_pool": True, "size": 20}, TimedQueuePool)
+    sqlite = _engine_options("sqlite://", {"statement_timeout_ms": 5000}, TimedQueuePool)
+
+    assert pooled["poolclass"] is TimedQueuePool
+    assert pooled["pool_size"] == 20
+    assert pooled["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert null["poolclass"] is NullPool
+    assert "pool_size" not in null
+    assert "connect_args" not in sqlite
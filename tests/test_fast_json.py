@@ -0,0 +1,90 @@
+"""orjson による高速レスポンスが response_model と同じ JSON を返すことのテスト"""
+
+from datetime import UTC, date, datetime
+from uuid import uuid4
+
+from app.domain.category.category_entity import Category
+from app.domain.category.category_value_objects import CategoryName
+from app.domain.dashboard.dashboard_entity import (
+    DashboardCategoryBreakdown,
+    DashboardPeriod,
+    DashboardSummary,
+    DashboardTotal,
+)
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_query import TransactionCursor, TransactionPage
+from app.domain.transaction.transaction_value_objects import (
+    Amount,
+    CategorySummary,
+    TransactionType,
+)
+from app.presentation.schemas.responses.category import GetCategoryListResponseSchema
+from app.presentation.schemas.responses.dasuboard import GetDashboardSummaryResponseSchema
+from app.presentation.schemas.responses.fast_json import FastJSONResponse
+from app.presentation.schemas.responses.transaction import GetTransactionListResponseSchema
+
+
+def _fast(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def _slow(schema) -> bytes:
+    # FastAPI の既定経路 (response_model で検証して JSON 化) と同じ出力
+    return schema.model_dump_json(by_alias=True).encode()
+
+
+def test_transaction_page_matches_schema():
+    """取引一覧 (カテゴリあり・なし、カーソル付き)"""
+    category_id = uuid4()
+    items = [
+        Transaction(
+            user_id="u",
+            account_id=None,
+            type=TransactionType.EXPENSE,
+            amount=Amount(1200),
+            occurred_at=date(2025, 1, 2),
+            category=CategorySummary(id=category_id, name="食費"),
+            description="ランチ",
+            created_at=datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+            updated_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC),
+        ),
+        Transaction.create("u", None, TransactionType.INCOME, 300000, date(2025, 1, 1)),
+    ]
+    page = TransactionPage(
+        items=items,
+        next_cursor=TransactionCursor.of(items[-1]),
+        prev_cursor=None,
+    )
+
+    assert _fast(GetTransactionListResponseSchema.dump_page(page)) == _slow(
+        GetTransactionListResponseSchema.from_page(page)
+    )
+
+
+def test_category_list_matches_schema():
+    """カテゴリ一覧 (除外フィールドは出力しない)"""
+    categories = [
+        Category(name=CategoryName("食費"), type=TransactionType.EXPENSE, user_id="u"),
+        Category(name=CategoryName("給与"), type=TransactionType.INCOME, description="月給"),
+    ]
+
+    assert _fast(GetCategoryListResponseSchema.dump_entities(categories)) == _slow(
+        GetCategoryListResponseSchema.from_entities(categories)
+    )
+
+
+def test_dashboard_summary_matches_schema():
+    """ダッシュボード集計 (整数の平均値も float として出力する)"""
+    summary = DashboardSummary(
+        period=DashboardPeriod(from_=date(2025, 1, 1), to=date(2025, 1, 31)),
+        total=DashboardTotal(expense=3100, income=0, net=-3100, averate_daily_expense=100),
+        by_category=[
+            DashboardCategoryBreakdown(
+                category=CategorySummary(id=uuid4(), name="食費"), amount=3100, ratio=1
+            )
+        ],
+    )
+
+    assert _fast(GetDashboardSummaryResponseSchema.dump_entity(summary)) == _slow(
+        GetDashboardSummaryResponseSchema.from_entity(summary)
+    )
@@ -0,0 +1,91 @@
+"""Idempotency-Key 付きの取引作成 (POST /transactions) のテスト"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.auth import AuthContext, get_current_user
+from app.domain.idempotency.idempotency_record import IdempotencyRecord
+from app.infrastructure.idempotency.idempotency_dto import IdempotencyKeyDTO
+from app.infrastructure.idempotency.idempotency_store import (
+    InMemoryIdempotencyStore,
+    purge_expired_idempotency_keys,
+)
+from app.infrastructure.transaction.transaction_dto import TransactionDTO
+from app.main import app
+
+BODY = {"type": "expense", "amount": 1200, "occurred_at": "2025-01-05", "description": "ランチ"}
+
+
+@pytest.fixture
+def user_id(client):
+    user_id = f"user_{uuid4().hex}"
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+    return user_id
+
+
+def _count(db_session, user_id: str) -> int:
+    db_session.flush()
+    return db_session.scalar(
+        select(func.count()).select_from(TransactionDTO).where(TransactionDTO.user_id == user_id)
+    )
+
+
+def test_retry_returns_original_response_without_second_insert(client, user_id, db_session):
+    """同じキーの再送は最初の 201 を返し、取引は 1 件だけ作られる"""
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = client.post("/transactions", json=BODY, headers=headers)
+    retry = client.post("/transactions", json=BODY, headers=headers)
+    other = client.post("/transactions", json=BODY)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert other.json()["id"] != first.json()["id"]
+    assert _count(db_session, user_id) == 2
+
+
+def test_key_reused_with_different_body_is_rejected(client, user_id, db_session):
+    """別の内容で同じキーを使うと 422 を返す"""
+    headers = {"Idempotency-Key": "retry-2"}
+
+    client.post("/transactions", json=BODY, headers=headers)
+    res = client.post("/transactions", json={**BODY, "amount": 999}, headers=headers)
+
+    assert res.status_code == 422
+    assert _count(db_session, user_id) == 1
+
+
+def test_expired_keys_are_reused_and_purged(client, user_id, db_session):
+    """期限切れのキーは新しいリクエストで上書きでき、掃除で削除される"""
+    headers = {"Idempotency-Key": "retry-3"}
+    first = client.post("/transactions", json=BODY, headers=headers).json()
+    db_session.get(IdempotencyKeyDTO, (user_id, "retry-3")).expires_at = datetime.now(
+        UTC
+    ) - timedelta(seconds=1)
+    db_session.flush()
+
+    second = client.post("/transactions", json={**BODY, "amount": 999}, headers=headers)
+    assert second.status_code == 201
+    assert second.json()["id"] != first["id"]
+
+    later = datetime.now(UTC) + timedelta(days=2)
+    assert purge_expired_idempotency_keys(db_session, now=later) >= 1
+    assert db_session.get(IdempotencyKeyDTO, (user_id, "retry-3")) is None
+
+
+def test_in_memory_store_claims_once_and_releases():
+    """メモリ実装は最初の claim だけを受け付け、release 後は再度受け付ける"""
+    store = InMemoryIdempotencyStore(maxsize=2, ttl=60)
+    record = IdempotencyRecord(
+        user_id="u", key="k", request_hash="h", resource_id=uuid4(), created_at=datetime.now(UTC)
+    )
+
+    assert store.claim(record) is None
+    assert store.claim(record) == record
+    store.release("u", "k")
+    assert store.claim(record) is None
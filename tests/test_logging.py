@@ -0,0 +1,100 @@
+"""JSON ロガー (非同期キュー・サンプリング・整形) のテスト"""
+
+import json
+import logging
+import sys
+from logging.handlers import QueueListener
+
+from app.core.logging import DroppingQueueHandler, JsonFormatter, LogSamplingFilter
+
+
+def _record(name: str = "app.test", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.makeLogRecord(
+        {"name": name, "levelno": level, "levelname": logging.getLevelName(level), "msg": "hello"}
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+class _Collect(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_formatter_encodes_extras_once_with_fallback():
+    """extra はそのまま出力し、シリアライズできない値は文字列にする"""
+    out = json.loads(
+        JsonFormatter().format(_record(status=200, path_params={"id": 1}, error=ValueError("x")))
+    )
+
+    assert out["msg"] == "hello"
+    assert out["status"] == 200
+    assert out["path_params"] == {"id": 1}
+    assert out["error"] == "x"
+    assert "args" not in out
+
+
+def test_queue_handler_drops_when_full_and_reports():
+    """キューが溢れたら破棄して件数を数え、空きができたら警告を出す"""
+    handler = DroppingQueueHandler(maxsize=2)
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.dropped == 3
+
+    collected = _Collect()
+    listener = QueueListener(handler.queue, collected)
+    listener.start()
+    listener.stop()
+    handler.handle(_record())
+    listener.start()
+    listener.stop()
+
+    messages = [r.getMessage() for r in collected.records]
+    assert messages[:2] == ["hello", "hello"]
+    assert "Dropped 3 log records" in messages[2]
+    assert messages[3] == "hello"
+    assert collected.records[2].levelno == logging.WARNING
+
+
+def test_queue_handler_drops_before_rendering(monkeypatch):
+    """キューが溢れているときはメッセージを整形せずに破棄する"""
+    handler = DroppingQueueHandler(maxsize=1)
+    handler.handle(_record())
+    prepared = []
+    monkeypatch.setattr(handler, "prepare", prepared.append)
+
+    handler.handle(_record())
+
+    assert prepared == []
+    assert handler.dropped == 1
+
+
+def test_queue_handler_renders_message_and_traceback_on_caller_thread():
+    """引数とトレースバックは enqueue 前に確定させる"""
+    handler = DroppingQueueHandler(maxsize=10)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.getLogger("app.test").makeRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed %s", ("job",), sys.exc_info()
+        )
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "failed job"
+    assert queued.exc_info is None
+    assert "RuntimeError: boom" in json.loads(JsonFormatter().format(queued))["exc_info"]
+
+
+def test_sampling_filter_uses_longest_prefix_and_keeps_warnings():
+    """ロガー名のプレフィックスごとに INFO 以下を間引く"""
+    sampling = LogSamplingFilter({"sqlalchemy": 1.0, "sqlalchemy.engine": 0.0})
+
+    assert not sampling.filter(_record("sqlalchemy.engine.Engine"))
+    assert sampling.filter(_record("sqlalchemy.pool"))
+    assert sampling.filter(_record("sqlalchemy.engine.Engine", logging.WARNING))
+    assert sampling.filter(_record("app.middleware"))
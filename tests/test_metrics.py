@@ -0,0 +1,71 @@
+"""Prometheus メトリクスのテスト"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.middleware.metrics import MetricsMiddleware
+from app.presentation.routes import metrics_router
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+    return TestClient(app)
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route_template():
+    """パスパラメータではなくルートのテンプレートで集計する"""
+    route = "/items/{item_id}"
+    before = _sample("http_requests_total", method="GET", route=route, status="200")
+    client = _client()
+
+    for item_id in (1, 2, 3):
+        client.get(f"/items/{item_id}")
+    client.get("/items/x")
+    client.get("/missing")
+
+    assert _sample("http_requests_total", method="GET", route=route, status="200") == before + 3
+    assert _sample("http_requests_total", method="GET", route=route, status="422") >= 1
+    assert _sample("http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+    assert _sample("http_request_duration_seconds_count", method="GET", route=route) >= 3
+    assert _sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_unknown_methods_share_one_label():
+    """任意のメソッド名はラベルを増やさず OTHER にまとめる"""
+    before = _sample("http_requests_total", method="OTHER", route="<unmatched>", status="404")
+    client = _client()
+
+    for method in ("FOO", "BAR", "X-CUSTOM"):
+        client.request(method, "/missing")
+
+    assert (
+        _sample("http_requests_total", method="OTHER", route="<unmatched>", status="404")
+        == before + 3
+    )
+    assert _sample("http_requests_total", method="FOO", route="<unmatched>", status="404") == 0
+
+
+def test_metrics_endpoint_exposes_text_format():
+    """/metrics はテキスト形式で HTTP・DB プール・認証のメトリクスを返す"""
+    client = _client()
+    client.get("/items/1")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in res.text
+    assert "db_pool_checkout_wait_seconds" in res.text
+    assert "jwks_refreshes_total" in res.text
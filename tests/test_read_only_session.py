@@ -0,0 +1,33 @@
+"""参照専用セッションのテスト"""
+
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import Database
+from app.infrastructure.di.async_usecase import AsyncUseCase
+
+
+class _Count:
+    def __init__(self, session) -> None:
+        self.session = session
+
+    def execute(self) -> int:
+        return self.session.execute(text("SELECT 1")).scalar_one()
+
+
+def test_connection_is_released_when_use_case_returns(tmp_path):
+    """ユースケースが返った時点で接続をプールに戻し、コミットしない"""
+    database = Database(f"sqlite:///{tmp_path / 'read.db'}")
+    pool = database.engine.pool
+
+    with database.read_session() as session:
+        assert asyncio.run(AsyncUseCase(session, _Count).execute()) == 1
+        assert pool.checkedout() == 0
+        assert not session.in_transaction()
+
+    with database.session() as session:
+        asyncio.run(AsyncUseCase(session, _Count).execute())
+        # 書き込み用のセッションは依存関係の終了 (コミット) まで接続を保持する
+        assert pool.checkedout() == 1
+    database.dispose()
@@ -0,0 +1,94 @@
+"""参照用レプリカへの振り分けのテスト"""
+
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core import database
+from app.core.auth import AuthContext, get_current_user
+from app.core.database import Database, ReplicaSet
+from app.infrastructure.di.session import get_read_db, note_write
+from app.middleware import ReadYourWritesMiddleware
+
+
+def _replicas(size: int) -> ReplicaSet:
+    return ReplicaSet(size, read_your_writes_s=60, cooldown_s=60)
+
+
+def _request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_round_robin_and_read_your_writes():
+    """レプリカを順に使い、書き込んだ直後のユーザーは主系で読む"""
+    replicas = _replicas(2)
+
+    assert {replicas.pick("u1"), replicas.pick("u1")} == {0, 1}
+    replicas.note_write("u1")
+    assert replicas.pick("u1") is None
+    assert replicas.pick("u2") is not None
+
+
+def test_unhealthy_replica_is_skipped():
+    """接続に失敗したレプリカはクールダウン中は選ばない"""
+    replicas = _replicas(2)
+    replicas.mark_unhealthy(0)
+
+    assert {replicas.pick("u") for _ in range(4)} == {1}
+    replicas.mark_unhealthy(1)
+    assert replicas.pick("u") is None
+
+
+def test_read_session_falls_back_to_primary(monkeypatch, tmp_path, db_session):
+    """レプリカに接続できなければそのリクエストから主系のセッションを使う"""
+    broken = Database(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = _replicas(1)
+    monkeypatch.setattr(database, "replica_dbs", [broken])
+    monkeypatch.setattr(database, "replicas", replicas)
+
+    sessions = get_read_db(_request(), AuthContext(sub="u", claims={}), db_session)
+
+    assert next(sessions) is db_session
+    assert replicas.pick("u") is None
+    with pytest.raises(StopIteration):
+        next(sessions)
+    broken.dispose()
+
+
+def test_write_on_another_worker_is_honored_through_cookie():
+    """別のワーカーでの書き込みも、Cookie の書き込み時刻が新しければ主系で読む"""
+    replicas = _replicas(1)
+
+    assert replicas.pick("u", last_write_at=time.time() - 1) is None
+    assert replicas.pick("u", last_write_at=time.time() - 120) == 0
+    # 期限を大きく超えた未来の値は無視する
+    assert replicas.pick("u", last_write_at=time.time() + 3600) == 0
+
+
+def test_write_response_sets_last_write_cookie(monkeypatch, db_session):
+    """書き込んだリクエストの応答に Cookie を付け、次の参照はその Cookie で主系に向く"""
+    app = FastAPI()
+
+    @app.delete("/write", status_code=204)
+    def write(_: None = Depends(note_write)):
+        return Response(status_code=204)
+
+    @app.get("/read")
+    def read():
+        return {}
+
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub="u", claims={})
+    app.add_middleware(ReadYourWritesMiddleware, cookie_name="lw", max_age_s=5)
+    client = TestClient(app)
+
+    assert "set-cookie" not in client.get("/read").headers
+    assert client.delete("/write").headers["set-cookie"].startswith("lw=")
+
+    monkeypatch.setattr(database, "replicas", _replicas(1))
+    request = _request(f"{database.settings.REPLICA_LAST_WRITE_COOKIE}={time.time()}")
+    sessions = get_read_db(request, AuthContext(sub="u", claims={}), db_session)
+    assert next(sessions) is db_session
@@ -0,0 +1,98 @@
+"""RequestLoggingMiddleware のテスト"""
+
+import logging
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.query_stats import instrument_engine
+from app.middleware.logging import RequestLoggingMiddleware
+
+
+def _client(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    @app.post("/fail")
+    async def fail(payload: dict):
+        raise HTTPException(status_code=409, detail="conflict")
+
+    app.add_middleware(RequestLoggingMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def _records(caplog) -> list[logging.LogRecord]:
+    return [r for r in caplog.records if r.name == "app.middleware"]
+
+
+def test_request_id_is_echoed_and_success_log_is_compact(caplog):
+    """X-Request-ID を返し、成功時は本文やヘッダーを記録しない"""
+    caplog.set_level(logging.INFO, logger="app.middleware")
+
+    res = _client().post("/echo?token=secret", json={"a": 1}, headers={"X-Request-ID": "rid-1"})
+
+    assert res.headers["x-request-id"] == "rid-1"
+    assert res.headers["content-type"] == "application/json"
+    (record,) = _records(caplog)
+    assert record.status == 200
+    assert record.query == "token=%2A%2A%2A"
+    assert record.req_len == len(b'{"a":1}')
+    assert not hasattr(record, "req_body_preview")
+    assert not hasattr(record, "headers")
+
+
+def test_error_response_logs_bodies_and_redacted_headers(caplog):
+    """4xx では本文のプレビューと秘匿済みヘッダーを記録する"""
+    caplog.set_level(logging.INFO, logger="app.middleware")
+
+    res = _client().post("/fail", json={"a": 1}, headers={"Authorization": "Bearer t"})
+
+    assert res.status_code == 409
+    assert res.headers["x-request-id"]
+    (record,) = _records(caplog)
+    assert record.levelno == logging.WARNING
+    assert record.req_body_preview == '{"a": 1}'
+    assert "conflict" in record.resp_body_preview
+    assert record.headers["authorization"] == "***"
+
+
+def test_success_logs_are_sampled(caplog):
+    """サンプリング率 0 では成功ログを出さず、エラーは常に出す"""
+    caplog.set_level(logging.INFO, logger="app.middleware")
+    client = _client(success_sample_rate=0.0)
+
+    for _ in range(5):
+        client.post("/echo", json={})
+    client.post("/fail", json={})
+
+    assert [r.status for r in _records(caplog)] == [409]
+
+
+def test_query_stats_in_server_timing_and_log(caplog):
+    """実行した SQL の件数と時間を Server-Timing とアクセスログに出し、N+1 を警告する"""
+    caplog.set_level(logging.INFO, logger="app.middleware")
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        with engine.connect() as conn:
+            ids = [conn.execute(text("SELECT :id"), {"id": i}).scalar_one() for i in range(4)]
+            conn.execute(text("SELECT 1 WHERE 1 IN (:a, :b)"), {"a": 1, "b": 2})
+        return ids
+
+    app.add_middleware(RequestLoggingMiddleware, n_plus_one_threshold=3)
+    res = TestClient(app).get("/items")
+
+    assert res.headers["server-timing"].startswith("db;dur=")
+    assert res.headers["server-timing"].endswith('desc="5 queries"')
+    access, warning = _records(caplog)
+    assert "ran the same statement 4 times" in warning.getMessage()
+    assert warning.repeated_statements == [{"statement": "SELECT ?", "count": 4}]
+    assert access.db_queries == 5
+    assert access.db_time_ms >= 0
@@ -0,0 +1,74 @@
+"""取引のストリーミングエクスポート (GET /transactions/export) のテスト"""
+
+import csv
+import io
+import json
+from contextlib import contextmanager
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core.auth import AuthContext, get_current_user
+from app.core.database import get_db_session_factory
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_value_objects import TransactionType
+from app.infrastructure.transaction.transaction_repository import TransactionRepositoryImpl
+from app.main import app
+
+
+@pytest.fixture
+def user_id(client, db_session):
+    """1,200 件の取引を持つユーザー (チャンク境界をまたぐ件数)"""
+    user_id = f"user_{uuid4().hex}"
+    base = date(2024, 1, 1)
+    TransactionRepositoryImpl(db_session).add_many(
+        [
+            Transaction.create(
+                user_id=user_id,
+                account_id=None,
+                type=TransactionType.EXPENSE if i % 2 else TransactionType.INCOME,
+                amount=100 + i,
+                occurred_at=base + timedelta(days=i % 365),
+                description=f"明細, {i}",
+            )
+            for i in range(1200)
+        ]
+    )
+    db_session.flush()
+
+    @contextmanager
+    def session_factory():
+        yield db_session
+
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+    app.dependency_overrides[get_db_session_factory] = lambda: session_factory
+    return user_id
+
+
+def test_csv_export_streams_all_rows_oldest_first(client, user_id):
+    """CSV はヘッダー付きで全件を古い順に返す"""
+    res = client.get("/transactions/export")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    assert "transactions.csv" in res.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert len(rows) == 1200
+    assert rows[0]["occurred_at"] == "2024-01-01"
+    assert [r["occurred_at"] for r in rows] == sorted(r["occurred_at"] for r in rows)
+    assert rows[0]["description"].startswith("明細, ")
+
+
+def test_ndjson_export_applies_filters(client, user_id):
+    """NDJSON でもフィルタが効く"""
+    res = client.get(
+        "/transactions/export",
+        params={"format": "ndjson", "type": "income", "from": "2024-02-01", "to": "2024-02-29"},
+    )
+
+    assert res.status_code == 200
+    records = [json.loads(line) for line in res.text.splitlines()]
+    assert records
+    assert {r["type"] for r in records} == {"income"}
+    assert all("2024-02-01" <= r["occurred_at"] <= "2024-02-29" for r in records)
@@ -0,0 +1,76 @@
+"""取引の一括取り込み (POST /transactions/import) のテスト"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.auth import AuthContext, get_current_user
+from app.infrastructure.dasoboard.daily_total_dto import DailyUserCategoryTotalDTO
+from app.main import app
+
+CSV_BODY = """type,amount,occurred_at,category_id,description
+expense,1200,2025-01-05,,ランチ
+Income,300000,2025-01-25,,給与
+expense,-5,2025-01-06,,負の金額
+expense,1200,2025-01-05,,ランチ
+expense,800,2099-01-01,,未来日付
+"""
+
+
+@pytest.fixture
+def user_id(client):
+    user_id = f"user_{uuid4().hex}"
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+    return user_id
+
+
+def test_csv_import_reports_row_errors_and_duplicates(client, user_id, db_session):
+    """不正な行と重複行を報告し、残りを取り込む"""
+    res = client.post(
+        "/transactions/import?skip_duplicates=true",
+        content=CSV_BODY,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["imported"], body["duplicates"], body["failed"]) == (2, 1, 2)
+    assert body["duplicate_rows"] == [4]
+    assert [e["row"] for e in body["errors"]] == [3, 5]
+    assert body["errors"][0]["errors"][0]["loc"] == ["amount"]
+
+    listed = client.get("/transactions").json()["transactions"]
+    assert sorted(t["amount"] for t in listed) == [1200, 300000]
+
+    # 日次ロールアップも取り込みに追従する
+    rollup_total = db_session.scalar(
+        select(func.sum(DailyUserCategoryTotalDTO.amount)).where(
+            DailyUserCategoryTotalDTO.user_id == user_id
+        )
+    )
+    assert rollup_total == 301200
+
+
+def test_json_reimport_is_idempotent(client, user_id):
+    """skip_duplicates を指定すれば同じ内容を再度取り込んでも重複登録しない"""
+    rows = [
+        {"type": "expense", "amount": 500 + i, "occurred_at": f"2025-02-{i + 1:02d}"}
+        for i in range(20)
+    ]
+
+    first = client.post("/transactions/import?skip_duplicates=true", json=rows).json()
+    second = client.post("/transactions/import?skip_duplicates=true", json=rows).json()
+    # 既定では重複判定をしない (同日同額の正当な取引を落とさない)
+    forced = client.post("/transactions/import", json=rows[:1]).json()
+
+    assert first["imported"] == 20
+    assert (second["imported"], second["duplicates"]) == (0, 20)
+    assert forced["imported"] == 1
+
+
+def test_unreadable_payload_is_rejected(client, user_id):
+    """配列でない JSON は 400"""
+    res = client.post("/transactions/import", json={"type": "expense"})
+
+    assert res.status_code == 400
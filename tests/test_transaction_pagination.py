@@ -0,0 +1,93 @@
+"""取引一覧のキーセットページネーションのテスト"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.domain.transaction.transaction_entity import Transaction
+from app.domain.transaction.transaction_query import (
+    TransactionCursor,
+    TransactionFilter,
+    TransactionQuery,
+)
+from app.domain.transaction.transaction_value_objects import TransactionType
+from app.infrastructure.transaction.transaction_repository import TransactionRepositoryImpl
+from app.presentation.schemas.cursor import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def repo(db_session):
+    return TransactionRepositoryImpl(db_session)
+
+
+@pytest.fixture
+def seeded(repo, db_session, sample_user_id):
+    """同じ日付を含む 7 件の取引を登録する"""
+    user_id = str(sample_user_id)
+    base = date(2025, 1, 1)
+    txs = []
+    for i in range(7):
+        tx = Transaction.create(
+            user_id=user_id,
+            account_id=None,
+            type=TransactionType.INCOME if i % 3 == 0 else TransactionType.EXPENSE,
+            amount=(i + 1) * 100,
+            occurred_at=base + timedelta(days=i // 2),
+        )
+        repo.add(tx)
+        txs.append(tx)
+    db_session.flush()
+    # 期待順序: occurred_at DESC, id DESC
+    return user_id, sorted(txs, key=lambda t: (t.occurred_at, t.id.hex), reverse=True)
+
+
+def test_pages_walk_forward_and_back(repo, seeded):
+    """before / after で前後のページを重複なく辿れることを確認"""
+    user_id, expected = seeded
+
+    first = repo.find_page_by_user_id(user_id, TransactionQuery(limit=3))
+    assert [t.id for t in first.items] == [t.id for t in expected[:3]]
+    assert first.prev_cursor is None
+
+    second = repo.find_page_by_user_id(user_id, TransactionQuery(limit=3, before=first.next_cursor))
+    assert [t.id for t in second.items] == [t.id for t in expected[3:6]]
+
+    last = repo.find_page_by_user_id(user_id, TransactionQuery(limit=3, before=second.next_cursor))
+    assert [t.id for t in last.items] == [t.id for t in expected[6:]]
+    assert last.next_cursor is None
+
+    back = repo.find_page_by_user_id(user_id, TransactionQuery(limit=3, after=second.prev_cursor))
+    assert [t.id for t in back.items] == [t.id for t in expected[:3]]
+    assert back.prev_cursor is None
+
+
+def test_filters_are_applied_in_sql(repo, seeded):
+    """種別・金額・日付のフィルタが適用されることを確認"""
+    user_id, expected = seeded
+    f = TransactionFilter(
+        type=TransactionType.EXPENSE,
+        min_amount=200,
+        max_amount=600,
+        from_=date(2025, 1, 2),
+    )
+
+    page = repo.find_page_by_user_id(user_id, TransactionQuery(limit=10, filter=f))
+
+    assert [t.id for t in page.items] == [
+        t.id
+        for t in expected
+        if t.type is TransactionType.EXPENSE
+        and 200 <= t.amount.value <= 600
+        and t.occurred_at >= date(2025, 1, 2)
+    ]
+
+
+def test_cursor_round_trip(seeded):
+    """カーソルのエンコード／デコードが可逆であることを確認"""
+    _, expected = seeded
+    cursor = TransactionCursor.of(expected[0])
+
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    assert encode_cursor(None) is None
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
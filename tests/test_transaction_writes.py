@@ -0,0 +1,139 @@
+"""取引の更新・削除 (PUT / DELETE /transactions/{id}) のテスト"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.core.auth import AuthContext, get_current_user
+from app.infrastructure.dasoboard.dashboard_cache import dashboard_summary_cache
+from app.main import app
+
+BODY = {"type": "expense", "amount": 1200, "occurred_at": "2025-01-05", "description": "ランチ"}
+
+
+def _login(user_id: str) -> None:
+    app.dependency_overrides[get_current_user] = lambda: AuthContext(sub=user_id, claims={})
+
+
+@pytest.fixture
+def created(client):
+    owner = f"user_{uuid4().hex}"
+    _login(owner)
+    return owner, client.post("/transactions", json=BODY).json()["id"]
+
+
+@pytest.fixture
+def statements(db_session):
+    """実行された SQL を記録する"""
+    executed: list[str] = []
+
+    def record(*args):
+        executed.append(args[2])
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_delete_is_a_single_owned_statement(client, created, statements):
+    """削除は所有者条件付きの DELETE 1 文で、他人の取引は 404 になる"""
+    owner, tx_id = created
+
+    _login(f"user_{uuid4().hex}")
+    assert client.delete(f"/transactions/{tx_id}").status_code == 404
+
+    _login(owner)
+    statements.clear()
+    assert client.delete(f"/transactions/{tx_id}").status_code == 204
+    assert client.delete(f"/transactions/{tx_id}").status_code == 404
+
+    tx_statements = [s for s in statements if " transactions" in s]
+    assert len(tx_statements) == 2
+    assert all(s.startswith("DELETE") and "user_id" in s for s in tx_statements)
+
+
+def test_put_updates_only_own_transaction(client, created):
+    """他人の取引は更新できず、所有者の更新は一覧に反映される"""
+    owner, tx_id = created
+
+    _login(f"user_{uuid4().hex}")
+    res = client.put(f"/transactions/{tx_id}", json={**BODY, "amount": 1})
+    assert res.status_code == 400
+
+    _login(owner)
+    res = client.put(f"/transactions/{tx_id}", json={**BODY, "amount": 900})
+    assert res.status_code == 200
+    (listed,) = client.get("/transactions").json()["transactions"]
+    assert (listed["id"], listed["amount"]) == (tx_id, 900)
+
+
+def test_patch_description_skips_rollup(client, created, statements):
+    """説明だけの変更はその列だけを更新し、日次ロールアップには触れない"""
+    _, tx_id = created
+
+    res = client.patch(f"/transactions/{tx_id}", json={"description": "夕食"})
+
+    assert res.status_code == 200
+    (update_sql,) = [s for s in statements if s.startswith("UPDATE transactions")]
+    assert "description" in update_sql
+    assert "amount" not in update_sql.split(" WHERE ")[0]
+    assert not any("daily_user_category_totals" in s for s in statements)
+    (listed,) = client.get("/transactions").json()["transactions"]
+    assert (listed["description"], listed["amount"]) == ("夕食", 1200)
+
+
+def test_patch_description_keeps_dashboard_cache_and_etag(client, created):
+    """説明だけの変更の後もダッシュボードはキャッシュから返り、ETag も変わらない"""
+    _, tx_id = created
+    path = "/dashboard/summary?from=2025-01-01&to=2025-01-31"
+    etag = client.get(path).headers["etag"]
+    hits = dashboard_summary_cache.stats()["hits"]
+
+    assert client.patch(f"/transactions/{tx_id}", json={"description": "夕食"}).status_code == 200
+
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+    res = client.get(path)
+    assert res.json()["total"]["expense"] == 1200
+    assert dashboard_summary_cache.stats()["hits"] == hits + 1
+
+
+def test_patch_amount_updates_rollup_and_rejects_nulls(client, created):
+    """集計に関わる項目の変更はダッシュボードに反映され、必須項目の null は拒否する"""
+    _, tx_id = created
+
+    assert client.patch(f"/transactions/{tx_id}", json={"amount": None}).status_code == 422
+    assert client.patch(f"/transactions/{tx_id}", json={}).status_code == 400
+    assert client.patch(f"/transactions/{tx_id}", json={"amount": 500}).status_code == 200
+
+    summary = client.get("/dashboard/summary?from=2025-01-01&to=2025-01-31").json()
+    assert summary["total"]["expense"] == 500
+
+
+def test_batch_update_and_delete_report_per_id(client, created, statements):
+    """一括更新・削除は所有する取引だけを 1 文で変更し、ID ごとの結果を返す"""
+    owner, tx_id = created
+    other_id = client.post("/transactions", json=BODY).json()["id"]
+    _login(f"user_{uuid4().hex}")
+    foreign_id = client.post("/transactions", json=BODY).json()["id"]
+    _login(owner)
+
+    statements.clear()
+    res = client.post(
+        "/transactions:batchUpdate",
+        json={"ids": [tx_id, foreign_id, other_id], "changes": {"amount": 300}},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["succeeded"], body["not_found"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == ["updated", "not_found", "updated"]
+    assert len([s for s in statements if s.startswith("UPDATE transactions")]) == 1
+    summary = client.get("/dashboard/summary?from=2025-01-01&to=2025-01-31").json()
+    assert summary["total"]["expense"] == 600
+
+    res = client.post("/transactions:batchDelete", json={"ids": [tx_id, foreign_id]})
+    assert [r["status"] for r in res.json()["results"]] == ["deleted", "not_found"]
+    (listed,) = client.get("/transactions").json()["transactions"]
+    assert listed["id"] == other_id
+    assert client.post("/transactions:batchDelete", json={"ids": []}).status_code == 422